@@ -0,0 +1,91 @@
+"""Options shared by every Claude Code session of the AITimes agent."""
+
+import os
+from typing import Optional
+
+from claude_code_sdk import ClaudeCodeOptions
+from claude_code_sdk.types import McpStdioServerConfig
+from prompts.append_system_prompt import append_system_prompt
+from sdk_mcp_server.server import aitimes_db_mcp_server
+
+playwrightMcpServer = McpStdioServerConfig(
+    command="npx",
+    args=["@playwright/mcp@latest"]
+)
+
+
+## playwright mcp tools
+playwrightMcpTools = [
+    'mcp__playwright-mcp__browser_navigate',
+    'mcp__playwright-mcp__browser_navigate_back',
+    'mcp__playwright-mcp__browser_navigate_forward',
+    'mcp__playwright-mcp__browser_close',
+    'mcp__playwright-mcp__browser_resize',
+    'mcp__playwright-mcp__browser_snapshot',
+    'mcp__playwright-mcp__browser_take_screenshot',
+    'mcp__playwright-mcp__browser_console_messages',
+    'mcp__playwright-mcp__browser_network_requests',
+    'mcp__playwright-mcp__browser_click',
+    'mcp__playwright-mcp__browser_hover',
+    'mcp__playwright-mcp__browser_drag',
+    'mcp__playwright-mcp__browser_type',
+    'mcp__playwright-mcp__browser_press_key',
+    'mcp__playwright-mcp__browser_select_option',
+    'mcp__playwright-mcp__browser_tab_list',
+    'mcp__playwright-mcp__browser_tab_new',
+    'mcp__playwright-mcp__browser_tab_select',
+    'mcp__playwright-mcp__browser_tab_close',
+    'mcp__playwright-mcp__browser_evaluate',
+    'mcp__playwright-mcp__browser_file_upload',
+    'mcp__playwright-mcp__browser_handle_dialog',
+    'mcp__playwright-mcp__browser_wait_for',
+    'mcp__playwright-mcp__browser_install',
+    'mcp__playwright-mcp__browser_parse_insight',
+    'mcp__playwright-mcp__send_insight'
+]
+allowed_tools = [
+    "Read",
+    "Write",
+    "Edit",
+    "Bash",
+    "Glob",
+    "Grep",
+    "WebSearch"
+]
+
+aitimes_db_mcp_tools = [
+    "mcp__aitimes-db-mcp__create_article",
+    "mcp__aitimes-db-mcp__create_articles",
+    "mcp__aitimes-db-mcp__get_article",
+    "mcp__aitimes-db-mcp__update_article",
+    "mcp__aitimes-db-mcp__list_articles",
+    "mcp__aitimes-db-mcp__delete_article",
+    "mcp__aitimes-db-mcp__upload_video",
+    "mcp__aitimes-db-mcp__get_upload_status",
+    "mcp__aitimes-db-mcp__wait_uploads"
+]
+
+
+def build_options(hooks: Optional[dict] = None, model: str = "opus", max_turns: Optional[int] = None) -> ClaudeCodeOptions:
+    """
+    Build session options with every allowed tool and MCP server.
+
+    Args:
+        hooks: Hook matchers by event
+        model: Model of the session
+        max_turns: Agent turns the CLI allows per prompt (a task budget's
+            max_turns, so a runaway step stops even before it is noticed)
+    """
+    return ClaudeCodeOptions(
+        model=model,
+        max_turns=max_turns,
+        allowed_tools=allowed_tools + playwrightMcpTools + aitimes_db_mcp_tools,
+        permission_mode="acceptEdits",
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        mcp_servers={
+            "playwright-mcp": playwrightMcpServer,
+            "aitimes-db-mcp": aitimes_db_mcp_server
+        },
+        append_system_prompt=append_system_prompt,
+        hooks=hooks
+    )
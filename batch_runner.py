@@ -0,0 +1,217 @@
+"""Process every article of input.json in parallel, one Claude Code session per article.
+
+Each article gets its own context in a session from a pool of
+pre-connected ClaudeSDKClients, at most --concurrency at a time, and is
+given --timeout seconds. Its steps are sent by ClaudeCodeClient.start_task,
+each with its own timeout, and a failed step stops the article. A session that finished its article cleanly is
+cleared and reused, so the CLI and MCP servers start only once per slot. Every session
+writes its article's entry to outputs/<id>/result.json; the entries are
+merged into final_output.json in input order and a timing summary is
+printed.
+
+Usage:
+    python batch_runner.py --concurrency 3 --timeout 1800
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from agent_options import build_options
+from claude_code_sdk_client import ClaudeCodeClient, TurnFailedError, TurnTimeoutError
+from hooks.basichooks import BasicHooks
+from observability.exporters import start_exporters
+from observability.instrumentation import REGISTRY, print_latency_summary
+from observability.tracing import TRACER
+from prompts.batchArticlePrompt import create_batch_article_steps
+from session_pool import SessionPool
+from usage_accounting import Budget, BudgetExceededError, UsageLedger, UsageTotals
+from sdk_mcp_server.server import services
+
+
+@dataclass(slots=True)
+class ArticleRun:
+    """Outcome of processing one input.json entry."""
+    id: str
+    status: str = "queued"  # queued, running, succeeded, failed, timeout or over_budget
+    seconds: float = 0.0
+    queued_seconds: float = 0.0  # Time spent waiting for a free session slot
+    usage: UsageTotals = field(default_factory=UsageTotals)
+    session_id: Optional[str] = None
+    output: Optional[dict] = None  # The article's final_output.json entry
+    error: Optional[str] = None
+
+
+async def run_article(
+    entry: dict,
+    semaphore: asyncio.Semaphore,
+    pool: SessionPool,
+    budget: Optional[Budget],
+    ledger: UsageLedger,
+    args: argparse.Namespace,
+) -> ArticleRun:
+    """Process one article in its own session, bounded by the semaphore and the timeout."""
+    run = ArticleRun(id=entry["id"])
+    queued_at = time.perf_counter()
+
+    async with semaphore:
+        started = time.perf_counter()
+        run.queued_seconds = started - queued_at
+        run.status = "running"
+        print(f"▶️ [{run.id}] started")
+
+        result_path = os.path.join(args.output_dir, run.id, "result.json")
+        os.makedirs(os.path.dirname(result_path), exist_ok=True)
+        if os.path.exists(result_path):
+            os.remove(result_path)  # Never merge a previous run's result
+
+        steps = create_batch_article_steps(entry, result_path, with_video=args.with_video)
+        agent = None
+        # Only a session whose turns all completed is in a known state
+        reusable = False
+        try:
+            with TRACER.span(f"article {run.id}", attributes={"article.id": run.id}):
+                agent = ClaudeCodeClient(client=await pool.acquire(), pool=pool, label=run.id)
+                # Each step has its own timeout; --timeout bounds the whole article
+                await asyncio.wait_for(agent.start_task(steps, budget=budget), args.timeout)
+            run.status = "succeeded"
+            reusable = True
+        except TurnTimeoutError as e:
+            run.status = "timeout"
+            run.error = str(e)
+        except asyncio.TimeoutError:
+            run.status = "timeout"
+            run.error = f"Timed out after {args.timeout:g}s"
+        except BudgetExceededError as e:
+            run.status = "over_budget"
+            run.error = str(e)
+            reusable = True
+        except TurnFailedError as e:
+            # The turn ended with an error result; the remaining steps were not sent
+            run.status = "failed"
+            run.error = str(e)
+            reusable = True
+        except Exception as e:
+            run.status = "failed"
+            run.error = str(e)
+        finally:
+            if agent is not None:
+                run.usage = agent.task_usage
+                run.session_id = agent.created_session_id
+                # A downgraded session runs another model than the rest of the pool
+                await pool.release(agent.client, reuse=reusable and not agent.downgraded)
+            run.seconds = time.perf_counter() - started
+            ledger.record(run.id, run.usage)
+            ledger.save()
+
+    try:
+        with open(result_path, "r", encoding="utf-8") as file:
+            run.output = json.load(file)
+    except (OSError, ValueError) as e:
+        if run.status == "succeeded":
+            run.status = "failed"
+            run.error = f"No valid result at {result_path}: {str(e)}"
+
+    print(f"{'✅' if run.status == 'succeeded' else '❌'} [{run.id}] {run.status} in {run.seconds:.1f}s")
+    return run
+
+
+def print_summary(runs: list[ArticleRun], wall_seconds: float) -> None:
+    """Print per-article timings and the speedup over running them one by one."""
+    print("\n📊 Batch summary")
+    print(f"  {'article':<20} {'status':<11} {'time':>8} {'queued':>8} {'turns':>6} {'in':>9} {'out':>8} {'cache':>10} {'cost':>8}")
+    for run in runs:
+        usage = run.usage
+        print(
+            f"  {run.id:<20} {run.status:<11} {run.seconds:>7.1f}s {run.queued_seconds:>7.1f}s "
+            f"{usage.num_turns:>6} {usage.input_tokens:>9} {usage.output_tokens:>8} {usage.cache_read_input_tokens:>10} {usage.cost_usd:>7.2f}$"
+        )
+        if run.error:
+            print(f"    ↳ {run.error}")
+
+    serial_seconds = sum(run.seconds for run in runs)
+    succeeded = sum(1 for run in runs if run.status == "succeeded")
+    print(
+        f"  {succeeded}/{len(runs)} succeeded in {wall_seconds:.1f}s wall "
+        f"({serial_seconds:.1f}s of session time, {serial_seconds / max(wall_seconds, 1e-9):.1f}x concurrency), "
+        f"{sum(run.usage.cost_usd for run in runs):.2f}$ total, "
+        f"{sum(run.usage.cost_usd for run in runs) / max(succeeded, 1):.2f}$ per succeeded article"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Process input.json articles in parallel Claude Code sessions")
+    parser.add_argument("--input", default="input.json", help="Articles to process")
+    parser.add_argument("--output", default="outputs/final_output.json", help="Merged output file")
+    parser.add_argument("--output-dir", default="outputs", help="Directory for per-article results")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "3")), help="Sessions running at once")
+    parser.add_argument("--timeout", type=float, default=float(os.getenv("BATCH_ARTICLE_TIMEOUT_SECONDS", "1800")), help="Seconds per article")
+    parser.add_argument("--model", default="opus", help="Model of every session")
+    parser.add_argument("--with-video", action="store_true", help="Also create and save each article's video")
+    parser.add_argument("--only", action="append", help="Article id(s) to process (default: all)")
+    parser.add_argument("--budget-usd", type=float, default=os.getenv("TASK_BUDGET_USD"), help="Stop an article once it cost this much")
+    parser.add_argument("--budget-tokens", type=int, default=os.getenv("TASK_BUDGET_TOKENS"), help="Stop an article once it used this many tokens")
+    parser.add_argument("--budget-turns", type=int, default=os.getenv("TASK_BUDGET_TURNS"), help="Stop an article after this many agent turns")
+    parser.add_argument("--downgrade-usd", type=float, default=os.getenv("TASK_BUDGET_DOWNGRADE_USD"), help="Continue an article on --downgrade-model once it cost this much")
+    parser.add_argument("--downgrade-model", default=os.getenv("TASK_BUDGET_DOWNGRADE_MODEL", "sonnet"), help="Cheaper model for --downgrade-usd")
+    args = parser.parse_args()
+
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be positive")
+
+    budget = None
+    limits = (args.budget_usd, args.budget_tokens, args.budget_turns, args.downgrade_usd)
+    if any(limit is not None for limit in limits):
+        budget = Budget(
+            max_cost_usd=args.budget_usd,
+            max_tokens=args.budget_tokens,
+            max_turns=args.budget_turns,
+            downgrade_cost_usd=args.downgrade_usd,
+            downgrade_model=args.downgrade_model,
+        )
+
+    with open(args.input, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    if args.only:
+        entries = [entry for entry in entries if entry["id"] in args.only]
+
+    # METRICS_PORT serves /metrics on localhost, METRICS_FILE writes them periodically
+    start_exporters(REGISTRY)
+
+    # Bring MongoDB and Supabase up while the first sessions start
+    if os.getenv("AITIMES_DB_WARMUP", "1").lower() in ("1", "true", "yes"):
+        services.start_warmup(create_indexes=True)
+
+    print(f"🚀 Processing {len(entries)} article(s), {args.concurrency} at a time")
+    started = time.perf_counter()
+    ledger = UsageLedger()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    pool = SessionPool(
+        lambda: build_options(BasicHooks().get_hooks(), model=args.model, max_turns=args.budget_turns),
+        size=min(args.concurrency, len(entries)),
+    )
+    pool.start()
+    try:
+        runs = await asyncio.gather(*(run_article(entry, semaphore, pool, budget, ledger, args) for entry in entries))
+    finally:
+        await pool.close()
+    wall_seconds = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump([run.output for run in runs if run.output is not None], file, ensure_ascii=False, indent=2)
+    with open(os.path.join(args.output_dir, "batch_summary.json"), "w", encoding="utf-8") as file:
+        json.dump([{**asdict(run), "output": None} for run in runs], file, ensure_ascii=False, indent=2)
+
+    print_summary(runs, wall_seconds)
+    print_latency_summary()
+    print(f"📝 Merged {sum(1 for run in runs if run.output is not None)} result(s) into {args.output}")
+    print(f"💰 Usage saved to {ledger.save()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
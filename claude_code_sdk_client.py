@@ -1,54 +1,293 @@
-from typing import Any, Generator
-from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions, AssistantMessage, TextBlock
+from dataclasses import dataclass, replace
+from typing import Any, Generator, Optional, Union
+from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions, AssistantMessage, ResultMessage, TextBlock
 import asyncio
+import time
+
+import startup_timing
+from observability.instrumentation import AGENT_TURN_DURATION
+from observability.tracing import TRACER
+from session_pool import SessionPool, SessionStore, clear_context
+from usage_accounting import Budget, BudgetExceededError, UsageTotals
+
+
+@dataclass(slots=True)
+class TurnStep:
+    """マルチステップのタスクの1ステップ。前のステップのターンが終わってから送られます。"""
+    prompt: str
+    timeout_seconds: Optional[float] = None  # このステップのターンの制限時間（None なら無制限）
+    name: Optional[str] = None  # ログに表示する名前
+
+
+class TurnTimeoutError(TimeoutError):
+    """ステップのターンが制限時間内に終わらなかったときに送出されます。"""
+
+
+class TurnFailedError(RuntimeError):
+    """ステップのターンがエラーで終わったとき（error_max_turns や API エラーなど）に送出されます。"""
+
 
 class ClaudeCodeClient:
     """Claude との単一会話セッションを維持します。"""
     
-    def __init__(self, options: ClaudeCodeOptions = None):
-        self.client = ClaudeSDKClient(options)
+    def __init__(self, options: ClaudeCodeOptions = None, client: Optional[ClaudeSDKClient] = None,
+                 session_store: Optional[SessionStore] = None, pool: Optional[SessionPool] = None,
+                 label: Optional[str] = None):
+        """
+        Args:
+            options: 新しく接続するセッションのオプション
+            client: 接続済みのセッション（SessionPool.acquire() の戻り値など）。渡された場合は connect しません
+            session_store: セッションIDの保存先（再起動後の再開用）
+            pool: client の取得元のプール。モデルの切り替えはこのプールで接続します
+            label: 並行して動く他のセッションと区別するためにログの先頭に付ける名前
+        """
+        self.client = client or ClaudeSDKClient(options)
+        self.connected = client is not None
+        self.session_store = session_store
+        self.pool = pool
+        self.label = label
+        self.downgraded = False  # switch_model で別のモデルに切り替えたかどうか
         self.turn_count = 0
         self.created_session_id = None
+        self.usage = UsageTotals()  # このクライアントの全ターンの使用量
+        self.task_usage = UsageTotals()  # 最後の start_task の使用量
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.client.options.model
+
+    async def switch_model(self, model: str):
+        """
+        会話を引き継いだまま、別のモデルのセッションに切り替えます。
+
+        モデルは CLI の起動オプションなので、同じセッションIDを resume して接続し直します。
+        """
+        if self.pool is not None:
+            client = await self.pool.connect(resume=self.created_session_id, model=model)
+            # 元のセッションはプールの他のセッションと同じモデルなので、クリアして再利用します
+            await self.pool.release(self.client)
+        else:
+            client = ClaudeSDKClient(replace(self.client.options, model=model, resume=self.created_session_id))
+            TRACER.enter_client_scope()
+            await client.connect()
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                print(f"Failed to disconnect session: {str(e)}")
+        self.client = client
+        self.downgraded = True
+        print(f"🔀 {self._prefix}モデルを {model} に切り替えました")
+
+    @property
+    def _prefix(self) -> str:
+        return f"[{self.label}] " if self.label else ""
+
+    async def _ensure_connected(self):
+        if not self.connected:
+            # このクライアントの MCP ハンドラのスパンを、このクライアントのツール呼び出しだけにつなげます
+            TRACER.enter_client_scope()
+            await self.client.connect()
+            self.connected = True
+            startup_timing.mark("client_connected")
+
+    def _record_session_id(self, session_id: Optional[str]):
+        """セッションIDを記録し、後で再開できるよう保存します。"""
+        if not session_id:
+            return
+        self.created_session_id = session_id
+        if self.session_store is not None:
+            self.session_store.save(session_id)
+
+    async def clear_context(self):
+        """CLI と MCP サーバーを起動したまま、新しい会話を始めます。"""
+        try:
+            self._record_session_id(await clear_context(self.client))
+        except Exception as e:
+            # /clear が使えない場合は従来どおり再接続します
+            print(f"コンテキストをクリアできなかったため再接続します: {str(e)}")
+            await self.client.disconnect()
+            TRACER.enter_client_scope()
+            await self.client.connect()
+        self.turn_count = 0
     
     async def _receive_response(self, turn_count: int):
         """Claudeからのレスポンスを受信して処理します。"""
         print(f"[{turn_count}] Claude: ", end="")
         async for message in self.client.receive_response():
+            startup_timing.mark("first_agent_message")
             # 最初のメッセージはセッションIDを含むシステム初期化メッセージです
             if hasattr(message, 'subtype') and message.subtype == 'init':
                 session_id = message.data.get('session_id')
                 print(f"⚡️⚡️ Claude Working!!。ID: {session_id}")
-                self.created_session_id = session_id
+                self._record_session_id(session_id)
             # このIDを後で再開するために保存できます
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, TextBlock):
                         print(block.text, end="")
+            if isinstance(message, ResultMessage):
+                self.usage.add(message, self.model)
+                print(f"\n💰 {self.usage.describe()}")
             
         print()  # レスポンス後の改行
 
-    async def start_task(self, create_prompt_func):
-        stream_prompt = create_prompt_func()
-        if self.created_session_id is None:
-            await self.client.connect()
-        print("⚡️ Claude Code SDK Session is started and Context is active!!")
-        await self.client.query(stream_prompt())
+    async def start_task(self, steps: list[Union["TurnStep", str]], default_timeout: Optional[float] = None,
+                         budget: Optional[Budget] = None) -> list[ResultMessage]:
+        """
+        複数ステップのタスクを、前のターンの ResultMessage を受け取ってから次のステップを送る形で実行します。
+
+        固定の sleep を挟まないため、所要時間は実際の作業時間だけになります。
+
+        Args:
+            steps: 順に送るステップ（文字列はタイムアウトなしのステップ）
+            default_timeout: timeout_seconds を持たないステップのタイムアウト（秒）
+            budget: タスクの予算。ステップごとに確認し、上限を超えたら残りのステップを止め、
+                切り替えの閾値を超えたら downgrade_model で続けます。max_turns はターンの実行中にも
+                確認し、超えたらそのターンに割り込みます（トークンとコストは ResultMessage にしか含まれないため、ステップの終わりに確認）
+
+        Returns:
+            各ステップの ResultMessage
+
+        Raises:
+            TurnTimeoutError: ステップがタイムアウトした場合（ターンは割り込まれ、残りのステップは送られません）
+            TurnFailedError: ステップのターンがエラーで終わった場合（残りのステップは送られません）
+            BudgetExceededError: 予算を超えた場合（実行中のターンは割り込まれ、残りのステップは送られません）
+
+        使用量は self.task_usage に集計されます（例外で終わった場合も含む）。
+        """
+        await self._ensure_connected()
+        print(f"⚡️ {self._prefix}Claude Code SDK Session is started and Context is active!!")
+
+        results = []
+        self.task_usage = UsageTotals()
+        # タスク全体のスパン。各ステップのターンがその子、ツール呼び出しがターンの子になります
+        with TRACER.span("task", attributes={"task.steps": len(steps)}):
+            for index, step in enumerate(steps, start=1):
+                if isinstance(step, str):
+                    step = TurnStep(prompt=step)
+                name = step.name or f"step {index}/{len(steps)}"
+                timeout = step.timeout_seconds if step.timeout_seconds is not None else default_timeout
+
+                with TRACER.span(f"turn {name}", attributes={"turn.index": index}) as turn_span:
+                    if self.created_session_id:
+                        TRACER.bind_session(self.created_session_id, turn_span)
+                    started = time.perf_counter()
+                    await self.client.query(step.prompt)
+                    try:
+                        result = await asyncio.wait_for(self._receive_turn(budget), timeout)
+                    except asyncio.TimeoutError:
+                        AGENT_TURN_DURATION.observe(time.perf_counter() - started, step=step.name or f"step {index}", status="timeout")
+                        self._add_usage(await self._interrupt_turn())
+                        raise TurnTimeoutError(f"{name} did not finish within {timeout:g}s")
+                    except BudgetExceededError:
+                        AGENT_TURN_DURATION.observe(time.perf_counter() - started, step=step.name or f"step {index}", status="over_budget")
+                        self._add_usage(await self._interrupt_turn())
+                        raise
+                    finally:
+                        if self.created_session_id:
+                            TRACER.unbind_session(self.created_session_id)
+
+                    elapsed = time.perf_counter() - started
+                    AGENT_TURN_DURATION.observe(elapsed, step=step.name or f"step {index}", status="error" if result.is_error else "ok")
+                    turn_span.set_attribute("turn.num_turns", result.num_turns)
+                    if result.is_error:
+                        turn_span.set_error(result.result or result.subtype)
+                self._add_usage(result)
+                print(f"\n⏱️ {self._prefix}{name}: {elapsed:.1f}s, {result.num_turns} turns")
+                print(f"💰 {self._prefix}{self.task_usage.describe()}")
+                results.append(result)
+                if result.is_error:
+                    # 失敗したステップの成果物を前提にする後続のステップは送りません
+                    raise TurnFailedError(f"{name} ended with {result.subtype}: {result.result or 'no result'}")
 
+                if budget is not None:
+                    # 最後のステップの後も上限は確認します（切り替えは残りのステップがある場合のみ）
+                    await self._apply_budget(budget, downgrade=index < len(steps))
+        return results
+
+    def _add_usage(self, result: Optional[ResultMessage]):
+        """ターンの使用量をクライアントとタスクの合計に加えます。"""
+        if result is None:
+            return
+        self.usage.add(result, self.model)
+        self.task_usage.add(result, self.model)
+
+    async def _apply_budget(self, budget: Budget, downgrade: bool = True):
+        """予算の上限を超えていれば BudgetExceededError を送出し、切り替えの閾値を超えていればモデルを切り替えます。"""
+        reason = budget.exceeded(self.task_usage)
+        if reason is not None:
+            raise BudgetExceededError(f"Task stopped, budget exceeded: {reason}")
+        if downgrade and budget.should_downgrade(self.task_usage, self.model):
+            print(f"⚠️ {self._prefix}コストが {budget.downgrade_cost_usd:.2f}$ を超えたため、残りのステップは {budget.downgrade_model} で続けます")
+            await self.switch_model(budget.downgrade_model)
+
+    async def _receive_turn(self, budget: Optional[Budget] = None) -> ResultMessage:
+        """
+        ターンのメッセージを表示し、ターンを終える ResultMessage を返します。
+
+        Raises:
+            BudgetExceededError: ターン中のエージェントの応答数で budget.max_turns を超えた場合
+                （ターンはまだ実行中なので、呼び出し側で割り込みます）
+        """
+        result = None
+        live_turns = 0  # このターンで始まったエージェントの応答数（ResultMessage の num_turns の見積もり）
+        previous_assistant = False
         async for message in self.client.receive_response():
+            startup_timing.mark("first_agent_message")
             # 最初のメッセージはセッションIDを含むシステム初期化メッセージです
             if hasattr(message, 'subtype') and message.subtype == 'init':
                 session_id = message.data.get('session_id')
-                print(f"⚡️⚡️ Claude Working!!。ID: {session_id}")
-                self.created_session_id = session_id
+                print(f"⚡️⚡️ {self._prefix}Claude Working!!。ID: {session_id}")
+                self._record_session_id(session_id)
+                # このセッションのフックのスパンを実行中のターンにつなげます
+                if session_id and TRACER.current_span() is not None:
+                    TRACER.bind_session(session_id, TRACER.current_span())
             # このIDを後で再開するために保存できます
+            if isinstance(message, AssistantMessage) and not previous_assistant:
+                # ツールの結果の後の最初の AssistantMessage が新しい応答です（同じ応答のブロックは続けて届きます）
+                live_turns += 1
+                if budget is not None and budget.max_turns is not None and self.task_usage.num_turns + live_turns > budget.max_turns:
+                    raise BudgetExceededError(
+                        f"Task stopped, budget exceeded: turns {self.task_usage.num_turns + live_turns} > {budget.max_turns} (turn still running)"
+                    )
+            previous_assistant = isinstance(message, AssistantMessage)
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, TextBlock):
-                        print("🤖",block.text, end="")
+                        if self.label:
+                            # 他のセッションの出力と混ざるため、1ブロックずつ行にします
+                            print(f"🤖 {self._prefix}{block.text}")
+                        else:
+                            print("🤖",block.text, end="")
+            if isinstance(message, ResultMessage):
+                result = message
+        if result is None:
+            raise RuntimeError("Session ended before the turn finished")
+        return result
+
+    async def _interrupt_turn(self, grace_seconds: float = 30.0) -> Optional[ResultMessage]:
+        """
+        実行中のターンに割り込み、その ResultMessage まで読み捨てます。
+
+        Returns:
+            割り込んだターンの ResultMessage（使用量の集計用）。grace_seconds 以内に届かなければ None
+        """
+        await self.client.interrupt()
+        result = None
+        try:
+            async def drain():
+                nonlocal result
+                async for message in self.client.receive_response():
+                    if isinstance(message, ResultMessage):
+                        result = message
+            await asyncio.wait_for(drain(), grace_seconds)
+        except asyncio.TimeoutError:
+            print("割り込んだターンが終了しませんでした")
+        return result
 
     async def start(self):
-        if self.created_session_id is None:
-            await self.client.connect()
+        if not self.connected:
+            await self._ensure_connected()
         else:
             print("⚡️ Claude Code SDK Session is resumed and Context is active!!")
         print("⚡️ Claude Code SDK Session is started and Context is active!!")
@@ -64,10 +303,8 @@ class ClaudeCodeClient:
                 print("タスクが割り込まれました！")
                 continue
             elif user_input.lower() == 'new':
-                # 新しいセッションのために切断して再接続
-                await self.client.disconnect()
-                await self.client.connect()
-                self.turn_count = 0
+                # CLI と MCP サーバーは再起動せずに会話だけをリセット
+                await self.clear_context()
                 print("新しい会話セッションを開始しました（以前のコンテキストはクリアされました）")
                 continue
             
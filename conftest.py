@@ -0,0 +1,6 @@
+"""Test settings shared by every test module."""
+
+import os
+
+# The tracer opens logs/traces_<timestamp>.jsonl on import unless disabled
+os.environ.setdefault("TRACING", "0")
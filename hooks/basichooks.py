@@ -1,26 +1,42 @@
-import json
-from claude_code_sdk import query, ClaudeCodeOptions, HookMatcher, HookContext
-from typing import Any
-from datetime import datetime
+from claude_code_sdk import HookMatcher, HookContext
+from typing import Any, Optional
+
+from hooks.event_logger import JsonlEventLogger, default_event_logger
+from observability.instrumentation import AGENT_TOOL_CALLS, AGENT_TOOL_DURATION
+from observability.tracing import TRACER
 
 class BasicHooks:
-    def __init__(self):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = f"logs/log_{timestamp}.txt"
+    def __init__(self, event_logger: Optional[JsonlEventLogger] = None):
+        # イベントはバックグラウンドスレッドで logs/tool_events_*.jsonl に書き込まれます
+        self.event_logger = event_logger or default_event_logger()
 
-    def write_log(self, log: str):
-        with open(self.log_file, "a") as f:
-            f.write(log + "\n")
     async def log_tool_use(self, input_data: dict[str, Any], tool_use_id: str | None, context: HookContext):
         print(f"🛠️ Tool use: {input_data.get('tool_name')}")
         try:
-            # HookContextを直接JSONに変換せず、基本的な情報だけログに記録
-            context_info = f"tool_use_id: {tool_use_id}, input_keys: {list(input_data.keys()) if input_data else 'None'}"
-            self.write_log(f"Tool use: {input_data.get('tool_name')}, Context: {context_info}")
+            tool_name = input_data.get("tool_name") or "unknown"
+            if input_data.get("hook_event_name") == "PreToolUse":
+                AGENT_TOOL_CALLS.inc(tool=tool_name)
+                if tool_use_id:
+                    # ターンのスパンの子。MCP ツールのハンドラのスパンは mcp.tool でこれを親にします
+                    attributes = {"tool.name": tool_name, "tool.use_id": tool_use_id}
+                    if tool_name.startswith("mcp__"):
+                        attributes["mcp.tool"] = tool_name.rsplit("__", 1)[-1]
+                    TRACER.start_open_span(
+                        tool_use_id, f"tool {tool_name}",
+                        parent=TRACER.session_span(input_data.get("session_id")), attributes=attributes,
+                    )
+            elif tool_use_id:
+                response = input_data.get("tool_response")
+                is_error = isinstance(response, dict) and response.get("is_error")
+                TRACER.end_open_span(tool_use_id, error="tool returned an error" if is_error else None)
+            latency = self.event_logger.log_tool_event(input_data, tool_use_id)
+            if latency is not None:
+                AGENT_TOOL_DURATION.observe(latency, tool=tool_name)
         except Exception as e:
-            self.write_log(f"?Tool use: {input_data.get('tool_name')}")
+            # ログの失敗でツールの実行を止めない
+            print(f"Failed to log tool use: {str(e)}")
         return {}
-    
+
     def get_hooks(self) -> dict[str, list[HookMatcher]]:
         return {
             'PreToolUse': [
@@ -30,4 +46,3 @@ class BasicHooks:
                 HookMatcher(hooks=[self.log_tool_use])
             ]
         }
-
@@ -0,0 +1,205 @@
+"""Structured JSONL log of tool use events, written off the event loop."""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+# Longer strings in a tool input are cut to keep records small
+MAX_VALUE_CHARS = 2000
+# Pre events waiting for their Post; oldest are dropped (interrupted tools never get one)
+MAX_PENDING = 10000
+# Records written per write call
+MAX_BATCH = 1000
+
+_STOP = object()
+
+
+def _truncate(value: Any) -> Any:
+    """Copy of a JSON value with long strings cut to MAX_VALUE_CHARS."""
+    if isinstance(value, str):
+        if len(value) > MAX_VALUE_CHARS:
+            return value[:MAX_VALUE_CHARS] + f"…(+{len(value) - MAX_VALUE_CHARS} chars)"
+        return value
+    if isinstance(value, dict):
+        return {key: _truncate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate(item) for item in value]
+    return value
+
+
+class JsonlEventLogger:
+    """Appends tool events to a JSONL file from a background thread.
+
+    log_tool_event() only records a timestamp and puts the event on a queue,
+    so a hook costs microseconds. The writer thread serializes whatever has
+    queued up, writes it in one call and flushes at least every
+    flush_interval seconds. The file is rotated like RotatingFileHandler
+    (path.1, path.2, …) before a write would take it past max_bytes.
+
+    Pre and Post events of a tool are paired by tool_use_id: the Post record
+    carries latency_ms, the wall-clock time the tool took.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize event logger.
+
+        Args:
+            path: Log file (default: logs/tool_events_<timestamp>.jsonl)
+            max_bytes: Rotate at this size (default: HOOK_LOG_MAX_BYTES or 10MB)
+            backup_count: Rotated files kept (default: HOOK_LOG_BACKUP_COUNT or 5)
+            flush_interval: Longest time an event waits before it is written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = path or os.path.join("logs", f"tool_events_{timestamp}.jsonl")
+        self.max_bytes = max_bytes or int(os.getenv("HOOK_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.backup_count = backup_count if backup_count is not None else int(os.getenv("HOOK_LOG_BACKUP_COUNT", "5"))
+        self.flush_interval = flush_interval
+        self.dropped = 0  # Events that could not be written
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending: dict[str, float] = {}
+        self._file = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="hook-event-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log_tool_event(self, input_data: dict[str, Any], tool_use_id: Optional[str]) -> Optional[float]:
+        """
+        Record a PreToolUse or PostToolUse hook event (non-blocking).
+
+        Args:
+            input_data: Hook input
+            tool_use_id: Id shared by the Pre and Post event of one tool call
+
+        Returns:
+            For a PostToolUse event whose PreToolUse was seen, the tool's latency in seconds
+        """
+        now = time.perf_counter()
+        event = input_data.get("hook_event_name")
+        latency_ms = None
+        if tool_use_id:
+            if event == "PreToolUse":
+                self._pending[tool_use_id] = now
+                if len(self._pending) > MAX_PENDING:
+                    del self._pending[next(iter(self._pending))]
+            elif event == "PostToolUse":
+                started = self._pending.pop(tool_use_id, None)
+                if started is not None:
+                    latency_ms = round((now - started) * 1000, 3)
+        self.log({
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "event": event,
+            "tool_name": input_data.get("tool_name"),
+            "tool_use_id": tool_use_id,
+            "session_id": input_data.get("session_id"),
+            "latency_ms": latency_ms,
+            "_input": input_data,
+        })
+        return latency_ms / 1000 if latency_ms is not None else None
+
+    def log(self, record: dict) -> None:
+        """Queue a record for writing (non-blocking)."""
+        if self._closed:
+            self.dropped += 1
+            return
+        self._queue.put(record)
+
+    def _run(self) -> None:
+        """Writer thread: write queued records in batches until close()."""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(record is _STOP for record in batch)
+            records = [record for record in batch if record is not _STOP]
+            if records:
+                try:
+                    self._write(records)
+                except Exception as e:
+                    self.dropped += len(records)
+                    print(f"Failed to write tool events: {str(e)}")
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, records: list) -> None:
+        """Serialize and append records, rotating the file when it is full."""
+        lines = []
+        for record in records:
+            input_data = record.pop("_input", None)
+            if input_data is not None:
+                if record["event"] == "PreToolUse":
+                    record["tool_input"] = _truncate(input_data.get("tool_input"))
+                elif "tool_response" in input_data:
+                    response = input_data["tool_response"]
+                    record["response_chars"] = len(response if isinstance(response, str) else json.dumps(response, ensure_ascii=False, default=str))
+                    if isinstance(response, dict) and "is_error" in response:
+                        record["is_error"] = response["is_error"]
+            lines.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+        data = "".join(lines)
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and self._file.tell() + len(data.encode("utf-8")) > self.max_bytes:
+            self._rotate()
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        """Shift path.N to path.N+1 so the next write starts a new file."""
+        self._file.close()
+        self._file = None
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+_default_logger: Optional[JsonlEventLogger] = None
+_default_lock = threading.Lock()
+
+
+def default_event_logger() -> JsonlEventLogger:
+    """The process-wide logger shared by every session's hooks."""
+    global _default_logger
+    with _default_lock:
+        if _default_logger is None:
+            _default_logger = JsonlEventLogger()
+        return _default_logger
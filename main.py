@@ -1,92 +1,58 @@
+import startup_timing  # first, so startup time covers the imports below
+
 import asyncio
 import os
-from claude_code_sdk import query, ClaudeCodeOptions
-from claude_code_sdk.types import McpStdioServerConfig
-from claude_code_sdk_client import ClaudeCodeClient
+from agent_options import build_options
+from claude_code_sdk_client import ClaudeCodeClient, TurnFailedError, TurnTimeoutError
 from hooks.basichooks import BasicHooks
-from prompts.buzzPRTaskPrompt import create_buzz_pr_task_prompt
-from prompts.append_system_prompt import append_system_prompt
-from prompts.buzzVideoPrompt import create_buzz_video_prompt
-from sdk_mcp_server.server import aitimes_db_mcp_server
-last_session_id = None
-
-playwrightMcpServer = McpStdioServerConfig(
-    command="npx",
-    args=["@playwright/mcp@latest"]
-)
-
-
-## playwright mcp tools
-playwrightMcpTools = [
-    'mcp__playwright-mcp__browser_navigate',
-    'mcp__playwright-mcp__browser_navigate_back',
-    'mcp__playwright-mcp__browser_navigate_forward',
-    'mcp__playwright-mcp__browser_close',
-    'mcp__playwright-mcp__browser_resize',
-    'mcp__playwright-mcp__browser_snapshot',
-    'mcp__playwright-mcp__browser_take_screenshot',
-    'mcp__playwright-mcp__browser_console_messages',
-    'mcp__playwright-mcp__browser_network_requests',
-    'mcp__playwright-mcp__browser_click',
-    'mcp__playwright-mcp__browser_hover',
-    'mcp__playwright-mcp__browser_drag',
-    'mcp__playwright-mcp__browser_type',
-    'mcp__playwright-mcp__browser_press_key',
-    'mcp__playwright-mcp__browser_select_option',
-    'mcp__playwright-mcp__browser_tab_list',
-    'mcp__playwright-mcp__browser_tab_new',
-    'mcp__playwright-mcp__browser_tab_select',
-    'mcp__playwright-mcp__browser_tab_close',
-    'mcp__playwright-mcp__browser_evaluate',
-    'mcp__playwright-mcp__browser_file_upload',
-    'mcp__playwright-mcp__browser_handle_dialog',
-    'mcp__playwright-mcp__browser_wait_for',
-    'mcp__playwright-mcp__browser_install',
-    'mcp__playwright-mcp__browser_parse_insight',
-    'mcp__playwright-mcp__send_insight'
-]
-allowed_tools = [
-    "Read",
-    "Write",
-    "Edit",
-    "Bash",
-    "Glob",
-    "Grep",
-    "WebSearch"
-]
-
-aitimes_db_mcp_tools = [
-    "mcp__aitimes-db-mcp__create_article",
-    "mcp__aitimes-db-mcp__get_article",
-    "mcp__aitimes-db-mcp__update_article",
-    "mcp__aitimes-db-mcp__list_articles",
-    "mcp__aitimes-db-mcp__delete_article",
-    "mcp__aitimes-db-mcp__upload_video"
-]
+from observability.exporters import start_exporters
+from observability.instrumentation import REGISTRY
+from prompts.buzzPRTaskPrompt import create_buzz_pr_task_steps
+from prompts.buzzVideoPrompt import create_buzz_video_steps
+from dataclasses import replace
+from session_pool import SessionStore
+from usage_accounting import Budget, BudgetExceededError, UsageLedger
+from sdk_mcp_server.server import services
+
+session_store = SessionStore()
+# Session id to continue instead of running the tasks ("last" for the most recent one)
+resume_session_id = os.getenv("CLAUDE_RESUME_SESSION")
+if resume_session_id == "last":
+    resume_session_id = session_store.get()
 
 basic_hooks = BasicHooks()
 hooks = basic_hooks.get_hooks()
 
-allowed_tools = allowed_tools + playwrightMcpTools + aitimes_db_mcp_tools
+# TASK_BUDGET_* limit each task; usage is saved to outputs/usage/
+budget = Budget.from_env()
+usage_ledger = UsageLedger()
 
-options = ClaudeCodeOptions(
-    model="opus",
-    allowed_tools=allowed_tools,
-    permission_mode="acceptEdits",
-    cwd=os.path.dirname(os.path.abspath(__file__)),
-    mcp_servers={
-        "playwright-mcp": playwrightMcpServer,
-        "aitimes-db-mcp": aitimes_db_mcp_server
-    },
-    append_system_prompt=append_system_prompt,
-    hooks=hooks
-)
+options = build_options(hooks, max_turns=budget.max_turns if budget else None)
+if resume_session_id:
+    options = replace(options, resume=resume_session_id)
 
-client = ClaudeCodeClient(options)
+client = ClaudeCodeClient(options, session_store=session_store)
+startup_timing.mark("imports_done")
 
 async def main():
-    await client.start_task(create_buzz_pr_task_prompt)
-    await client.start_task(create_buzz_video_prompt)
+    # METRICS_PORT serves /metrics on localhost, METRICS_FILE writes them periodically
+    start_exporters(REGISTRY)
+    # Bring MongoDB and Supabase up in the background while the agent starts
+    if os.getenv("AITIMES_DB_WARMUP", "1").lower() in ("1", "true", "yes"):
+        services.start_warmup(create_indexes=True)
+    if resume_session_id:
+        print(f"⚡️ Resuming session {resume_session_id}")
+    else:
+        for task_name, steps in (("buzz_pr", create_buzz_pr_task_steps()), ("buzz_video", create_buzz_video_steps())):
+            try:
+                await client.start_task(steps, budget=budget)
+            except (BudgetExceededError, TurnFailedError, TurnTimeoutError) as e:
+                # The remaining tasks build on this one; continue interactively instead
+                print(f"⚠️ {task_name}: {str(e)}")
+                break
+            finally:
+                usage_ledger.record(task_name, client.task_usage)
+                print(f"💰 {task_name}: {client.task_usage.describe()} (saved to {usage_ledger.save()})")
     await client.start()
 
 
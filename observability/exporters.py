@@ -0,0 +1,113 @@
+"""Expose a metrics registry over HTTP on localhost or as a periodically written file."""
+
+import atexit
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .metrics import MetricsRegistry
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def serve_http(registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the registry at http://host:port/metrics from a daemon thread.
+
+    Args:
+        registry: Metrics to expose
+        port: Port to listen on (0 picks a free one; see server.server_port)
+        host: Interface to bind; localhost only by default
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes would flood the agent's console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 Metrics at http://{host}:{server.server_port}/metrics")
+    return server
+
+
+class MetricsFileWriter:
+    """Rewrites a file with the registry's OpenMetrics text every interval seconds and at exit."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        """
+        Initialize file writer.
+
+        Args:
+            registry: Metrics to write
+            path: Output file; replaced atomically so readers never see a partial file
+            interval: Seconds between writes
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+
+    def start(self) -> "MetricsFileWriter":
+        """Start writing in the background."""
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def write(self) -> None:
+        """Write the current metrics now."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.registry.render())
+        os.replace(temp_path, self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except Exception as e:
+                print(f"Failed to write metrics: {str(e)}")
+
+    def stop(self) -> None:
+        """Stop the background thread and write the final metrics."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        try:
+            self.write()
+        except Exception as e:
+            print(f"Failed to write metrics: {str(e)}")
+
+
+def start_exporters(registry: MetricsRegistry, port: Optional[int] = None, path: Optional[str] = None, interval: Optional[float] = None) -> None:
+    """
+    Start the exporters that are configured.
+
+    Args:
+        registry: Metrics to expose
+        port: HTTP port (default: METRICS_PORT; unset disables the endpoint)
+        path: File to write (default: METRICS_FILE; unset disables the file)
+        interval: Seconds between file writes (default: METRICS_FILE_INTERVAL or 15)
+    """
+    port = port if port is not None else (int(os.environ["METRICS_PORT"]) if os.getenv("METRICS_PORT") else None)
+    path = path or os.getenv("METRICS_FILE")
+    interval = interval or float(os.getenv("METRICS_FILE_INTERVAL", "15"))
+    if port is not None:
+        serve_http(registry, port)
+    if path:
+        MetricsFileWriter(registry, path, interval).start()
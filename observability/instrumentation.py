@@ -0,0 +1,111 @@
+"""The process-wide metrics registry, its metrics, and decorators that feed them and the tracer."""
+
+import functools
+import inspect
+import time
+from typing import Callable, Optional
+
+from .metrics import Histogram, MetricsRegistry
+from .tracing import TRACER
+
+REGISTRY = MetricsRegistry()
+
+AGENT_TOOL_CALLS = REGISTRY.counter(
+    "agent_tool_calls", "Tool calls started by the agent (from PreToolUse hooks)", ("tool",)
+)
+AGENT_TOOL_DURATION = REGISTRY.histogram(
+    "agent_tool_duration_seconds", "Wall-clock time of agent tool calls, from PreToolUse to PostToolUse", ("tool",)
+)
+AGENT_TURN_DURATION = REGISTRY.histogram(
+    "agent_turn_duration_seconds", "Time from sending a task step to its ResultMessage", ("step", "status")
+)
+MCP_TOOL_DURATION = REGISTRY.histogram(
+    "mcp_tool_duration_seconds", "Time spent in aitimes-db-mcp tool handlers", ("tool", "status")
+)
+BACKEND_OPERATION_DURATION = REGISTRY.histogram(
+    "backend_operation_duration_seconds", "Time of MongoDB and Supabase operations", ("backend", "operation", "status")
+)
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """
+    Record the duration of an MCP tool handler and trace it.
+
+    Status is taken from the handler's "success" field. The span is a child
+    of the open tool span for this MCP tool of the same client (see
+    BasicHooks and Tracer.enter_client_scope).
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        status = "error"
+        parent = TRACER.find_open_span("mcp.tool", func.__name__)
+        with TRACER.span(f"mcp {func.__name__}", parent=parent, attributes={"mcp.tool": func.__name__}) as span:
+            try:
+                result = await func(*args, **kwargs)
+                if not isinstance(result, dict) or result.get("success", True):
+                    status = "ok"
+                else:
+                    span.set_error(str(result.get("error")))
+                return result
+            finally:
+                MCP_TOOL_DURATION.observe(time.perf_counter() - started, tool=func.__name__, status=status)
+    return wrapper
+
+
+def instrument_backend(backend: str, operation: Optional[str] = None) -> Callable:
+    """
+    Record the duration of a backend call, sync or async.
+
+    Args:
+        backend: Backend label, e.g. "mongodb" or "supabase"
+        operation: Operation label (default: the function name)
+
+    Returns:
+        Decorator; a raised exception is recorded with status "error". The
+        call is traced as a child of the current span
+    """
+    def decorator(func: Callable) -> Callable:
+        labels = {"backend": backend, "operation": operation or func.__name__}
+        span_name = f"{backend} {labels['operation']}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                status = "error"
+                with TRACER.span(span_name, attributes=labels):
+                    try:
+                        result = await func(*args, **kwargs)
+                        status = "ok"
+                        return result
+                    finally:
+                        BACKEND_OPERATION_DURATION.observe(time.perf_counter() - started, status=status, **labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            status = "error"
+            with TRACER.span(span_name, attributes=labels):
+                try:
+                    result = func(*args, **kwargs)
+                    status = "ok"
+                    return result
+                finally:
+                    BACKEND_OPERATION_DURATION.observe(time.perf_counter() - started, status=status, **labels)
+        return wrapper
+
+    return decorator
+
+
+def print_latency_summary(registry: MetricsRegistry = REGISTRY) -> None:
+    """Print count, p50 and p99 of every histogram label set."""
+    print("\n⏱️ Latency summary (p50 / p99)")
+    for metric in registry.metrics():
+        if not isinstance(metric, Histogram):
+            continue
+        for labels in metric.label_sets():
+            p50, p99 = metric.quantile(0.5, **labels), metric.quantile(0.99, **labels)
+            label_text = ", ".join(f"{name}={value}" for name, value in labels.items())
+            print(f"  {metric.name} {{{label_text}}}: n={metric.count(**labels)} p50={p50:.3f}s p99={p99:.3f}s")
@@ -0,0 +1,207 @@
+"""In-process counters and latency histograms rendered as OpenMetrics text."""
+
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+# Seconds; spans sub-millisecond cache hits to multi-minute agent turns
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames) or '(none)'}, got {', '.join(labels) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> str:
+        lines = [f"# TYPE {self.name} {self.type_name}", f"# HELP {self.name} {_escape(self.help_text)}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add amount (must not be negative) to the count of labels."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current count of labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * bucket_count  # Not cumulative; the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Distribution of observed values per label set, in fixed buckets.
+
+    Quantiles are estimated from the buckets (like Prometheus'
+    histogram_quantile), so p50/p99 can be compared across runs and
+    releases without keeping every observation.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.bounds = tuple(sorted(buckets)) + (math.inf,)
+        self._states: Dict[LabelValues, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one value for labels."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(len(self.bounds))
+            state.buckets[index] += 1
+            state.count += 1
+            state.sum += value
+
+    def count(self, **labels: str) -> int:
+        """Number of values recorded for labels."""
+        with self._lock:
+            state = self._states.get(self._key(labels))
+            return state.count if state else 0
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """
+        Estimate a quantile of the values recorded for labels.
+
+        Args:
+            q: Quantile between 0 and 1 (0.5 for p50, 0.99 for p99)
+
+        Returns:
+            Linear interpolation within the bucket holding the quantile, or
+            None if nothing was recorded
+        """
+        with self._lock:
+            state = self._states.get(self._key(labels))
+            if not state or not state.count:
+                return None
+            buckets = list(state.buckets)
+            total = state.count
+
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(buckets):
+            if cumulative + bucket_count >= rank and bucket_count:
+                upper = self.bounds[index]
+                lower = self.bounds[index - 1] if index else 0.0
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.bounds[-2]
+
+    def label_sets(self) -> Iterable[Dict[str, str]]:
+        """Every label set that has recorded values."""
+        with self._lock:
+            keys = sorted(self._states)
+        return [dict(zip(self.labelnames, key)) for key in keys]
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            states = sorted((key, list(state.buckets), state.count, state.sum) for key, state in self._states.items())
+        for key, buckets, count, total in states:
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds, buckets):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+
+
+class MetricsRegistry:
+    """Named metrics of the process; registering a name twice returns the same metric."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def metrics(self) -> list:
+        """Registered metrics in registration order."""
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Every metric in the OpenMetrics text format."""
+        return "\n".join(metric.render() for metric in self.metrics()) + "\n# EOF\n"
@@ -0,0 +1,71 @@
+"""Tests for histogram quantiles and the OpenMetrics rendering."""
+
+import pytest
+
+from observability.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_quantile_interpolates_within_bucket():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    # Ranks: 1 in (0, 1], 2 in (1, 2], 1 in (2, 4]
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(0.75) == pytest.approx(2.0)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+
+
+def test_quantile_of_overflow_bucket_is_highest_bound():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(1.0, 2.0))
+    histogram.observe(10.0)
+    assert histogram.quantile(0.99) == 2.0
+
+
+def test_quantile_without_observations_is_none():
+    histogram = Histogram("latency_seconds", "Latency", labelnames=("tool",))
+    histogram.observe(0.1, tool="Read")
+    assert histogram.quantile(0.5, tool="Write") is None
+    assert histogram.count(tool="Read") == 1
+
+
+def test_labels_must_match():
+    histogram = Histogram("latency_seconds", "Latency", labelnames=("tool",))
+    with pytest.raises(ValueError):
+        histogram.observe(0.1)
+    with pytest.raises(ValueError):
+        Counter("calls", "Calls").inc(-1)
+
+
+def test_render_openmetrics():
+    registry = MetricsRegistry()
+    counter = registry.counter("tool_calls", "Tool calls", ("tool",))
+    counter.inc(tool='Bash "quoted"')
+    counter.inc(2, tool="Read")
+    histogram = registry.histogram("tool_seconds", "Tool latency\nin seconds", ("tool",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, tool="Read")
+    histogram.observe(0.5, tool="Read")
+    histogram.observe(5.0, tool="Read")
+
+    assert registry.render() == "\n".join([
+        "# TYPE tool_calls counter",
+        "# HELP tool_calls Tool calls",
+        'tool_calls_total{tool="Bash \\"quoted\\""} 1',
+        'tool_calls_total{tool="Read"} 2',
+        "# TYPE tool_seconds histogram",
+        "# HELP tool_seconds Tool latency\\nin seconds",
+        'tool_seconds_bucket{tool="Read",le="0.1"} 1',
+        'tool_seconds_bucket{tool="Read",le="1"} 2',
+        'tool_seconds_bucket{tool="Read",le="+Inf"} 3',
+        'tool_seconds_count{tool="Read"} 3',
+        'tool_seconds_sum{tool="Read"} 5.55',
+        "# EOF",
+        "",
+    ])
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("calls", "Calls") is registry.counter("calls", "Calls")
+    with pytest.raises(ValueError):
+        registry.histogram("calls", "Calls")
@@ -0,0 +1,294 @@
+"""Span tracing exported as OTLP JSON, loadable into trace viewers such as Jaeger.
+
+Spans nest through a context variable, so backend calls made while a span is
+current (including from asyncio.to_thread and the upload executor) become its
+children. Agent tool calls cannot be nested that way: their Pre and Post hooks
+and the in-process MCP tool handlers run in tasks of the SDK, not in the task
+that sent the prompt. They are linked explicitly instead, by session id (turn
+span) and by tool_use_id and tool name (tool span). Tool names repeat across
+sessions running at once, so each client is connected inside a client scope
+(enter_client_scope): the SDK runs its hooks and MCP handlers in tasks
+started by connect(), which inherit the scope, and a handler is only linked
+to tool spans of its own client.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Open spans that nothing ends (no PostToolUse and no turn to end with) are dropped after this
+OPEN_SPAN_MAX_AGE_SECONDS = 3600
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_client_scope: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("client_scope", default=None)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation of a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    start_ns: int = 0
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status_code: int = STATUS_UNSET
+    status_message: Optional[str] = None
+    on_end: Optional[Callable[["Span"], None]] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a string, number or boolean attribute."""
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """Mark the span as failed."""
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter (ending twice is a no-op)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.on_end is not None:
+            self.on_end(self)
+
+    def to_otlp(self) -> dict:
+        """The span as an OTLP/JSON span object."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpJsonFileExporter:
+    """Appends finished spans to a file in batches, one OTLP/JSON export request per line.
+
+    This is the layout of the OpenTelemetry Collector's file exporter, so the
+    file can be replayed into a collector or split into per-line JSON for a
+    trace viewer.
+    """
+
+    def __init__(self, path: str, service_name: str = "aitimes-agent", flush_interval: float = 2.0):
+        """
+        Initialize exporter.
+
+        Args:
+            path: Output file (created with its directory on first write)
+            service_name: service.name resource attribute
+            flush_interval: Seconds between writes
+        """
+        self.path = path
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span."""
+        with self._lock:
+            self._spans.append(span)
+
+    def flush(self) -> None:
+        """Write the queued spans now."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "aitimes"}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to export spans: {str(e)}")
+
+    def shutdown(self) -> None:
+        """Stop the background thread and write the remaining spans."""
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Failed to export spans: {str(e)}")
+
+
+class Tracer:
+    """Creates spans and keeps the cross-task links between them."""
+
+    def __init__(self, exporter: Optional[OtlpJsonFileExporter] = None):
+        """
+        Initialize tracer.
+
+        Args:
+            exporter: Receives finished spans; without one, spans are created
+                but dropped
+        """
+        self.exporter = exporter
+        self._session_spans: Dict[str, Span] = {}
+        self._open_spans: Dict[str, Tuple[Span, Optional[str]]] = {}  # key -> (span, client scope)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """
+        Start a span; end it with span.end().
+
+        Args:
+            name: Operation name
+            parent: Parent span (default: the current span; none starts a new trace)
+            attributes: Initial attributes
+
+        Returns:
+            The started span (not made current)
+        """
+        parent = parent or _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+            on_end=self.exporter.export if self.exporter else None,
+        )
+
+    @contextlib.contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        """Run a block in a new current span; an exception marks it failed and is re-raised."""
+        span = self.start_span(name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def current_span(self) -> Optional[Span]:
+        """The span of the running code, if any."""
+        return _current_span.get()
+
+    def bind_session(self, session_id: str, span: Span) -> None:
+        """Parent the hook spans of session_id to span (the running turn)."""
+        with self._lock:
+            self._session_spans[session_id] = span
+
+    def unbind_session(self, session_id: str) -> None:
+        """Stop parenting to the turn bound to session_id, ending its tool spans that are still open."""
+        with self._lock:
+            turn = self._session_spans.pop(session_id, None)
+            if turn is None:
+                return
+            keys = [key for key, (span, _) in self._open_spans.items() if span.parent_span_id == turn.span_id]
+            children = [self._open_spans.pop(key)[0] for key in keys]
+        for span in children:
+            # Interrupted tools get no PostToolUse
+            span.set_error("turn ended before the tool finished")
+            span.end()
+
+    def enter_client_scope(self) -> str:
+        """
+        Start a client scope in the current context; connect one client after this.
+
+        Returns:
+            The scope's id
+        """
+        scope = secrets.token_hex(8)
+        _client_scope.set(scope)
+        return scope
+
+    def session_span(self, session_id: Optional[str]) -> Optional[Span]:
+        """The span bound to session_id, if any."""
+        with self._lock:
+            return self._session_spans.get(session_id) if session_id else None
+
+    def start_open_span(self, key: str, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span that is ended from elsewhere by end_open_span(key)."""
+        span = self.start_span(name, parent, attributes)
+        expired_before = span.start_ns - OPEN_SPAN_MAX_AGE_SECONDS * 1_000_000_000
+        with self._lock:
+            expired = [key for key, (open_span, _) in self._open_spans.items() if open_span.start_ns < expired_before]
+            for expired_key in expired:
+                del self._open_spans[expired_key]
+            self._open_spans[key] = (span, _client_scope.get())
+        return span
+
+    def end_open_span(self, key: str, error: Optional[str] = None) -> Optional[Span]:
+        """End the span started under key, if it is still open."""
+        with self._lock:
+            span, _ = self._open_spans.pop(key, (None, None))
+        if span is not None:
+            if error:
+                span.set_error(error)
+            span.end()
+        return span
+
+    def find_open_span(self, attribute: str, value: Any) -> Optional[Span]:
+        """The most recently started open span of the current client scope whose attribute equals value."""
+        scope = _client_scope.get()
+        with self._lock:
+            for span, span_scope in reversed(self._open_spans.values()):
+                if span_scope == scope and span.attributes.get(attribute) == value:
+                    return span
+        return None
+
+
+def _tracer_from_env() -> Tracer:
+    """Tracer writing to TRACE_FILE (default logs/traces_<timestamp>.jsonl); TRACING=0 disables export."""
+    if os.getenv("TRACING", "1").lower() not in ("1", "true", "yes"):
+        return Tracer()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.getenv("TRACE_FILE") or os.path.join("logs", f"traces_{timestamp}.jsonl")
+    return Tracer(OtlpJsonFileExporter(path))
+
+
+TRACER = _tracer_from_env()
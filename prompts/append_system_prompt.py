@@ -6,5 +6,8 @@ Please create high-quality deliverables using subagents (graphic designers) and
 `./scripts/deep_direction.py` has the capability to analyze the article content and develop an optimal design concept that will maximize impressions and engagement for the press release.
 `./scripts/nanobanana.py` has the capability to run a highly efficient image generation/editing AI.
 `./scripts/take_screenshot_from_html.py` has the capability to take a screenshot of a specific element from an HTML file.
+Before taking several screenshots, start `python scripts/screenshot_service.py &` once; take_screenshot_from_html.py then renders in its warm browser instead of launching a new one each time.
+To render several sizes of one thumbnail (e.g. 1x1 and 16x9), pass them in one call with repeated `--variant WIDTHxHEIGHT:OUT` (or a `--jobs` JSON file for several HTML files); the HTML is loaded once and every variant is rendered from it.
+Renders of unchanged HTML (and unchanged local images and stylesheets it uses) are served from a render cache without a browser, so re-running a screenshot is cheap; pass `--no_cache` to force a fresh render.
 `./scripts/veo_3.py` has the capability to create a video from a prompt.
 """
\ No newline at end of file
@@ -0,0 +1,29 @@
+import json
+
+from claude_code_sdk_client import TurnStep
+from prompts.buzzPRTaskPrompt import display_all_thambnail_images_prompt
+from prompts.buzzVideoPrompt import create_video_prompt, display_all_video_prompt
+
+
+def create_batch_article_steps(entry: dict, result_path: str, with_video: bool = False) -> list[TurnStep]:
+    """Turns that take one input.json entry through /prcreative in its own session."""
+    article_prompt = f"""
+/prcreative
+
+Process ONLY this article from input.json; other articles are handled by other sessions at the same time:
+```json
+{json.dumps(entry, ensure_ascii=False, indent=2)}
+```
+Keep every file you create for it under outputs/{entry["id"]}/ so sessions do not overwrite each other.
+When you are done, write this article's final output entry (the same fields as an entry of final_output.json) as a single JSON object to `{result_path}`.
+"""
+    steps = [
+        TurnStep(prompt=article_prompt, timeout_seconds=1800, name="prcreative"),
+        TurnStep(prompt=display_all_thambnail_images_prompt, timeout_seconds=600, name="save thumbnails"),
+    ]
+    if with_video:
+        steps += [
+            TurnStep(prompt=create_video_prompt, timeout_seconds=1800, name="video creation"),
+            TurnStep(prompt=display_all_video_prompt, timeout_seconds=600, name="save video"),
+        ]
+    return steps
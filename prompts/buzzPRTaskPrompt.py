@@ -1,5 +1,4 @@
-import asyncio
-from typing import Any, Dict, Generator
+from claude_code_sdk_client import TurnStep
 
 double_check_prompt = """
 /video_creation
@@ -9,30 +8,12 @@ display_all_thambnail_images_prompt = """
 TODO:
 1. Open the image file and show the user the image you created.
 2. save the image to the database. You will save it to the database using MCP.
+   Pass `renditions: true` so the 1x1 and 16x9 size variants are generated and uploaded automatically; do not create size variants by hand.
 """
 
-def create_buzz_pr_task_prompt():
-    async def message_generator():
-        # 最初のメッセージ
-        yield {
-            "type": "user",
-            "message": {
-                "role": "user",
-                "content": "/prcreative"
-            }
-        }
-
-        # 条件を待機
-        await asyncio.sleep(20)
-
-        # 四番目のメッセージ
-        yield {
-            "type": "user",
-            "message": {
-                "role": "user",
-                "content": display_all_thambnail_images_prompt
-            }
-        }
-        await asyncio.sleep(20)
-
-    return message_generator
\ No newline at end of file
+def create_buzz_pr_task_steps():
+    # 各ステップは前のステップのターンが終わってから送られます
+    return [
+        TurnStep(prompt="/prcreative", timeout_seconds=1800, name="prcreative"),
+        TurnStep(prompt=display_all_thambnail_images_prompt, timeout_seconds=600, name="save thumbnails"),
+    ]
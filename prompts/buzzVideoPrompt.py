@@ -1,5 +1,4 @@
-import asyncio
-from typing import Any, Dict, Generator
+from claude_code_sdk_client import TurnStep
 
 create_video_prompt = """
 /video_creation
@@ -11,28 +10,9 @@ TODO:
 2. save the video to the database. You will save it to the database using MCP.
 """
 
-def create_buzz_video_prompt():
-    async def message_generator():
-        # 最初のメッセージ
-        yield {
-            "type": "user",
-            "message": {
-                "role": "user",
-                "content": create_video_prompt
-            }
-        }
-
-        # 条件を待機
-        await asyncio.sleep(20)
-
-        # 四番目のメッセージ
-        yield {
-            "type": "user",
-            "message": {
-                "role": "user",
-                "content": display_all_video_prompt
-            }
-        }
-        await asyncio.sleep(20)
-
-    return message_generator
\ No newline at end of file
+def create_buzz_video_steps():
+    # 各ステップは前のステップのターンが終わってから送られます
+    return [
+        TurnStep(prompt=create_video_prompt, timeout_seconds=1800, name="video creation"),
+        TurnStep(prompt=display_all_video_prompt, timeout_seconds=600, name="save video"),
+    ]
@@ -0,0 +1,233 @@
+"""Content-addressed cache of rendered thumbnails.
+
+A render is keyed by a hash of the HTML file, the local files it references
+(images, stylesheets and the files those stylesheets reference), the viewport
+and the selector. Re-rendering an unchanged thumbnail then costs a file copy
+instead of a browser. Remote resources such as web fonts are keyed by URL
+only, so a change on the remote side is not noticed.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from typing import Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+# Bump to invalidate every entry when the rendering itself changes
+KEY_VERSION = "1"
+
+_REFERENCE_PATTERNS = [
+    re.compile(r"""\b(?:src|href|poster|data)\s*=\s*["']([^"']+)["']""", re.IGNORECASE),
+    re.compile(r"""url\(\s*["']?([^"')]+?)["']?\s*\)""", re.IGNORECASE),
+    re.compile(r"""@import\s+["']([^"']+)["']""", re.IGNORECASE),
+]
+_SRCSET_PATTERN = re.compile(r"""\bsrcset\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+_REMOTE_PREFIXES = ("http:", "https:", "//", "data:", "blob:", "about:", "mailto:", "javascript:", "#")
+_NESTED_SUFFIXES = (".css", ".svg", ".html", ".htm")
+
+
+def _references(text: str) -> Iterator[str]:
+    for pattern in _REFERENCE_PATTERNS:
+        for match in pattern.finditer(text):
+            yield match.group(1).strip()
+    for match in _SRCSET_PATTERN.finditer(text):
+        # "a.png 1x, b.png 2x"
+        for candidate in match.group(1).split(","):
+            if candidate.strip():
+                yield candidate.split()[0]
+
+
+def local_assets(html_path: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Local files an HTML file depends on, following stylesheets and SVGs.
+
+    Args:
+        html_path: Path to the HTML file
+
+    Returns:
+        (reference as written, resolved path or None if it does not exist) in
+        discovery order
+    """
+    assets = []
+    seen: Set[str] = set()
+    pending = [os.path.abspath(html_path)]
+    while pending:
+        document = pending.pop(0)
+        with open(document, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        for reference in _references(text):
+            if reference.lower().startswith(_REMOTE_PREFIXES):
+                continue
+            if reference.startswith("file://"):
+                path = unquote(urlparse(reference).path)
+            else:
+                path = unquote(reference.split("#")[0].split("?")[0])
+                if not path:
+                    continue
+                path = os.path.join(os.path.dirname(document), path)
+            path = os.path.normpath(path)
+            if path in seen:
+                continue
+            seen.add(path)
+            exists = os.path.isfile(path)
+            assets.append((reference, path if exists else None))
+            if exists and path.lower().endswith(_NESTED_SUFFIXES):
+                pending.append(path)
+    return assets
+
+
+def detach(out: str) -> None:
+    """
+    Unlink out if it is hard-linked (to a cache entry placed by an older
+    version of this cache), so that rendering over it writes a new file
+    instead of into the cache.
+    """
+    try:
+        if os.stat(out).st_nlink > 1:
+            os.remove(out)
+    except FileNotFoundError:
+        pass
+
+
+def _hash_file(digest, path: str) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+class RenderCache:
+    """PNG renders stored by content key, bounded in size with LRU eviction."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize render cache.
+
+        Args:
+            directory: Cache directory (default: RENDER_CACHE_DIR or outputs/render_cache)
+            max_bytes: Size limit of the stored PNGs (default: RENDER_CACHE_MAX_BYTES or 256MB)
+        """
+        self.directory = directory or os.getenv("RENDER_CACHE_DIR", os.path.join("outputs", "render_cache"))
+        self.max_bytes = max_bytes or int(os.getenv("RENDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def key(self, html_path: str, content_selector: str, width: int, height: int) -> Optional[str]:
+        """
+        Content key of a render.
+
+        Returns:
+            Hex digest, or None if the render cannot be cached (a URL, or a
+            file that cannot be read)
+        """
+        if "://" in html_path and not html_path.startswith("file://"):
+            return None
+        if html_path.startswith("file://"):
+            html_path = unquote(urlparse(html_path).path)
+        digest = hashlib.sha256()
+        digest.update(f"v{KEY_VERSION}\0{content_selector}\0{width}x{height}\0".encode("utf-8"))
+        try:
+            _hash_file(digest, html_path)
+            for reference, path in local_assets(html_path):
+                digest.update(f"\0{reference}\0".encode("utf-8"))
+                if path is None:
+                    digest.update(b"missing")
+                else:
+                    _hash_file(digest, path)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def fetch(self, key: Optional[str], out: str) -> bool:
+        """
+        Copy the cached render of key to out.
+
+        Returns:
+            Whether it was a hit
+        """
+        if key is None:
+            self.misses += 1
+            return False
+        entry = self._entry(key)
+        try:
+            # The entry's mtime is its LRU position
+            os.utime(entry)
+            os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+            if os.path.lexists(out):
+                os.remove(out)
+            # A copy, not a link: editing out in place must not change the entry
+            shutil.copyfile(entry, out)
+        except FileNotFoundError:
+            # Never stored, or evicted by another process meanwhile
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key: Optional[str], rendered: str) -> None:
+        """Add a fresh render under key, then evict down to the size limit."""
+        if key is None or not os.path.isfile(rendered):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entry = self._entry(key)
+        temp_path = f"{entry}.{os.getpid()}.tmp"
+        # A copy, not a link: the cache must not change if rendered is later
+        # edited in place
+        shutil.copyfile(rendered, temp_path)
+        os.replace(temp_path, entry)
+        self.stored += 1
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every entry, least recently used first."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            if not name.endswith(".png"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def describe(self) -> str:
+        """One-line summary for logs."""
+        return (
+            f"{self.hits} hit(s), {self.misses} miss(es), {self.stored} stored, {self.evicted} evicted, "
+            f"{self.size() / (1024 * 1024):.1f}MB / {self.max_bytes / (1024 * 1024):.0f}MB"
+        )
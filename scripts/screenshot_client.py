@@ -0,0 +1,109 @@
+"""Client of the screenshot service (scripts/screenshot_service.py).
+
+Kept free of Playwright imports so forwarding a render costs only a socket
+round trip.
+"""
+
+import json
+import os
+import socket
+from typing import List, Optional
+
+DEFAULT_SOCKET_PATH = os.getenv("SCREENSHOT_SOCKET", "/tmp/aitimes-screenshot.sock")
+
+
+class ScreenshotServiceError(RuntimeError):
+    """Raised when the service could not complete a request."""
+
+
+def request(message: dict, socket_path: Optional[str] = None, timeout: float = 120.0) -> dict:
+    """
+    Send one request to the service and wait for its reply.
+
+    Args:
+        message: Request with an "op" field
+        socket_path: Service socket (default: SCREENSHOT_SOCKET or /tmp/aitimes-screenshot.sock)
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        The reply
+
+    Raises:
+        OSError: If the service is not running
+        ScreenshotServiceError: If the service reported an error
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path or DEFAULT_SOCKET_PATH)
+        connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+    if not buffer:
+        raise ScreenshotServiceError("Service closed the connection without a reply")
+    reply = json.loads(buffer)
+    if not reply.get("ok"):
+        raise ScreenshotServiceError(reply.get("error") or "Unknown error")
+    return reply
+
+
+def is_running(socket_path: Optional[str] = None) -> bool:
+    """Whether a service is listening on the socket."""
+    path = socket_path or DEFAULT_SOCKET_PATH
+    if not os.path.exists(path):
+        return False
+    try:
+        request({"op": "ping"}, path, timeout=2.0)
+        return True
+    except (OSError, ValueError, ScreenshotServiceError):
+        return False
+
+
+def _absolute(html_path: str) -> str:
+    return html_path if "://" in html_path else os.path.abspath(html_path)
+
+
+def render(html_path: str, content_selector: str, out: str, width: int = 1280, height: int = 800,
+           socket_path: Optional[str] = None) -> dict:
+    """
+    Screenshot one element of an HTML file in the service's warm browser.
+
+    Paths are made absolute, since the service runs in its own directory.
+
+    Returns:
+        The reply, including per-render timings in milliseconds under "timings"
+    """
+    return request({
+        "op": "render",
+        "html_path": _absolute(html_path),
+        "content_selector": content_selector,
+        "out": os.path.abspath(out),
+        "width": width,
+        "height": height,
+    }, socket_path)
+
+
+def render_batch(jobs: List[dict], socket_path: Optional[str] = None) -> dict:
+    """
+    Render many (viewport, selector, output) jobs in one request; each HTML
+    file is loaded once and its variants are rendered by resizing (files
+    with many variants are split over a few pages).
+
+    Args:
+        jobs: Dicts with html_path, content_selector, out, width and height
+        socket_path: Service socket
+
+    Returns:
+        The reply: per-job results in input order under "results" (out, ok,
+        timings or error) and the batch's milliseconds under "total"
+    """
+    return request({
+        "op": "render_batch",
+        "jobs": [
+            {**job, "html_path": _absolute(job["html_path"]), "out": os.path.abspath(job["out"])}
+            for job in jobs
+        ],
+    }, socket_path, timeout=max(120.0, 10.0 * len(jobs)))
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Long-lived screenshot service with a warm Chromium and a pool of pages.
+
+Launching Chromium costs about a second; this service pays it once. Renders
+arrive as newline-delimited JSON over a Unix socket, run on a pooled page of
+one shared browser context (so fonts and images stay cached between renders)
+and reply with per-render timings. take_screenshot_from_html.py forwards to
+the service whenever it is running.
+
+Usage:
+    python scripts/screenshot_service.py &            # start
+    python scripts/screenshot_service.py --stats      # latency so far
+    python scripts/screenshot_service.py --stop
+
+Requests (one JSON object per line, one reply per request):
+    {"op": "render", "html_path": ..., "content_selector": ..., "out": ..., "width": 1280, "height": 800}
+    {"op": "render_batch", "jobs": [{"html_path": ..., "content_selector": ..., "out": ..., "width": ..., "height": ...}, ...]}
+    {"op": "ping"} | {"op": "stats"} | {"op": "shutdown"}
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+
+from screenshot_client import DEFAULT_SOCKET_PATH, request
+
+# Latencies kept for the stats op
+MAX_SAMPLES = 1000
+
+
+def to_url(html_path: str) -> str:
+    """file:// URL of a local path; URLs are returned unchanged."""
+    if "://" in html_path:
+        return html_path
+    return Path(html_path).resolve().as_uri()
+
+
+class ScreenshotService:
+    """Renders element screenshots on pooled pages of one warm browser."""
+
+    def __init__(self, pool_size: Optional[int] = None, variants_per_page: Optional[int] = None):
+        """
+        Initialize screenshot service.
+
+        Args:
+            pool_size: Pages rendering at once (default: SCREENSHOT_PAGE_POOL or 4)
+            variants_per_page: Variants of one HTML file a batch renders on a
+                single page before it is split over more pages (default:
+                SCREENSHOT_VARIANTS_PER_PAGE or 8)
+        """
+        self.pool_size = pool_size or int(os.getenv("SCREENSHOT_PAGE_POOL", "4"))
+        self.variants_per_page = variants_per_page or int(os.getenv("SCREENSHOT_VARIANTS_PER_PAGE", "8"))
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._pages: "asyncio.Queue[Optional[Page]]" = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
+        self._latencies: list = []
+        self.renders = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        """Launch the browser and fill the pool with page slots."""
+        self._playwright = await async_playwright().start()
+        await self._ensure_browser()
+        for _ in range(self.pool_size):
+            # Pages are opened on first use of a slot
+            self._pages.put_nowait(None)
+
+    async def _ensure_browser(self) -> BrowserContext:
+        """The shared context, relaunching the browser if it has died."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                started = time.perf_counter()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._context = await self._browser.new_context()
+                print(f"🌐 Browser launched in {(time.perf_counter() - started) * 1000:.0f}ms")
+            return self._context
+
+    async def _page(self, page: Optional[Page]) -> Page:
+        """A usable page for a pool slot."""
+        if page is not None and not page.is_closed():
+            return page
+        context = await self._ensure_browser()
+        return await context.new_page()
+
+    async def _load(self, page: Page, html_path: str) -> None:
+        """Navigate to an HTML file and wait until it is laid out with its fonts."""
+        # Local files have nothing to wait for after load except web fonts,
+        # so skip networkidle's fixed 500ms quiet period
+        await page.goto(to_url(html_path), wait_until="load")
+        await page.evaluate("document.fonts.ready.then(() => true)")
+
+    async def _resize(self, page: Page, width: int, height: int) -> None:
+        """Change the viewport of a loaded page and let resize handlers and layout run."""
+        await page.set_viewport_size({"width": width, "height": height})
+        await page.evaluate("new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)))")
+
+    async def _shoot(self, page: Page, content_selector: str, out: str) -> None:
+        element = await page.wait_for_selector(content_selector, state="visible")
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        await element.screenshot(path=out)
+
+    async def _with_page(self, work) -> float:
+        """
+        Run work(page) on a pooled page.
+
+        Returns:
+            Milliseconds spent waiting for a free page
+        """
+        queued = time.perf_counter()
+        slot = await self._pages.get()
+        waited = (time.perf_counter() - queued) * 1000
+        page = None
+        try:
+            page = await self._page(slot)
+            await work(page)
+        except Exception:
+            # Start the slot over with a fresh page
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            page = None
+            self.errors += 1
+            raise
+        finally:
+            self._pages.put_nowait(page)
+        return waited
+
+    def _record(self, total_ms: float) -> None:
+        self.renders += 1
+        self._latencies.append(total_ms)
+        del self._latencies[:-MAX_SAMPLES]
+
+    async def render(self, html_path: str, content_selector: str, out: str, width: int = 1280, height: int = 800) -> dict:
+        """
+        Screenshot the first visible element matching content_selector.
+
+        Returns:
+            Timings in milliseconds: queue (waiting for a page), load (navigation
+            until fonts are ready), screenshot and total
+        """
+        timings = {}
+
+        async def work(page: Page) -> None:
+            started = time.perf_counter()
+            await page.set_viewport_size({"width": width, "height": height})
+            await self._load(page, html_path)
+            await page.wait_for_selector(content_selector, state="visible")
+            loaded = time.perf_counter()
+            await self._shoot(page, content_selector, out)
+            timings["load"] = round((loaded - started) * 1000, 1)
+            timings["screenshot"] = round((time.perf_counter() - loaded) * 1000, 1)
+
+        timings["queue"] = round(await self._with_page(work), 1)
+        timings["total"] = round(timings["queue"] + timings["load"] + timings["screenshot"], 1)
+        self._record(timings["total"])
+        return timings
+
+    async def render_batch(self, jobs: List[dict]) -> dict:
+        """
+        Render many (viewport, selector, output) jobs of one or more HTML files.
+
+        The variants of one HTML file render on one page, which loads the file
+        once and resizes the viewport for each further variant, so fonts and
+        images are loaded and decoded once. Only a file with more than
+        variants_per_page variants is split over more pages (at most
+        pool_size). Different files render concurrently on their own pages,
+        all sharing one browser context and its cache.
+
+        Args:
+            jobs: Dicts with html_path, content_selector, out, and optionally
+                width and height (default 1280x800)
+
+        Returns:
+            "results" with out, ok, timings or error per job in input order,
+            and "total" ms. Timings (ms) are queue (waiting for a page), load
+            (of its page), render (resize and screenshot) and total (from the
+            request until this variant was written, as recorded for stats)
+        """
+        started = time.perf_counter()
+        groups: Dict[str, List[int]] = {}
+        for index, job in enumerate(jobs):
+            groups.setdefault(job["html_path"], []).append(index)
+
+        results: List[Optional[dict]] = [None] * len(jobs)
+
+        async def render_share(html_path: str, indices: List[int]) -> None:
+            queued = time.perf_counter()
+
+            async def work(page: Page) -> None:
+                load_started = time.perf_counter()
+                queue_ms = round((load_started - queued) * 1000, 1)
+                first = jobs[indices[0]]
+                await page.set_viewport_size({"width": first.get("width", 1280), "height": first.get("height", 800)})
+                await self._load(page, html_path)
+                load_ms = round((time.perf_counter() - load_started) * 1000, 1)
+                for position, index in enumerate(indices):
+                    job = jobs[index]
+                    job_started = time.perf_counter()
+                    try:
+                        if position:
+                            await self._resize(page, job.get("width", 1280), job.get("height", 800))
+                        await self._shoot(page, job["content_selector"], job["out"])
+                    except Exception as e:
+                        self.errors += 1
+                        results[index] = {"out": job["out"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+                        continue
+                    finished = time.perf_counter()
+                    render_ms = round((finished - job_started) * 1000, 1)
+                    # Like render(): the latency of this output, page wait and load included
+                    total_ms = round((finished - queued) * 1000, 1)
+                    self._record(total_ms)
+                    results[index] = {
+                        "out": job["out"],
+                        "ok": True,
+                        "timings": {"queue": queue_ms, "load": load_ms, "render": render_ms, "total": total_ms},
+                    }
+
+            try:
+                await self._with_page(work)
+            except Exception as e:
+                # The page failed to load the file: every job of this share fails
+                for index in indices:
+                    if results[index] is None:
+                        results[index] = {"out": jobs[index]["out"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        shares = []
+        for html_path, indices in groups.items():
+            share_count = min(math.ceil(len(indices) / self.variants_per_page), self.pool_size)
+            shares.extend((html_path, indices[offset::share_count]) for offset in range(share_count))
+        await asyncio.gather(*(render_share(html_path, indices) for html_path, indices in shares))
+
+        return {"results": results, "total": round((time.perf_counter() - started) * 1000, 1)}
+
+    def stats(self) -> dict:
+        """Render count and latency percentiles in milliseconds."""
+        samples = sorted(self._latencies)
+        stats = {"renders": self.renders, "errors": self.errors, "pool_size": self.pool_size, "variants_per_page": self.variants_per_page}
+        if samples:
+            stats.update({
+                "p50_ms": statistics.median(samples),
+                "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+                "max_ms": samples[-1],
+            })
+        return stats
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+async def handle_connection(service: ScreenshotService, stop: asyncio.Event,
+                            reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer each request line of one client connection."""
+    try:
+        while line := await reader.readline():
+            op = None
+            try:
+                message = json.loads(line)
+                op = message.pop("op", None)
+                if op == "render":
+                    timings = await service.render(**message)
+                    print(f"📸 {message['out']}: {timings['total']:.0f}ms (load {timings['load']:.0f}ms, screenshot {timings['screenshot']:.0f}ms)")
+                    reply = {"ok": True, "out": message["out"], "timings": timings}
+                elif op == "render_batch":
+                    batch = await service.render_batch(message["jobs"])
+                    succeeded = sum(1 for result in batch["results"] if result["ok"])
+                    print(f"📸 {succeeded}/{len(batch['results'])} variant(s) in {batch['total']:.0f}ms")
+                    reply = {"ok": True, **batch}
+                elif op == "ping":
+                    reply = {"ok": True}
+                elif op == "stats":
+                    reply = {"ok": True, "stats": service.stats()}
+                elif op == "shutdown":
+                    reply = {"ok": True}
+                else:
+                    reply = {"ok": False, "error": f"Unknown op: {op}"}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+            if op == "shutdown":
+                # Only once the reply is sent
+                stop.set()
+                break
+    finally:
+        writer.close()
+
+
+async def serve(socket_path: str, pool_size: Optional[int] = None, variants_per_page: Optional[int] = None) -> None:
+    """Run the service until a shutdown request."""
+    if os.path.exists(socket_path):
+        try:
+            request({"op": "ping"}, socket_path, timeout=2.0)
+            raise RuntimeError(f"A screenshot service is already running on {socket_path}")
+        except OSError:
+            os.remove(socket_path)  # Left over from a service that died
+
+    service = ScreenshotService(pool_size, variants_per_page)
+    await service.start()
+    stop = asyncio.Event()
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: handle_connection(service, stop, reader, writer), path=socket_path
+    )
+    os.chmod(socket_path, 0o600)
+    print(f"🚀 Screenshot service on {socket_path} ({service.pool_size} pages)")
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        await service.close()
+        print(f"👋 Screenshot service stopped: {service.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("Run the screenshot service")
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--pages", type=int, default=None, help="Pages rendering at once")
+    parser.add_argument("--variants_per_page", type=int, default=None, help="Variants of one HTML file rendered on one page before a batch splits it")
+    parser.add_argument("--stats", action="store_true", help="Print the running service's stats")
+    parser.add_argument("--stop", action="store_true", help="Stop the running service")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(request({"op": "stats"}, args.socket)["stats"], indent=2))
+    elif args.stop:
+        request({"op": "shutdown"}, args.socket)
+    else:
+        asyncio.run(serve(args.socket, args.pages, args.variants_per_page))
@@ -1,7 +1,15 @@
-from playwright.sync_api import sync_playwright
 import argparse
+import json
+import os
+import time
+
+from render_cache import RenderCache, detach
+from screenshot_client import DEFAULT_SOCKET_PATH, is_running, render, render_batch
 
 def takescreenshot(html_path: str, content_selector: str, out: str, width: int=1280, height: int=800):
+    # 起動中のスクリーンショットサービスがない場合のみ使われます（毎回ブラウザを起動）
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page(viewport={"width":width, "height":height})
@@ -11,12 +19,143 @@ def takescreenshot(html_path: str, content_selector: str, out: str, width: int=1
         el.screenshot(path=out)
         browser.close()
 
+def takescreenshots(jobs: list) -> list:
+    # 複数のビューポートを1回のブラウザ起動で撮影します（HTMLごとに1回だけ読み込み、ビューポートを変えて撮り直す）
+    from playwright.sync_api import sync_playwright
+
+    results = [None] * len(jobs)
+    # 同じHTMLのジョブを並べて、読み込みを1回にまとめる（結果は入力順）
+    groups = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault(job["html_path"], []).append(i)
+    order = [i for indices in groups.values() for i in indices]
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        loaded = None
+        for i in order:
+            job = jobs[i]
+            try:
+                page.set_viewport_size({"width": job.get("width", 1280), "height": job.get("height", 800)})
+                if job["html_path"] != loaded:
+                    loaded = None
+                    page.goto("file://" + os.path.abspath(job["html_path"]), wait_until="networkidle")
+                    loaded = job["html_path"]
+                else:
+                    # リサイズ後のレイアウトを待つ
+                    page.evaluate("new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)))")
+                el = page.wait_for_selector(job["content_selector"], state="visible")
+                os.makedirs(os.path.dirname(os.path.abspath(job["out"])), exist_ok=True)
+                el.screenshot(path=job["out"])
+                results[i] = {"out": job["out"], "ok": True}
+            except Exception as e:
+                loaded = None
+                results[i] = {"out": job["out"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+        browser.close()
+    return results
+
+def parse_variant(value: str) -> dict:
+    # "1600x1600:out.png" → {"width": 1600, "height": 1600, "out": "out.png"}
+    size, sep, out = value.partition(":")
+    width, x, height = size.lower().partition("x")
+    if not sep or not x or not out:
+        raise argparse.ArgumentTypeError(f"Expected WIDTHxHEIGHT:OUT, got {value!r}")
+    return {"width": int(width), "height": int(height), "out": out}
+
+def load_jobs(args) -> list:
+    jobs = []
+    if args.jobs:
+        with open(args.jobs, "r", encoding="utf-8") as f:
+            for job in json.load(f):
+                # html_path / content_selector は省略時にコマンドラインの値を使う
+                job.setdefault("html_path", args.html_path)
+                job.setdefault("content_selector", args.content_selector)
+                job.setdefault("width", 1280)
+                job.setdefault("height", 800)
+                jobs.append(job)
+    for variant in args.variant or []:
+        jobs.append({"html_path": args.html_path, "content_selector": args.content_selector, **variant})
+    for job in jobs:
+        if not job.get("html_path") or not job.get("content_selector") or not job.get("out"):
+            raise ValueError(f"Job needs html_path, content_selector and out: {job}")
+    return jobs
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser("Take a screenshot from an HTML file")
-    parser.add_argument("--html_path", type=str, required=True)
-    parser.add_argument("--content_selector", type=str, required=True)
-    parser.add_argument("--out", type=str, required=True)
+    parser.add_argument("--html_path", type=str)
+    parser.add_argument("--content_selector", type=str)
+    parser.add_argument("--out", type=str)
     parser.add_argument("--width", type=int, default=1280)
     parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--variant", type=parse_variant, action="append",
+                        help="WIDTHxHEIGHT:OUT, repeatable; renders every variant of --html_path from one load")
+    parser.add_argument("--jobs", type=str,
+                        help='JSON file with a list of {"html_path", "content_selector", "out", "width", "height"} jobs')
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH, help="Screenshot service socket (scripts/screenshot_service.py)")
+    parser.add_argument("--no_service", action="store_true", help="Launch a browser even if the service is running")
+    parser.add_argument("--no_cache", action="store_true", help="Render even if an identical render is cached (scripts/render_cache.py)")
     args = parser.parse_args()
-    takescreenshot("file://" + args.html_path, args.content_selector, args.out, args.width, args.height)
+
+    started = time.perf_counter()
+
+    if args.variant or args.jobs:
+        jobs = load_jobs(args)
+    else:
+        if not args.html_path or not args.content_selector or not args.out:
+            parser.error("--html_path, --content_selector and --out are required without --variant or --jobs")
+        jobs = [{"html_path": args.html_path, "content_selector": args.content_selector, "out": args.out,
+                 "width": args.width, "height": args.height}]
+
+    # HTMLと参照しているローカルファイルが変わっていなければ、ブラウザを使わずキャッシュから出力
+    cache = None if args.no_cache else RenderCache()
+    results = [None] * len(jobs)
+    keys = [None] * len(jobs)
+    pending = []
+    for i, job in enumerate(jobs):
+        if cache is not None:
+            keys[i] = cache.key(job["html_path"], job["content_selector"], job["width"], job["height"])
+            if cache.fetch(keys[i], job["out"]):
+                results[i] = {"out": job["out"], "ok": True, "cached": True}
+                continue
+        detach(job["out"])
+        pending.append(i)
+
+    where = "all from the render cache"
+    if pending:
+        use_service = not args.no_service and is_running(args.socket)
+        if len(jobs) == 1:
+            job = jobs[0]
+            if use_service:
+                reply = render(job["html_path"], job["content_selector"], job["out"], job["width"], job["height"], args.socket)
+                timings = reply["timings"]
+                where = f"in the screenshot service: load {timings['load']:.0f}ms, screenshot {timings['screenshot']:.0f}ms"
+            else:
+                takescreenshot("file://" + os.path.abspath(job["html_path"]), job["content_selector"], job["out"], job["width"], job["height"])
+                where = "browser launched for this screenshot"
+            rendered = [{"out": job["out"], "ok": True}]
+        elif use_service:
+            rendered = render_batch([jobs[i] for i in pending], args.socket)["results"]
+            where = "in the screenshot service"
+        else:
+            rendered = takescreenshots([jobs[i] for i in pending])
+            where = "browser launched for this batch"
+        for i, result in zip(pending, rendered):
+            results[i] = result
+            if result["ok"] and cache is not None:
+                cache.store(keys[i], jobs[i]["out"])
+
+    for result in results:
+        if not result["ok"]:
+            print(f"❌ {result['out']}: {result['error']}")
+        elif len(results) > 1:
+            print(f"📸 {result['out']}" + (" (cached)" if result.get("cached") else ""))
+    succeeded = sum(1 for result in results if result["ok"])
+    elapsed = (time.perf_counter() - started) * 1000
+    if len(results) == 1 and succeeded:
+        print(f"📸 {results[0]['out']}: {elapsed:.0f}ms ({where})")
+    else:
+        print(f"📸 {succeeded}/{len(results)} screenshot(s): {elapsed:.0f}ms ({where})")
+    if cache is not None:
+        print(f"🗃️ Render cache: {cache.describe()}")
+    if succeeded < len(results):
+        raise SystemExit(1)
@@ -0,0 +1,103 @@
+"""Tests for render cache keying, fetch/store and LRU eviction."""
+
+import os
+import tempfile
+
+from scripts.render_cache import RenderCache, detach, local_assets
+
+
+def write(path: str, data) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    return path
+
+
+def make_page(directory: str) -> str:
+    write(os.path.join(directory, "assets", "style.css"), "body { background: url('bg.png') }")
+    write(os.path.join(directory, "assets", "bg.png"), b"background")
+    write(os.path.join(directory, "logo.png"), b"logo")
+    return write(
+        os.path.join(directory, "thumbnail.html"),
+        '<link href="assets/style.css" rel="stylesheet"><img src="logo.png"><img src="https://example.com/font.png">',
+    )
+
+
+def test_local_assets_follow_stylesheets():
+    directory = tempfile.mkdtemp()
+    html_path = make_page(directory)
+    paths = [path for _, path in local_assets(html_path)]
+    assert os.path.join(directory, "assets", "style.css") in paths
+    assert os.path.join(directory, "assets", "bg.png") in paths
+    assert os.path.join(directory, "logo.png") in paths
+    assert len(paths) == 3
+
+
+def test_key_changes_with_inputs():
+    directory = tempfile.mkdtemp()
+    html_path = make_page(directory)
+    cache = RenderCache(os.path.join(directory, "cache"))
+    key = cache.key(html_path, "#thumb", 1280, 800)
+
+    assert cache.key(html_path, "#thumb", 1280, 800) == key
+    assert cache.key(html_path, "#thumb", 1600, 1600) != key
+    assert cache.key(html_path, ".other", 1280, 800) != key
+    # An image referenced only from the stylesheet
+    write(os.path.join(directory, "assets", "bg.png"), b"new background")
+    assert cache.key(html_path, "#thumb", 1280, 800) != key
+
+
+def test_urls_and_unreadable_files_are_not_cached():
+    cache = RenderCache(tempfile.mkdtemp())
+    assert cache.key("https://example.com/page.html", "#thumb", 1280, 800) is None
+    assert cache.key("/does/not/exist.html", "#thumb", 1280, 800) is None
+
+
+def test_fetch_after_store_copies_the_render():
+    directory = tempfile.mkdtemp()
+    cache = RenderCache(os.path.join(directory, "cache"))
+    rendered = write(os.path.join(directory, "out.png"), b"PNG")
+
+    assert cache.fetch("k", os.path.join(directory, "first.png")) is False
+    cache.store("k", rendered)
+    # The cache keeps its own copy when the render is edited in place
+    write(rendered, b"EDITED RENDER")
+
+    out = os.path.join(directory, "nested", "second.png")
+    assert cache.fetch("k", out) is True
+    with open(out, "rb") as f:
+        assert f.read() == b"PNG"
+    # Nor does editing a fetched file change the cache
+    write(out, b"EDITED OUTPUT")
+    assert cache.fetch("k", os.path.join(directory, "third.png")) is True
+    with open(os.path.join(directory, "third.png"), "rb") as f:
+        assert f.read() == b"PNG"
+    assert (cache.hits, cache.misses, cache.stored) == (2, 1, 1)
+
+
+def test_evict_removes_least_recently_used():
+    directory = tempfile.mkdtemp()
+    cache = RenderCache(os.path.join(directory, "cache"), max_bytes=25)
+    for name in ("a", "b"):
+        cache.store(name, write(os.path.join(directory, f"{name}.png"), b"x" * 10))
+    # Make a the oldest, then use it so b becomes the least recently used
+    os.utime(cache._entry("a"), (1, 1))
+    os.utime(cache._entry("b"), (2, 2))
+    assert cache.fetch("a", os.path.join(directory, "out.png"))
+
+    cache.store("c", write(os.path.join(directory, "c.png"), b"x" * 10))
+    assert cache.evicted == 1
+    assert not os.path.exists(cache._entry("b"))
+    assert os.path.exists(cache._entry("a")) and os.path.exists(cache._entry("c"))
+    assert cache.size() == 20
+
+
+def test_detach_unlinks_hard_linked_outputs():
+    directory = tempfile.mkdtemp()
+    entry = write(os.path.join(directory, "entry.png"), b"PNG")
+    out = os.path.join(directory, "out.png")
+    os.link(entry, out)
+    detach(out)
+    assert not os.path.exists(out)
+    assert os.path.exists(entry)
+    detach(out)  # Missing outputs are fine
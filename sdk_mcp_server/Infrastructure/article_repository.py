@@ -1,17 +1,65 @@
 """Article repository for MongoDB operations."""
 
+import asyncio
+import base64
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.collection import Collection
-from pymongo.errors import DuplicateKeyError
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from ..domain.models import Article, ArticleCreationInput, ArticleUpdateInput
+from ..instrumentation import instrument_backend
+from ..domain.models import Article, ArticleCreationInput, ArticlePage
 from .mongodb_client import MongoDBClient
 
+# Listing order shared by offset and cursor pagination; id breaks created_at ties
+LIST_SORT = [("created_at", -1), ("id", -1)]
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Longest a change stream poll waits on the server; bounds how long a cancelled
+# watcher keeps its thread with the sync driver
+CHANGE_STREAM_MAX_AWAIT_MS = 1000
+
+# Fields that update_article may $set
+UPDATABLE_FIELDS = ("thumbnail_image_url", "video_file_url", "title", "subtitle", "thumbnail_renditions")
+
+
+class ArticleVersionConflictError(ValueError):
+    """Raised when an article changed since the version an update was based on."""
+
+
+def utcnow() -> datetime:
+    """Current UTC time truncated to the millisecond precision stored by MongoDB."""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def encode_cursor(created_at: datetime, article_id: str) -> str:
+    """Encode a (created_at, id) position as an opaque cursor string."""
+    payload = json.dumps([created_at.isoformat(), article_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode an opaque cursor string back into its (created_at, id) position."""
+    try:
+        created_at, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(article_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
 
 class ArticleRepository:
-    """Repository for article operations in MongoDB."""
+    """Repository for article operations in MongoDB.
+
+    Works with both the sync and the async driver of ``MongoDBClient``; every
+    driver call goes through ``MongoDBClient.resolve`` so it is awaited when
+    the async driver is in use.
+    """
 
     def __init__(self, mongodb_client: MongoDBClient):
         """Initialize article repository."""
@@ -19,13 +67,14 @@ class ArticleRepository:
         self.collection_name = "articles"
 
     @property
-    def collection(self) -> Collection:
+    def collection(self) -> Union[Collection, AsyncCollection]:
         """Get articles collection."""
         return self.mongodb_client.database[self.collection_name]
 
+    @instrument_backend("mongodb")
     async def create_article(self, article_input: ArticleCreationInput) -> Article:
         """Create a new article."""
-        now = datetime.utcnow()
+        now = utcnow()
         article = Article(
             id=article_input.id,
             thumbnail_image_url=article_input.thumbnail_image_url,
@@ -33,71 +82,296 @@ class ArticleRepository:
             subtitle=article_input.subtitle,
             video_file_url=article_input.video_file_url,
             created_at=now,
-            updated_at=now
+            updated_at=now,
+            thumbnail_renditions=article_input.thumbnail_renditions
         )
 
         try:
-            result = self.collection.insert_one(article.to_dict())
+            result = await self.mongodb_client.resolve(self.collection.insert_one(article.to_dict()))
             if not result.acknowledged:
                 raise RuntimeError("Failed to insert article")
             return article
         except DuplicateKeyError:
             raise ValueError(f"Article with id '{article_input.id}' already exists")
 
+    @instrument_backend("mongodb")
+    async def create_articles(self, article_inputs: List[ArticleCreationInput]) -> Tuple[Dict[str, Article], Dict[str, str]]:
+        """
+        Create many articles with one unordered insert_many.
+
+        A failing document (e.g. a duplicate id) does not stop the others.
+
+        Args:
+            article_inputs: Articles to create
+
+        Returns:
+            Created articles by id, and error messages by id for failed ones
+        """
+        now = utcnow()
+        articles = [
+            Article(
+                id=article_input.id,
+                thumbnail_image_url=article_input.thumbnail_image_url,
+                title=article_input.title,
+                subtitle=article_input.subtitle,
+                video_file_url=article_input.video_file_url,
+                created_at=now,
+                updated_at=now,
+                thumbnail_renditions=article_input.thumbnail_renditions
+            )
+            for article_input in article_inputs
+        ]
+
+        errors: Dict[str, str] = {}
+        try:
+            result = await self.mongodb_client.resolve(
+                self.collection.insert_many([article.to_dict() for article in articles], ordered=False)
+            )
+            if not result.acknowledged:
+                raise RuntimeError("Failed to insert articles")
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                article_id = articles[write_error["index"]].id
+                if write_error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                    errors[article_id] = f"Article with id '{article_id}' already exists"
+                else:
+                    errors[article_id] = write_error.get("errmsg", "Failed to insert article")
+
+        created = {article.id: article for article in articles if article.id not in errors}
+        return created, errors
+
+    @instrument_backend("mongodb")
+    async def find_existing_ids(self, article_ids: List[str]) -> set:
+        """Get which of the given article IDs already exist, in one query."""
+        if not article_ids:
+            return set()
+        cursor = self.collection.find({"id": {"$in": article_ids}}, {"_id": 0, "id": 1})
+        documents = await self.mongodb_client.resolve(cursor.to_list())
+        return {document["id"] for document in documents}
+
+    @instrument_backend("mongodb")
     async def get_article_by_id(self, article_id: str) -> Optional[Article]:
         """Get article by ID."""
-        document = self.collection.find_one({"id": article_id})
+        document = await self.mongodb_client.resolve(self.collection.find_one({"id": article_id}))
         if document:
             return Article.from_dict(document)
         return None
 
-    async def update_article(self, article_id: str, update_input: ArticleUpdateInput) -> Optional[Article]:
-        """Update an existing article."""
-        update_data = {}
-        if update_input.thumbnail_image_html_screenshot_path is not None:
-            update_data["thumbnail_image_html_screenshot_path"] = update_input.thumbnail_image_html_screenshot_path
-        if update_input.title is not None:
-            update_data["title"] = update_input.title
-        if update_input.subtitle is not None:
-            update_data["subtitle"] = update_input.subtitle
-
-        if not update_data:
+    @instrument_backend("mongodb")
+    async def update_article(
+        self,
+        article_id: str,
+        changes: dict,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Article]:
+        """
+        Atomically update fields of an existing article in one round-trip.
+
+        Only the given fields are $set; created_at is preserved.
+
+        Args:
+            article_id: ID of the article to update
+            changes: New values keyed by field name (see UPDATABLE_FIELDS)
+            expected_updated_at: If given, only update when the stored
+                updated_at still equals this value (optimistic concurrency)
+
+        Returns:
+            Updated article, or None if the article does not exist
+
+        Raises:
+            ValueError: If a field cannot be updated
+            ArticleVersionConflictError: If the article changed since expected_updated_at
+        """
+        unknown = [name for name in changes if name not in UPDATABLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {', '.join(unknown)}")
+
+        if not changes:
             # No updates provided, return current article
             return await self.get_article_by_id(article_id)
 
-        update_data["updated_at"] = datetime.utcnow()
+        query = {"id": article_id}
+        if expected_updated_at is not None:
+            query["updated_at"] = expected_updated_at
 
-        result = self.collection.update_one(
-            {"id": article_id},
-            {"$set": update_data}
-        )
+        document = await self.mongodb_client.resolve(self.collection.find_one_and_update(
+            query,
+            {"$set": {**changes, "updated_at": utcnow()}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        ))
 
-        if result.matched_count == 0:
+        if document is None:
+            # Only a failed update pays for the lookup telling a conflict from a missing article
+            if expected_updated_at is not None and await self.get_article_by_id(article_id):
+                raise ArticleVersionConflictError(
+                    f"Article '{article_id}' was modified by someone else since {expected_updated_at.isoformat()}"
+                )
             return None
 
-        return await self.get_article_by_id(article_id)
+        return Article.from_dict(document)
 
+    @instrument_backend("mongodb")
     async def delete_article(self, article_id: str) -> bool:
         """Delete an article by ID."""
-        result = self.collection.delete_one({"id": article_id})
+        result = await self.mongodb_client.resolve(self.collection.delete_one({"id": article_id}))
         return result.deleted_count > 0
 
+    @instrument_backend("mongodb")
+    async def find_and_delete_article(self, article_id: str) -> Optional[Article]:
+        """
+        Delete an article by ID in one round-trip, returning what was deleted.
+
+        Returns:
+            Deleted article, or None if the article does not exist
+        """
+        document = await self.mongodb_client.resolve(self.collection.find_one_and_delete(
+            {"id": article_id},
+            projection={"_id": 0}
+        ))
+        return Article.from_dict(document) if document else None
+
+    @instrument_backend("mongodb")
     async def list_articles(self, limit: int = 100, offset: int = 0) -> List[Article]:
         """List articles with pagination."""
-        cursor = self.collection.find().skip(offset).limit(limit).sort("created_at", -1)
-        articles = []
-        for document in cursor:
-            articles.append(Article.from_dict(document))
-        return articles
+        cursor = self.collection.find().sort(LIST_SORT).skip(offset).limit(limit)
+        documents = await self.mongodb_client.resolve(cursor.to_list())
+        return [Article.from_dict(document) for document in documents]
+
+    @instrument_backend("mongodb")
+    async def list_articles_page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        projection: Optional[dict] = None,
+    ) -> ArticlePage:
+        """
+        List one page of article documents with keyset pagination.
+
+        When a cursor is given the page starts right after the cursor position,
+        using the (created_at, id) index instead of skipping over earlier rows.
+        Without a cursor the page starts at offset.
+
+        Args:
+            limit: Maximum number of articles in the page
+            offset: Number of articles to skip (only used without cursor)
+            cursor: Opaque cursor returned as next_cursor by a previous page
+            include_total: Whether to include the estimated total article count
+            projection: MongoDB projection of the returned documents; must keep
+                id and created_at (default: every field except _id)
+
+        Returns:
+            Page of documents with the cursor of the following page
+        """
+        query = {}
+        if cursor:
+            created_at, article_id = decode_cursor(cursor)
+            query = {
+                "$or": [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "id": {"$lt": article_id}},
+                ]
+            }
+
+        # Fetch one extra row to know whether a following page exists
+        find_cursor = self.collection.find(query, projection or {"_id": 0}).sort(LIST_SORT).skip(0 if cursor else offset).limit(limit + 1)
+        if include_total:
+            documents, total = await asyncio.gather(
+                self.mongodb_client.resolve(find_cursor.to_list()),
+                self.mongodb_client.resolve(self.collection.estimated_document_count()),
+            )
+        else:
+            documents, total = await self.mongodb_client.resolve(find_cursor.to_list()), None
+
+        next_cursor = None
+        if len(documents) > limit:
+            last = documents[limit - 1]
+            if last.get("created_at") is not None:
+                next_cursor = encode_cursor(last["created_at"], last["id"])
+
+        return ArticlePage(documents=documents[:limit], next_cursor=next_cursor, total=total)
+
+    async def watch_article_changes(self) -> AsyncIterator[Optional[str]]:
+        """
+        Stream the IDs of articles changed in MongoDB, by any process.
+
+        Requires a replica set (as on Atlas). Deleted documents no longer carry
+        their article id, so deletions yield None.
+
+        Yields:
+            ID of the changed article, or None when it cannot be determined
+        """
+        pipeline = [{"$project": {"operationType": 1, "fullDocument.id": 1}}]
+        stream = await self.mongodb_client.resolve(
+            self.collection.watch(pipeline, full_document="updateLookup", max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS)
+        )
+        poll = None
+        try:
+            while True:
+                if self.mongodb_client.is_async:
+                    change = await stream.next()
+                else:
+                    # The sync driver blocks, so poll off the event loop; try_next returns
+                    # None after max_await_time_ms without a change, which gives
+                    # cancellation a chance between polls instead of pinning a thread
+                    poll = asyncio.ensure_future(asyncio.to_thread(stream.try_next))
+                    change = await asyncio.shield(poll)
+                    poll = None
+                    if change is None:
+                        continue
+                yield (change.get("fullDocument") or {}).get("id")
+        finally:
+            if poll is not None:
+                # Cancelled mid-poll: let it return before closing the stream under it
+                await asyncio.gather(poll, return_exceptions=True)
+            await self.mongodb_client.resolve(stream.close())
+
+    async def iter_file_urls(self, batch_size: int = 1000) -> AsyncIterator[str]:
+        """
+        Stream every thumbnail, rendition and video URL referenced by an article.
+
+        Only the URL fields are read, batch_size documents at a time.
+
+        Yields:
+            Public URL of a referenced file
+        """
+        find_cursor = self.collection.find(
+            {}, {"_id": 0, "thumbnail_image_url": 1, "video_file_url": 1, "thumbnail_renditions": 1}, batch_size=batch_size
+        )
+        try:
+            while True:
+                documents = await self.mongodb_client.resolve(find_cursor.to_list(batch_size))
+                if not documents:
+                    break
+                for document in documents:
+                    for field_name in ("thumbnail_image_url", "video_file_url"):
+                        if document.get(field_name):
+                            yield document[field_name]
+                    for rendition_url in (document.get("thumbnail_renditions") or {}).values():
+                        if rendition_url:
+                            yield rendition_url
+        finally:
+            await self.mongodb_client.resolve(find_cursor.close())
+
+    @instrument_backend("mongodb")
+    async def estimated_article_count(self) -> int:
+        """Estimate the number of articles from collection metadata (no scan)."""
+        return await self.mongodb_client.resolve(self.collection.estimated_document_count())
 
+    @instrument_backend("mongodb")
     async def count_articles(self) -> int:
         """Count total number of articles."""
-        return self.collection.count_documents({})
+        return await self.mongodb_client.resolve(self.collection.count_documents({}))
 
-    def create_indexes(self) -> None:
+    @instrument_backend("mongodb")
+    async def create_indexes(self) -> None:
         """Create necessary indexes for the collection."""
         # Create unique index on id field
-        self.collection.create_index("id", unique=True)
+        await self.mongodb_client.resolve(self.collection.create_index("id", unique=True))
         # Create index on created_at for sorting
-        self.collection.create_index("created_at")
+        await self.mongodb_client.resolve(self.collection.create_index("created_at"))
+        # Create compound index backing offset and cursor pagination order
+        await self.mongodb_client.resolve(self.collection.create_index(LIST_SORT))
         print(f"Created indexes for {self.collection_name} collection")
\ No newline at end of file
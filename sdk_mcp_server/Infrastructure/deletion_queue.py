@@ -0,0 +1,193 @@
+"""Durable queue of storage paths waiting to be deleted, stored in SQLite."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, List
+
+
+class DeletionQueue:
+    """Thread-safe queue of storage paths persisted to a local SQLite file.
+
+    Paths are deduplicated and survive process restarts, so a deletion that
+    was queued but not yet performed is picked up by the next process. Failed
+    deletions are retried with exponential backoff until max_attempts.
+
+    A worker claims the paths it is about to delete. Cancelling a claimed path
+    waits for its deletion to finish, so an upload that wants the object again
+    runs after the delete instead of being removed by it. Claims of a worker
+    that died are released after claim_timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        base_backoff_seconds: float = 5.0,
+        max_backoff_seconds: float = 3600.0,
+        max_attempts: int = 10,
+        claim_timeout_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the queue, creating the database file if needed."""
+        self.path = os.path.expanduser(path)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_attempts = max_attempts
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            # WAL keeps enqueue (on the request path) from waiting on the worker's commits
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deletions (
+                    path TEXT PRIMARY KEY,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    last_error TEXT,
+                    claimed_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(deletions)")}
+            if "claimed_at" not in columns:
+                # Queue files created before claims existed
+                self._connection.execute("ALTER TABLE deletions ADD COLUMN claimed_at REAL")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS deletions_due ON deletions (next_attempt_at)")
+
+    def enqueue(self, paths: Iterable[str]) -> int:
+        """
+        Queue paths for deletion; paths already queued are left as they are.
+
+        Returns:
+            Number of newly queued paths
+        """
+        now = self._clock()
+        rows = [(path, now, now) for path in dict.fromkeys(paths)]
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO deletions (path, next_attempt_at, enqueued_at) VALUES (?, ?, ?)", rows
+            )
+            return self._connection.total_changes - before
+
+    def cancel(self, path: str, wait_seconds: float = 60.0) -> bool:
+        """
+        Drop a queued path, e.g. because it is being uploaded again.
+
+        If a worker has claimed the path, its deletion may be in flight: wait
+        until the worker completes or releases it, so that the caller's upload
+        happens after the delete.
+
+        Args:
+            path: Storage path
+            wait_seconds: How long to wait for a claimed deletion
+
+        Returns:
+            True if the path was queued
+
+        Raises:
+            RuntimeError: If the claimed deletion did not finish in time
+        """
+        deadline = time.monotonic() + wait_seconds
+        waited = False
+        while True:
+            with self._lock, self._connection:
+                row = self._connection.execute("SELECT claimed_at FROM deletions WHERE path = ?", (path,)).fetchone()
+                if row is None:
+                    return waited  # Deleted by the worker we waited for
+                if row[0] is None or row[0] < self._clock() - self.claim_timeout_seconds:
+                    self._connection.execute("DELETE FROM deletions WHERE path = ?", (path,))
+                    return True
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Deletion of {path} is still in progress")
+            waited = True
+            time.sleep(0.05)
+
+    def claim_due(self, limit: int) -> List[str]:
+        """
+        Claim up to limit paths whose next attempt is due, oldest first.
+
+        Claimed paths must be passed to complete() or retry_later().
+        """
+        now = self._clock()
+        with self._lock:
+            # IMMEDIATE: workers of other processes cannot claim the same rows in between
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT path FROM deletions WHERE next_attempt_at <= ? AND (claimed_at IS NULL OR claimed_at < ?) "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, now - self.claim_timeout_seconds, limit),
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE deletions SET claimed_at = ? WHERE path = ?", [(now, row[0]) for row in rows]
+                )
+                self._connection.commit()
+            except BaseException:
+                self._connection.rollback()
+                raise
+        return [row[0] for row in rows]
+
+    def seconds_until_due(self) -> float:
+        """Seconds until the next path can be claimed (inf when the queue is empty)."""
+        with self._lock:
+            # A path claimed by another worker becomes claimable again when its claim expires
+            row = self._connection.execute(
+                "SELECT MIN(CASE WHEN claimed_at IS NULL THEN next_attempt_at "
+                "ELSE MAX(next_attempt_at, claimed_at + ?) END) FROM deletions",
+                (self.claim_timeout_seconds,),
+            ).fetchone()
+        if row[0] is None:
+            return float("inf")
+        return max(0.0, row[0] - self._clock())
+
+    def complete(self, paths: List[str]) -> None:
+        """Remove deleted paths from the queue."""
+        with self._lock, self._connection:
+            self._connection.executemany("DELETE FROM deletions WHERE path = ?", [(path,) for path in paths])
+
+    def retry_later(self, paths: List[str], error: str) -> List[str]:
+        """
+        Schedule another attempt for paths whose deletion failed, releasing their claim.
+
+        Paths that reached max_attempts are dropped instead.
+
+        Returns:
+            The dropped paths
+        """
+        now = self._clock()
+        dropped = []
+        with self._lock, self._connection:
+            for path in paths:
+                row = self._connection.execute("SELECT attempts FROM deletions WHERE path = ?", (path,)).fetchone()
+                if row is None:
+                    continue  # Cancelled meanwhile
+                attempts = row[0] + 1
+                if attempts >= self.max_attempts:
+                    self._connection.execute("DELETE FROM deletions WHERE path = ?", (path,))
+                    dropped.append(path)
+                    continue
+                backoff = min(self.base_backoff_seconds * 2 ** (attempts - 1), self.max_backoff_seconds)
+                self._connection.execute(
+                    "UPDATE deletions SET attempts = ?, next_attempt_at = ?, last_error = ?, claimed_at = NULL WHERE path = ?",
+                    (attempts, now + backoff, error, path),
+                )
+        return dropped
+
+    def pending_count(self) -> int:
+        """Number of queued paths."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM deletions").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
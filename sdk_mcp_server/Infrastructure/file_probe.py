@@ -0,0 +1,152 @@
+"""Identify local media files by their content with one stat and a header read."""
+
+import os
+import stat as stat_module
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from ..domain.models import FileInfo
+
+# Real formats accepted per file extension
+IMAGE_FORMATS_BY_EXTENSION = {
+    ".png": ("png",),
+    ".jpg": ("jpeg",),
+    ".jpeg": ("jpeg",),
+    ".gif": ("gif",),
+    ".webp": ("webp",),
+    ".avif": ("avif",),
+}
+# Containers of one family are often named with each other's extensions
+_ISO_MEDIA = ("mp4", "mov", "m4v")
+_MATROSKA = ("webm", "mkv")
+VIDEO_FORMATS_BY_EXTENSION = {
+    ".mp4": _ISO_MEDIA,
+    ".mov": _ISO_MEDIA,
+    ".m4v": _ISO_MEDIA,
+    ".mkv": _MATROSKA,
+    ".webm": _MATROSKA,
+    ".avi": ("avi",),
+}
+
+# QuickTime files may start with any of these atoms instead of ftyp
+_QUICKTIME_ATOMS = (b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot")
+
+HEADER_SIZE = 64
+
+
+def _sniff_video(header: bytes) -> Optional[str]:
+    """Video container format from the first bytes of a file."""
+    if header[4:8] == b"ftyp":
+        brand = header[8:12]
+        if brand == b"qt  ":
+            return "mov"
+        if brand.startswith(b"M4V"):
+            return "m4v"
+        return "mp4"
+    if header[4:8] in _QUICKTIME_ATOMS:
+        return "mov"
+    if header.startswith(b"\x1a\x45\xdf\xa3"):
+        # EBML header; the DocType names the flavor
+        return "webm" if b"webm" in header else "mkv"
+    if header.startswith(b"RIFF") and header[8:12] == b"AVI ":
+        return "avi"
+    return None
+
+
+def content_matches_extension(info: FileInfo, kind: str) -> bool:
+    """Whether a probed file is a supported image or video whose content matches its extension."""
+    formats_by_extension = IMAGE_FORMATS_BY_EXTENSION if kind == "image" else VIDEO_FORMATS_BY_EXTENSION
+    extension = os.path.splitext(info.path)[1].lower()
+    return info.kind == kind and info.format in formats_by_extension.get(extension, ())
+
+
+class FileProbe:
+    """Probes local image and video files, memoized per file version.
+
+    A probe costs one stat. Only when the (path, mtime, size) of a file has
+    not been seen before is its header read: images are identified and
+    measured by Pillow without decoding pixels, videos by their container
+    magic bytes. The most recent max_entries results are kept.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize file probe."""
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[Tuple[str, int, int], FileInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def probe(self, local_path: str) -> FileInfo:
+        """
+        Identify a file by its content.
+
+        Args:
+            local_path: Local file path
+
+        Returns:
+            Size, real format and (for images) dimensions of the file; kind and
+            format are None when the content is not a known image or video
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        path = os.path.abspath(local_path)
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"File not found: {local_path}")
+
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            info = self._memo.get(key)
+            if info is not None:
+                self._memo.move_to_end(key)
+                return info
+
+        info = FileInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if stat_module.S_ISREG(stat.st_mode):
+            self._read_header(info)
+        with self._lock:
+            self._memo[key] = info
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return info
+
+    def matches_extension(self, local_path: str, kind: str) -> bool:
+        """
+        Whether a file is a supported image or video whose content matches its extension.
+
+        Args:
+            local_path: Local file path
+            kind: "image" or "video"
+
+        Returns:
+            True if valid, False otherwise (including missing files)
+        """
+        try:
+            return content_matches_extension(self.probe(local_path), kind)
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _read_header(info: FileInfo) -> None:
+        """Fill in kind, format and dimensions from the file header."""
+        try:
+            # Image.open parses the header only; pixels are decoded lazily
+            with Image.open(info.path) as image:
+                info.kind = "image"
+                info.format = (image.format or "").lower() or None
+                info.width, info.height = image.size
+                return
+        except (UnidentifiedImageError, OSError, ValueError, SyntaxError):
+            pass
+
+        with open(info.path, "rb") as file:
+            info.format = _sniff_video(file.read(HEADER_SIZE))
+        if info.format:
+            info.kind = "video"
+
+
+DEFAULT_FILE_PROBE = FileProbe()
@@ -0,0 +1,59 @@
+"""Small persistent key/value index stored as a local JSON file."""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+
+
+class JsonFileIndex:
+    """Thread-safe dict persisted to a JSON file after every change.
+
+    Meant for small amounts of local bookkeeping (e.g. resumable upload
+    state) that must survive process restarts.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the index, loading existing entries from path."""
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._entries: dict = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError) as e:
+                # A corrupt index only loses cached state; start over
+                print(f"Ignoring unreadable index {self.path}: {str(e)}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the value stored for key."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value for key and persist the index."""
+        with self._lock:
+            self._entries[key] = value
+            self._save()
+
+    def delete(self, key: str) -> None:
+        """Remove key and persist the index."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        """Atomically write the index file."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
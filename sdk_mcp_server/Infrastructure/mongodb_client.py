@@ -1,57 +1,138 @@
 """MongoDB Atlas client configuration."""
 
 import os
-from typing import Optional
+from typing import Any, Optional, Union
 
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 
 
+SUPPORTED_DRIVERS = ("sync", "async")
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read an optional integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 class MongoDBClient:
-    """MongoDB Atlas client wrapper."""
+    """MongoDB Atlas client wrapper.
+
+    Two drivers are available:
+
+    - ``sync``: blocking ``pymongo.MongoClient`` (the original behavior).
+    - ``async``: PyMongo's native ``AsyncMongoClient``, whose operations are
+      awaited and never block the event loop.
 
-    def __init__(self, connection_string: Optional[str] = None, database_name: Optional[str] = None):
+    The driver is chosen with the ``driver`` argument or the ``MONGODB_DRIVER``
+    environment variable.
+    """
+
+    def __init__(
+        self,
+        connection_string: Optional[str] = None,
+        database_name: Optional[str] = None,
+        driver: Optional[str] = None,
+        max_pool_size: Optional[int] = None,
+        min_pool_size: Optional[int] = None,
+        connect_timeout_ms: Optional[int] = None,
+        server_selection_timeout_ms: Optional[int] = None,
+        socket_timeout_ms: Optional[int] = None,
+    ):
         """Initialize MongoDB client."""
         self.connection_string = connection_string or os.getenv("MONGODB_URL")  # Updated to match actual env var
         self.database_name = database_name or os.getenv("MONGODB_DATABASE", "aitimes")
+        self.driver = (driver or os.getenv("MONGODB_DRIVER", "sync")).lower()
 
         if not self.connection_string:
             raise ValueError("MongoDB connection string is required")
+        if self.driver not in SUPPORTED_DRIVERS:
+            raise ValueError(f"Unsupported MongoDB driver: {self.driver} (expected one of {SUPPORTED_DRIVERS})")
+
+        # Pool and timeout settings; unset values fall back to the driver defaults
+        self.client_options = {
+            key: value
+            for key, value in {
+                "maxPoolSize": max_pool_size if max_pool_size is not None else _env_int("MONGODB_MAX_POOL_SIZE"),
+                "minPoolSize": min_pool_size if min_pool_size is not None else _env_int("MONGODB_MIN_POOL_SIZE"),
+                "connectTimeoutMS": connect_timeout_ms if connect_timeout_ms is not None else _env_int("MONGODB_CONNECT_TIMEOUT_MS"),
+                "serverSelectionTimeoutMS": server_selection_timeout_ms if server_selection_timeout_ms is not None else _env_int("MONGODB_SERVER_SELECTION_TIMEOUT_MS"),
+                "socketTimeoutMS": socket_timeout_ms if socket_timeout_ms is not None else _env_int("MONGODB_SOCKET_TIMEOUT_MS"),
+            }.items()
+            if value is not None
+        }
+
+        self._client: Optional[Union[MongoClient, AsyncMongoClient]] = None
+        self._database: Optional[Union[Database, AsyncDatabase]] = None
 
-        self._client: Optional[MongoClient] = None
-        self._database: Optional[Database] = None
+    @property
+    def is_async(self) -> bool:
+        """Whether operations on this client must be awaited."""
+        return self.driver == "async"
 
     def connect(self) -> None:
-        """Connect to MongoDB Atlas."""
+        """Connect to MongoDB Atlas.
+
+        With the async driver this only creates the client; the connection is
+        established lazily and can be verified with ``await ping()``.
+        """
         try:
-            self._client = MongoClient(self.connection_string)
+            if self.is_async:
+                self._client = AsyncMongoClient(self.connection_string, **self.client_options)
+                self._database = self._client[self.database_name]
+                print(f"🍀 MongoDB Atlas async client created for database: {self.database_name}")
+                return
+
+            self._client = MongoClient(self.connection_string, **self.client_options)
             self._database = self._client[self.database_name]
             # Test connection
             self._client.admin.command('ping')
-            print(f"🍀 Successfully connected to MongoDB Atlas database: aitimes")
+            print(f"🍀 Successfully connected to MongoDB Atlas database: {self.database_name}")
         except Exception as e:
             print(f"Failed to connect to MongoDB Atlas: {e}")
             raise
 
+    async def ping(self) -> None:
+        """Round-trip a ping command with either driver."""
+        await self.resolve(self.client.admin.command('ping'))
+
+    async def resolve(self, result: Any) -> Any:
+        """Await a driver result when the async driver is in use."""
+        if self.is_async:
+            return await result
+        return result
+
     def disconnect(self) -> None:
         """Disconnect from MongoDB Atlas."""
+        if self.is_async:
+            raise RuntimeError("The async driver must be closed with 'await aclose()'")
         if self._client:
             self._client.close()
             self._client = None
             self._database = None
             print("Disconnected from MongoDB Atlas")
 
+    async def aclose(self) -> None:
+        """Disconnect from MongoDB Atlas with either driver."""
+        if self._client:
+            await self.resolve(self._client.close())
+            self._client = None
+            self._database = None
+            print("Disconnected from MongoDB Atlas")
+
     @property
-    def database(self) -> Database:
+    def database(self) -> Union[Database, AsyncDatabase]:
         """Get database instance."""
-        if not self._database:
+        if self._database is None:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._database
 
     @property
-    def client(self) -> MongoClient:
+    def client(self) -> Union[MongoClient, AsyncMongoClient]:
         """Get client instance."""
-        if not self._client:
+        if self._client is None:
             raise RuntimeError("Client not connected. Call connect() first.")
         return self._client
 
@@ -62,4 +143,13 @@ class MongoDBClient:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.disconnect()
\ No newline at end of file
+        self.disconnect()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
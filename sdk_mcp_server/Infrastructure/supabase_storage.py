@@ -1,57 +1,160 @@
 """Supabase storage client for image uploads."""
 
+import base64
+import hashlib
+import io
 import os
-import uuid
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
 from pathlib import Path
 
+import httpx
+from storage3.exceptions import StorageApiError
 from supabase import create_client, Client
 
 from dotenv import load_dotenv
 
+from ..instrumentation import instrument_backend
+from ..domain.models import FileInfo
+from .deletion_queue import DeletionQueue
+from .file_probe import DEFAULT_FILE_PROBE, FileProbe, content_matches_extension
+from .local_index import JsonFileIndex
+
 load_dotenv()
 
-class SupabaseStorageClient:
-    """Client for Supabase storage operations."""
+UPLOAD_MODES = ("streaming", "buffered")
+
+# Supabase requires resumable (TUS) uploads to be sent in 6MB chunks
+TUS_CHUNK_SIZE = 6 * 1024 * 1024
+TUS_MAX_CHUNK_ATTEMPTS = 3
+
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_MEMO_MAX_ENTRIES = 4096
+
+ProgressCallback = Callable[[int], None]
+
+
+class _ProgressReader(io.BufferedReader):
+    """Binary file reader reporting the number of bytes read to a callback.
+
+    Subclasses BufferedReader so storage3 streams it like a plain file handle.
+    """
 
-    def __init__(self, url: Optional[str] = None, key: Optional[str] = None, bucket_name: Optional[str] = None):
+    def __init__(self, local_path: str, progress: Optional[ProgressCallback] = None):
+        super().__init__(io.FileIO(local_path, "rb"))
+        self._progress = progress
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = super().read(size)
+        if self._progress and data:
+            self._progress(len(data))
+        return data
+
+
+# Objects are named by their content hash and never change, so CDNs may cache them for a year
+IMMUTABLE_CACHE_CONTROL = "31536000"
+
+
+class SupabaseStorageClient:
+    """Client for Supabase storage operations.
+
+    Uploads are streamed from disk by default ("streaming" mode): small files
+    are sent as a file handle read in chunks by the HTTP client, and files
+    larger than resumable_threshold_mb use Supabase's resumable (TUS) endpoint
+    one 6MB chunk at a time. Resumable upload state is kept in a local index,
+    so an upload interrupted by a dropped connection or a restart continues
+    from the last acknowledged chunk. "buffered" mode keeps the original
+    read-everything-into-memory behavior.
+
+    Objects are content-addressed: they are stored as {folder}/{sha256}{ext}
+    and served with a one-year cache-control. A local hash -> URL index lets
+    re-uploads of identical bytes (retries, re-runs) skip the transfer. The
+    index is shared by processes and can be stale, so a hit is confirmed with
+    the storage API before its URL is returned (not the public URL: the CDN
+    may keep serving a deleted object from its cache).
+
+    Deletions can be deferred with schedule_delete(): paths go to a durable
+    local queue and are removed later in batches with delete_files().
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key: Optional[str] = None,
+        bucket_name: Optional[str] = None,
+        upload_mode: Optional[str] = None,
+        resumable_threshold_mb: Optional[float] = None,
+        resume_index_path: Optional[str] = None,
+        upload_index_path: Optional[str] = None,
+        deletion_queue_path: Optional[str] = None,
+        file_probe: Optional[FileProbe] = None,
+    ):
         """Initialize Supabase storage client."""
         self.url = url or os.getenv("SUPABASE_URL")
         self.key = key or os.getenv("SUPABASE_KEY")  # Updated to match actual env var
         self.bucket_name = bucket_name or os.getenv("SUPABASE_BUCKET_NAME", "article")
+        self.upload_mode = (upload_mode or os.getenv("SUPABASE_UPLOAD_MODE", "streaming")).lower()
+        self.resumable_threshold_bytes = (
+            resumable_threshold_mb if resumable_threshold_mb is not None else float(os.getenv("SUPABASE_RESUMABLE_THRESHOLD_MB", "6"))
+        ) * 1024 * 1024
 
         if not self.url or not self.key:
             raise ValueError("Supabase URL and anonymous key are required")
+        if self.upload_mode not in UPLOAD_MODES:
+            raise ValueError(f"Unsupported upload mode: {self.upload_mode} (expected one of {UPLOAD_MODES})")
 
         self.client: Client = create_client(self.url, self.key)
-
-    def upload_image(self, local_path: str, folder: str = "thumbnails") -> str:
+        self.resume_index = JsonFileIndex(
+            resume_index_path or os.getenv("SUPABASE_RESUME_INDEX_PATH", "~/.cache/aitimes/resumable_uploads.json")
+        )
+        self.upload_index = JsonFileIndex(
+            upload_index_path or os.getenv("SUPABASE_UPLOAD_INDEX_PATH", "~/.cache/aitimes/upload_index.json")
+        )
+        self.deletion_queue = DeletionQueue(
+            deletion_queue_path or os.getenv("SUPABASE_DELETION_QUEUE_PATH", "~/.cache/aitimes/deletion_queue.sqlite3")
+        )
+        self.file_probe = file_probe or DEFAULT_FILE_PROBE
+        # Most recent file versions hashed, as in FileProbe
+        self._hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._hash_memo_lock = threading.Lock()
+
+    @instrument_backend("supabase")
+    def ping(self) -> None:
+        """List one object of the bucket to open the HTTP connection to storage."""
+        self.client.storage.from_(self.bucket_name).list("", {"limit": 1})
+
+    @instrument_backend("supabase")
+    def upload_image(self, local_path: str, folder: str = "thumbnails", progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload an image to Supabase storage and return the public URL.
 
         Args:
             local_path: Local file path to the image
             folder: Folder in the bucket to store the image
+            progress: Called with the number of bytes sent after each chunk
 
         Returns:
             Public URL of the uploaded image
         """
-        return self._upload_file(local_path, folder, "image")
+        return self._upload_file(local_path, folder, "image", progress)
 
-    def upload_video(self, local_path: str, folder: str = "videos") -> str:
+    @instrument_backend("supabase")
+    def upload_video(self, local_path: str, folder: str = "videos", progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload a video to Supabase storage and return the public URL.
 
         Args:
             local_path: Local file path to the video
             folder: Folder in the bucket to store the video
+            progress: Called with the number of bytes sent after each chunk
 
         Returns:
             Public URL of the uploaded video
         """
-        return self._upload_file(local_path, folder, "video")
+        return self._upload_file(local_path, folder, "video", progress)
 
-    def _upload_file(self, local_path: str, folder: str, file_type: str) -> str:
+    def _upload_file(self, local_path: str, folder: str, file_type: str, progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload a file to Supabase storage and return the public URL.
 
@@ -59,77 +162,268 @@ class SupabaseStorageClient:
             local_path: Local file path to the file
             folder: Folder in the bucket to store the file
             file_type: Type of file ("image" or "video")
+            progress: Called with the number of bytes sent after each chunk
 
         Returns:
             Public URL of the uploaded file
         """
-        if not os.path.exists(local_path):
-            raise FileNotFoundError(f"{file_type.capitalize()} file not found: {local_path}")
-
-        # Generate unique filename
-        file_extension = Path(local_path).suffix.lower()
-
-        # Validate file extension based on type
-        if file_type == "image":
-            supported_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
-        elif file_type == "video":
-            supported_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']
-        else:
+        if file_type not in ("image", "video"):
             raise ValueError(f"Unsupported file type: {file_type}")
 
-        if file_extension not in supported_extensions:
-            raise ValueError(f"Unsupported {file_type} format: {file_extension}")
-
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        storage_path = f"{folder}/{unique_filename}"
-
+        # One stat; the content is only sniffed the first time this file version is seen
         try:
-            # Read the file
-            with open(local_path, 'rb') as file:
-                file_data = file.read()
+            file_info = self.file_probe.probe(local_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{file_type.capitalize()} file not found: {local_path}")
 
-            # Upload to Supabase storage
-            response = self.client.storage.from_(self.bucket_name).upload(
-                path=storage_path,
-                file=file_data,
-                file_options={"content-type": self._get_content_type(file_extension)}
+        file_extension = Path(local_path).suffix.lower()
+        if not content_matches_extension(file_info, file_type):
+            raise ValueError(
+                f"Unsupported {file_type} format: {file_extension} (content is {file_info.format or 'not a recognized ' + file_type})"
             )
 
-            if response.status_code not in [200, 201]:
-                raise RuntimeError(f"Failed to upload {file_type}: {response}")
+        content_type = self._get_content_type(file_extension)
+
+        try:
+            # Name objects by content so identical bytes map to the same object
+            file_hash = self._hash_file(file_info)
+            storage_path = f"{folder}/{file_hash}{file_extension}"
+            index_key = f"{self.bucket_name}/{storage_path}"
+
+            # The object is wanted again: keep it from being deleted. If a worker is
+            # already deleting it, this waits until it is gone. Its index entry was
+            # dropped when it was queued, so it is re-uploaded (or found to exist) below
+            self.deletion_queue.cancel(storage_path)
+
+            public_url = self.upload_index.get(index_key)
+            if public_url and self._object_exists(storage_path):
+                # Already uploaded: skip the transfer
+                if progress:
+                    progress(file_info.size)
+                return public_url
+            if public_url:
+                # Deleted by another process (delete, reconcile) after this index was loaded
+                self.upload_index.delete(index_key)
+
+            if self.upload_mode == "streaming" and file_info.size > self.resumable_threshold_bytes:
+                self._upload_resumable(local_path, storage_path, content_type, progress)
+            else:
+                with _ProgressReader(local_path, progress) as file:
+                    # Streaming passes the file handle so it is sent in chunks instead of copied into memory
+                    file_data = file if self.upload_mode == "streaming" else file.read()
+
+                    # Upload to Supabase storage (raises on failure)
+                    try:
+                        self.client.storage.from_(self.bucket_name).upload(
+                            path=storage_path,
+                            file=file_data,
+                            file_options={"content-type": content_type, "cache-control": IMMUTABLE_CACHE_CONTROL}
+                        )
+                    except StorageApiError as e:
+                        # Same content uploaded before this index knew about it
+                        if str(e.status) != "409":
+                            raise
 
             # Get public URL
             public_url = self.client.storage.from_(self.bucket_name).get_public_url(storage_path)
+            self.upload_index.set(index_key, public_url)
 
             return public_url
 
         except Exception as e:
             raise RuntimeError(f"Error uploading {file_type} to Supabase: {str(e)}")
 
+    def _object_exists(self, storage_path: str) -> bool:
+        """
+        Whether an object exists, asked of the storage API rather than the CDN.
+
+        Errors count as missing: the upload that follows then reports a 409 if
+        the object is there after all.
+        """
+        try:
+            self.client.storage.from_(self.bucket_name).info(storage_path)
+        except (StorageApiError, httpx.HTTPError):
+            return False
+        return True
+
+    def _hash_file(self, file_info: FileInfo) -> str:
+        """SHA-256 of a probed file, memoized while the file is unchanged."""
+        memo_key = (file_info.path, file_info.size, file_info.mtime_ns)
+        with self._hash_memo_lock:
+            file_hash = self._hash_memo.get(memo_key)
+            if file_hash is not None:
+                self._hash_memo.move_to_end(memo_key)
+                return file_hash
+
+        digest = hashlib.sha256()
+        with open(file_info.path, 'rb') as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+        with self._hash_memo_lock:
+            self._hash_memo[memo_key] = file_hash
+            while len(self._hash_memo) > HASH_MEMO_MAX_ENTRIES:
+                self._hash_memo.popitem(last=False)
+        return file_hash
+
+    def _upload_resumable(self, local_path: str, storage_path: str, content_type: str, progress: Optional[ProgressCallback] = None) -> None:
+        """
+        Upload a file through Supabase's resumable (TUS) endpoint.
+
+        Only one chunk is held in memory at a time. A previous attempt for the
+        same storage path is resumed from the offset the server acknowledged.
+
+        Args:
+            local_path: Local file path to the file
+            storage_path: Path of the object in the bucket
+            content_type: MIME type of the file
+            progress: Called with the number of bytes sent after each chunk
+        """
+        stat = os.stat(local_path)
+        resume_key = f"{self.bucket_name}/{storage_path}"
+        headers = {
+            "authorization": f"Bearer {self.key}",
+            "apikey": self.key,
+            "tus-resumable": "1.0.0",
+        }
+
+        with httpx.Client(headers=headers, timeout=httpx.Timeout(60.0, connect=10.0)) as http:
+            entry = self.resume_index.get(resume_key)
+            offset = self._tus_offset(http, entry["upload_url"]) if entry else None
+
+            if offset is None:
+                upload_url = self._tus_create(http, storage_path, content_type, stat.st_size)
+                if upload_url is None:
+                    # Same content uploaded before this index knew about it
+                    if progress:
+                        progress(stat.st_size)
+                    return
+                offset = 0
+                self.resume_index.set(resume_key, {"upload_url": upload_url})
+            else:
+                upload_url = entry["upload_url"]
+                print(f"Resuming upload of {local_path} at {offset}/{stat.st_size} bytes")
+                if progress:
+                    progress(offset)
+
+            with open(local_path, 'rb') as file:
+                attempts = 0
+                while offset < stat.st_size:
+                    file.seek(offset)
+                    chunk = file.read(TUS_CHUNK_SIZE)
+                    try:
+                        response = http.patch(
+                            upload_url,
+                            content=chunk,
+                            headers={"upload-offset": str(offset), "content-type": "application/offset+octet-stream"}
+                        )
+                        response.raise_for_status()
+                        if progress:
+                            progress(int(response.headers["upload-offset"]) - offset)
+                        offset = int(response.headers["upload-offset"])
+                        attempts = 0
+                    except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                        attempts += 1
+                        if attempts >= TUS_MAX_CHUNK_ATTEMPTS:
+                            # Keep the index entry so the next attempt resumes here
+                            raise RuntimeError(f"Resumable upload interrupted at {offset}/{stat.st_size} bytes: {str(e)}")
+                        # Re-sync with the offset the server actually stored
+                        offset = self._tus_offset(http, upload_url)
+                        if offset is None:
+                            self.resume_index.delete(resume_key)
+                            raise RuntimeError(f"Resumable upload expired: {str(e)}")
+
+        self.resume_index.delete(resume_key)
+
+    def _tus_create(self, http: httpx.Client, storage_path: str, content_type: str, size: int) -> Optional[str]:
+        """Create a resumable upload and return its upload URL, or None if the object already exists."""
+        metadata = {
+            "bucketName": self.bucket_name,
+            "objectName": storage_path,
+            "contentType": content_type,
+            "cacheControl": IMMUTABLE_CACHE_CONTROL,
+        }
+        response = http.post(
+            f"{self.url.rstrip('/')}/storage/v1/upload/resumable",
+            headers={
+                "upload-length": str(size),
+                "upload-metadata": ",".join(
+                    f"{name} {base64.b64encode(value.encode('utf-8')).decode('ascii')}"
+                    for name, value in metadata.items()
+                ),
+            }
+        )
+        if response.status_code == 409:
+            return None
+        response.raise_for_status()
+        return str(response.url.join(response.headers["location"]))
+
+    def _tus_offset(self, http: httpx.Client, upload_url: str) -> Optional[int]:
+        """Get the stored offset of a resumable upload, or None if it no longer exists."""
+        try:
+            response = http.head(upload_url)
+        except httpx.TransportError:
+            return None
+        if response.status_code != 200 or "upload-offset" not in response.headers:
+            return None
+        return int(response.headers["upload-offset"])
+
+    @instrument_backend("supabase")
     def delete_image(self, storage_path: str) -> bool:
         """
         Delete an image from Supabase storage.
 
         Args:
-            storage_path: Path in storage (e.g., "thumbnails/uuid.png")
+            storage_path: Path in storage (e.g., "thumbnails/article-1/<sha256>.png")
 
         Returns:
             True if successful, False otherwise
         """
         return self._delete_file(storage_path, "image")
 
+    @instrument_backend("supabase")
     def delete_video(self, storage_path: str) -> bool:
         """
         Delete a video from Supabase storage.
 
         Args:
-            storage_path: Path in storage (e.g., "videos/uuid.mp4")
+            storage_path: Path in storage (e.g., "videos/article-1/<sha256>.mp4")
 
         Returns:
             True if successful, False otherwise
         """
         return self._delete_file(storage_path, "video")
 
+    def schedule_delete(self, storage_paths: List[str]) -> None:
+        """
+        Queue files for deletion by a background worker instead of deleting them now.
+
+        Their upload index entries are dropped right away, so uploading the same
+        bytes again does not return a URL that is about to be deleted.
+
+        Args:
+            storage_paths: Paths in storage
+        """
+        for storage_path in storage_paths:
+            self.upload_index.delete(f"{self.bucket_name}/{storage_path}")
+        self.deletion_queue.enqueue(storage_paths)
+
+    @instrument_backend("supabase")
+    def delete_files(self, storage_paths: List[str]) -> None:
+        """
+        Delete many files from Supabase storage with a single request.
+
+        Args:
+            storage_paths: Paths in storage
+
+        Raises:
+            StorageApiError: If the request fails
+        """
+        # Paths that don't exist are skipped by Supabase, so a retried batch is harmless
+        self.client.storage.from_(self.bucket_name).remove(storage_paths)
+        for storage_path in storage_paths:
+            self.upload_index.delete(f"{self.bucket_name}/{storage_path}")
+
     def _delete_file(self, storage_path: str, file_type: str) -> bool:
         """
         Delete a file from Supabase storage.
@@ -142,8 +436,10 @@ class SupabaseStorageClient:
             True if successful, False otherwise
         """
         try:
-            response = self.client.storage.from_(self.bucket_name).remove([storage_path])
-            return response.status_code == 200
+            # remove() raises on failure and returns the removed objects
+            self.client.storage.from_(self.bucket_name).remove([storage_path])
+            self.upload_index.delete(f"{self.bucket_name}/{storage_path}")
+            return True
         except Exception as e:
             print(f"Error deleting {file_type} from Supabase: {str(e)}")
             return False
@@ -157,6 +453,7 @@ class SupabaseStorageClient:
             '.jpeg': 'image/jpeg',
             '.gif': 'image/gif',
             '.webp': 'image/webp',
+            '.avif': 'image/avif',
 
             # Video types
             '.mp4': 'video/mp4',
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark event-loop lag of the sync vs async MongoDB drivers.
+
+Runs the same burst of concurrent repository calls (as concurrent MCP tool
+calls would) against each driver while a ticker task measures how late the
+event loop wakes it up.
+
+Usage:
+    python -m sdk_mcp_server.benchmark_event_loop_lag --concurrency 20 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+from sdk_mcp_server.Infrastructure.mongodb_client import MongoDBClient, SUPPORTED_DRIVERS
+from sdk_mcp_server.Infrastructure.article_repository import ArticleRepository
+
+load_dotenv()
+
+TICK_INTERVAL = 0.005
+
+
+async def monitor_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how late each tick fires compared to its schedule."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_INTERVAL
+        await asyncio.sleep(TICK_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_driver(driver: str, concurrency: int, rounds: int) -> dict:
+    """Run the workload for one driver and return lag statistics."""
+    mongo_client = MongoDBClient(driver=driver)
+    mongo_client.connect()
+    await mongo_client.ping()
+    repository = ArticleRepository(mongo_client)
+
+    existing = await repository.list_articles(limit=1)
+    article_id = existing[0].id if existing else "benchmark-missing-id"
+
+    samples: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(samples, stop))
+
+    started = time.perf_counter()
+    try:
+        for _ in range(rounds):
+            calls = []
+            for i in range(concurrency):
+                if i % 2:
+                    calls.append(repository.list_articles(limit=20))
+                else:
+                    calls.append(repository.get_article_by_id(article_id))
+            await asyncio.gather(*calls)
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+        await mongo_client.aclose()
+
+    samples.sort()
+    return {
+        "driver": driver,
+        "calls": concurrency * rounds,
+        "wall_s": elapsed,
+        "lag_p50_ms": statistics.median(samples) * 1000 if samples else 0.0,
+        "lag_p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000 if samples else 0.0,
+        "lag_max_ms": samples[-1] * 1000 if samples else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event-loop lag per MongoDB driver")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent calls per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of rounds")
+    parser.add_argument("--driver", choices=SUPPORTED_DRIVERS, action="append", help="Driver(s) to benchmark (default: all)")
+    args = parser.parse_args()
+
+    print("⏱️ Event-loop lag under concurrent repository calls")
+    for driver in args.driver or SUPPORTED_DRIVERS:
+        result = await run_driver(driver, args.concurrency, args.rounds)
+        print(
+            f"  {result['driver']:>5}: {result['calls']} calls in {result['wall_s']:.2f}s | "
+            f"lag p50 {result['lag_p50_ms']:.1f}ms, p99 {result['lag_p99_ms']:.1f}ms, max {result['lag_max_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark peak RSS of Supabase uploads per upload mode.
+
+Each upload runs in a fresh subprocess so the high-water mark of resident
+memory (ru_maxrss) belongs to that upload alone. Uploaded objects are deleted
+afterwards.
+
+Usage:
+    python -m sdk_mcp_server.benchmark_upload_memory --file /path/to/video.mp4
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# name -> (upload_mode, resumable_threshold_mb)
+MODES = {
+    "buffered": ("buffered", None),
+    "streaming": ("streaming", float("inf")),
+    "resumable": ("streaming", 0.0),
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(mode: str, local_path: str) -> None:
+    """Upload local_path once in the given mode and print the measurements as JSON."""
+    from sdk_mcp_server.Infrastructure.supabase_storage import SupabaseStorageClient
+
+    upload_mode, threshold_mb = MODES[mode]
+    client = SupabaseStorageClient(upload_mode=upload_mode, resumable_threshold_mb=threshold_mb)
+    file_type = "video" if local_path.lower().endswith((".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v")) else "image"
+
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    public_url = client._upload_file(local_path, "benchmarks", file_type)
+    elapsed = time.perf_counter() - started
+    peak = peak_rss_mb()
+
+    storage_path = client.extract_storage_path_from_url(public_url)
+    if storage_path:
+        client._delete_file(storage_path, file_type)
+
+    print(json.dumps({"mode": mode, "seconds": elapsed, "baseline_mb": baseline, "peak_mb": peak}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure peak RSS per Supabase upload mode")
+    parser.add_argument("--file", required=True, help="Local image or video file to upload")
+    parser.add_argument("--mode", choices=MODES, action="append", help="Mode(s) to benchmark (default: all)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.mode[0], args.file)
+        return
+
+    size_mb = os.path.getsize(args.file) / (1024 * 1024)
+    print(f"📦 Peak RSS per upload of {args.file} ({size_mb:.1f}MB)")
+    for mode in args.mode or MODES:
+        completed = subprocess.run(
+            [sys.executable, "-m", "sdk_mcp_server.benchmark_upload_memory", "--child", "--mode", mode, "--file", args.file],
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            print(f"  {mode:>9}: failed\n{completed.stderr}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(
+            f"  {mode:>9}: {result['seconds']:.2f}s | peak RSS {result['peak_mb']:.1f}MB "
+            f"(+{result['peak_mb'] - result['baseline_mb']:.1f}MB over baseline)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Codec encoding articles straight into tool JSON payloads."""
+
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from .models import ARTICLE_FIELDS, Article
+
+# Fields always fetched from MongoDB so cursors can be built from projected documents
+_POSITION_FIELDS = ("id", "created_at")
+
+
+class ArticleCodec:
+    """Encodes articles or MongoDB documents into JSON-ready dicts of selected fields."""
+
+    __slots__ = ("fields", "projection")
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        """
+        Initialize the codec for a subset of article fields.
+
+        Args:
+            fields: Article fields to encode, in payload order (default: all)
+
+        Raises:
+            ValueError: If an unknown field is requested
+        """
+        selected = tuple(dict.fromkeys(fields)) if fields else ARTICLE_FIELDS
+        unknown = [name for name in selected if name not in ARTICLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown article fields: {', '.join(unknown)} (available: {', '.join(ARTICLE_FIELDS)})")
+
+        self.fields = selected
+        self.projection = {"_id": 0, **{name: 1 for name in (*_POSITION_FIELDS, *selected)}}
+
+    def encode(self, article: Article) -> dict:
+        """Encode an Article into a payload dict."""
+        return {name: _encode_value(getattr(article, name)) for name in self.fields}
+
+    def encode_document(self, document: dict) -> dict:
+        """Encode a (projected) MongoDB article document into a payload dict."""
+        return {name: _encode_value(document.get(name)) for name in self.fields}
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a field value into its JSON representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+DEFAULT_CODEC = ArticleCodec()
@@ -1,10 +1,11 @@
 """Domain models for article data."""
 
-from dataclasses import dataclass
+import types
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """Article domain model."""
 
@@ -15,6 +16,7 @@ class Article:
     video_file_url: Optional[str] = None  # Supabase public URL instead of local path
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    thumbnail_renditions: Optional[Dict[str, str]] = None  # Rendition name (e.g. "1x1_webp") -> Supabase public URL
 
     def to_dict(self) -> dict:
         """Convert article to dictionary for MongoDB storage."""
@@ -25,7 +27,8 @@ class Article:
             "title": self.title,
             "subtitle": self.subtitle,
             "created_at": self.created_at,
-            "updated_at": self.updated_at
+            "updated_at": self.updated_at,
+            "thumbnail_renditions": self.thumbnail_renditions
         }
 
     @classmethod
@@ -38,11 +41,38 @@ class Article:
             subtitle=data["subtitle"],
             video_file_url=data.get("video_file_url"),
             created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
+            updated_at=data.get("updated_at"),
+            thumbnail_renditions=data.get("thumbnail_renditions")
         )
 
 
-@dataclass
+ARTICLE_FIELDS = tuple(f.name for f in fields(Article))
+
+
+@dataclass(slots=True)
+class ArticleCreationResult:
+    """Outcome of creating one article of a batch."""
+
+    id: str
+    article: Optional[Article] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the article was created."""
+        return self.article is not None
+
+
+@dataclass(slots=True)
+class ArticlePage:
+    """One page of article documents in (created_at, id) descending order."""
+
+    documents: List[dict] = field(default_factory=list)  # Projected MongoDB documents without _id
+    next_cursor: Optional[str] = None  # Opaque cursor for the following page, None on the last page
+    total: Optional[int] = None  # Estimated total number of articles, when requested
+
+
+@dataclass(slots=True)
 class ArticleCreationInput:
     """Input model for creating articles."""
 
@@ -51,9 +81,10 @@ class ArticleCreationInput:
     title: str
     subtitle: str
     video_file_url: Optional[str] = None  # Supabase public URL
+    thumbnail_renditions: Optional[Dict[str, str]] = None  # Rendition name -> Supabase public URL
 
 
-@dataclass
+@dataclass(slots=True)
 class ArticleCreationRequest:
     """Request model for creating articles with local image path."""
     id: str
@@ -61,9 +92,45 @@ class ArticleCreationRequest:
     title: str
     subtitle: str
     video_file_path: Optional[str] = None
+    renditions: bool = False  # Also upload resized WebP/AVIF renditions (1x1, 16x9) of the thumbnail
+
 
+@dataclass(slots=True)
+class FileInfo:
+    """What a local file really is, as identified by its content."""
+    path: str  # Absolute path
+    size: int  # Bytes
+    mtime_ns: int
+    kind: Optional[str] = None  # "image", "video", or None if not recognized
+    format: Optional[str] = None  # e.g. "png", "jpeg", "mp4", "webm"
+    width: Optional[int] = None  # Images only
+    height: Optional[int] = None
 
-@dataclass
+
+@dataclass(slots=True)
+class RenditionSpec:
+    """Size and encoding of one thumbnail rendition."""
+    name: str  # e.g. "1x1"; stored as "{name}_{format}"
+    width: int
+    height: int
+    format: str  # "webp" or "avif"
+    quality: int
+    fit: str = "crop"  # "crop" to fill the size, "pad" to letterbox the whole source into it
+
+    @property
+    def key(self) -> str:
+        """Key of the rendition in Article.thumbnail_renditions."""
+        return f"{self.name}_{self.format}"
+
+
+@dataclass(slots=True)
+class ArticleBatchCreationRequest:
+    """Request model for creating many articles at once."""
+    articles: List[ArticleCreationRequest]
+    max_concurrency: int = 4  # Maximum number of concurrent uploads
+
+
+@dataclass(slots=True)
 class ArticleUpdateInput:
     """Input model for updating articles."""
     id: str
@@ -71,29 +138,144 @@ class ArticleUpdateInput:
     title: Optional[str] = None
     subtitle: Optional[str] = None
     video_file_path: Optional[str] = None
+    renditions: bool = False  # Regenerate thumbnail renditions (always done when the article already has them)
+    expected_updated_at: Optional[str] = None  # ISO updated_at the update is based on; rejects the update if the article changed since
+
+
+@dataclass(slots=True)
+class UploadJob:
+    """Background upload job and its progress."""
+
+    id: str
+    kind: str  # "video" or "article"
+    article_id: str
+    status: str = "queued"  # queued, running, succeeded or failed
+    bytes_total: int = 0
+    bytes_done: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[dict] = None  # Tool payload of the finished job
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job succeeded or failed."""
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict:
+        """Convert job to a JSON-ready dictionary including progress and throughput."""
+        elapsed = None
+        if self.started_at:
+            elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "article_id": self.article_id,
+            "status": self.status,
+            "progress": min(1.0, self.bytes_done / self.bytes_total) if self.bytes_total else (1.0 if self.finished else 0.0),
+            "bytes_total": self.bytes_total,
+            "bytes_done": self.bytes_done,
+            "elapsed_seconds": elapsed,
+            "throughput_mb_per_s": self.bytes_done / elapsed / (1024 * 1024) if elapsed else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+@dataclass(slots=True)
+class VideoUploadRequest:
+    """Request model for uploading a standalone video."""
+    video_file_path: str
+    article_id: str
+    background: bool = False  # Return a job id right away instead of waiting for the upload
+
+
+@dataclass(slots=True)
+class UploadStatusRequest:
+    """Request model for checking or waiting on upload jobs."""
+    job_ids: Optional[List[str]] = None  # Default: every job (status) or every unfinished job (wait)
+    timeout_seconds: float = 300.0  # Only used when waiting
+
+
+@dataclass(slots=True)
+class ArticleQuery:
+    """Request model for reading a single article."""
+    article_id: str
+    fields: Optional[List[str]] = field(default=None, metadata={"json_schema": {"items": {"type": "string", "enum": list(ARTICLE_FIELDS)}}})
+
+
+@dataclass(slots=True)
+class ArticleListRequest:
+    """Request model for listing articles."""
+    limit: int = 100
+    offset: int = 0
+    cursor: Optional[str] = None  # next_cursor of the previous page
+    include_total: bool = False
+    fields: Optional[List[str]] = field(default=None, metadata={"json_schema": {"items": {"type": "string", "enum": list(ARTICLE_FIELDS)}}})
 
 
 ## json schema
-article_creation_request_schema = {
-    "type": "object",
-    "properties": {
-        "id": {"type": "string"},
-        "thumbnail_image_path": {"type": "string"},
-        "video_file_path": {"type": "string", "nullable": True},
-        "title": {"type": "string"},
-        "subtitle": {"type": "string"}
-    },
-    "required": ["id", "thumbnail_image_path", "title", "subtitle"]
+_JSON_SCHEMA_TYPES = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    dict: {"type": "object"},
+    datetime: {"type": "string", "format": "date-time"},
 }
 
-article_update_input_schema = {
-    "type": "object",
-    "properties": {
-        "id": {"type": "string"},
-        "thumbnail_image_path": {"type": "string"},
-        "title": {"type": "string"},
-        "subtitle": {"type": "string"},
-        "video_file_path": {"type": "string", "nullable": True}
-    },
-    "required": ["id"]
-}
\ No newline at end of file
+
+def _type_json_schema(annotation: Any) -> dict:
+    """Build the JSON schema of a single type annotation."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        schema = _type_json_schema(args[0]) if len(args) == 1 else {}
+        if len(args) < len(get_args(annotation)):
+            schema["nullable"] = True
+        return schema
+    if origin in (list, List):
+        (item_type,) = get_args(annotation) or (Any,)
+        return {"type": "array", "items": _type_json_schema(item_type)}
+    if origin is dict:
+        return {"type": "object"}
+    if is_dataclass(annotation):
+        return dataclass_json_schema(annotation)
+    return dict(_JSON_SCHEMA_TYPES.get(annotation, {}))
+
+
+def dataclass_json_schema(cls: type) -> dict:
+    """
+    Generate a tool input JSON schema from a dataclass.
+
+    Fields without a default are required; per-field additions can be given in
+    the field metadata under "json_schema".
+    """
+    hints = get_type_hints(cls)
+    properties = {}
+    required = []
+    for f in fields(cls):
+        schema = _type_json_schema(hints[f.name])
+        if f.default is not MISSING and f.default is not None:
+            schema["default"] = f.default
+        schema.update(f.metadata.get("json_schema", {}))
+        properties[f.name] = schema
+        if f.default is MISSING and f.default_factory is MISSING:
+            required.append(f.name)
+
+    schema = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+article_creation_request_schema = dataclass_json_schema(ArticleCreationRequest)
+article_batch_creation_request_schema = dataclass_json_schema(ArticleBatchCreationRequest)
+article_update_input_schema = dataclass_json_schema(ArticleUpdateInput)
+video_upload_request_schema = dataclass_json_schema(VideoUploadRequest)
+upload_status_request_schema = dataclass_json_schema(UploadStatusRequest)
+article_query_schema = dataclass_json_schema(ArticleQuery)
+article_list_request_schema = dataclass_json_schema(ArticleListRequest)
@@ -0,0 +1,19 @@
+"""Metrics and tracing decorators, or no-ops when the observability package is not installed."""
+
+from typing import Callable, Optional
+
+try:
+    from observability.instrumentation import instrument_backend, instrument_tool
+except ImportError:
+    # The server is also deployed on its own, without the repository root on sys.path
+    def instrument_tool(func: Callable) -> Callable:
+        """Return the MCP tool handler unchanged."""
+        return func
+
+    def instrument_backend(backend: str, operation: Optional[str] = None) -> Callable:
+        """Return a decorator that leaves the backend call unchanged."""
+        def decorator(func: Callable) -> Callable:
+            return func
+        return decorator
+
+__all__ = ["instrument_backend", "instrument_tool"]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Find (and optionally delete) Supabase objects no article references.
+
+Referenced storage paths are read from the articles collection (URL fields
+only) into a Bloom filter, so memory stays at a few MB even for millions of
+articles. A false positive only means an orphan is kept, never that a
+referenced object is deleted. The bucket is then listed folder by folder,
+one page at a time; orphans older than the grace period are spooled to a
+temporary file and, with --delete, removed in batches once the listing is
+complete (deleting while listing would shift the offset-based pages).
+
+Usage:
+    python -m sdk_mcp_server.reconcile_storage                # report only
+    python -m sdk_mcp_server.reconcile_storage --delete --grace-hours 24
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+
+from sdk_mcp_server.Infrastructure.article_repository import ArticleRepository
+from sdk_mcp_server.Infrastructure.mongodb_client import MongoDBClient
+from sdk_mcp_server.Infrastructure.supabase_storage import SupabaseStorageClient
+from sdk_mcp_server.service.image_rendition_service import RENDITION_QUALITY, RENDITION_SIZES
+
+load_dotenv()
+
+# Thumbnail and video, plus every size and format of rendition
+MAX_FILES_PER_ARTICLE = 2 + len(RENDITION_SIZES) * len(RENDITION_QUALITY)
+
+
+class BloomFilter:
+    """Fixed-size set membership test with no false negatives."""
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        """Size the filter for capacity items at the given false positive rate."""
+        capacity = max(capacity, 1)
+        self.size_bits = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Bit positions of an item (double hashing over one digest)."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size_bits
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def iter_bucket_files(storage: SupabaseStorageClient, prefix: str = "", page_size: int = 1000) -> Iterator[dict]:
+    """
+    List every file under prefix, one page per request.
+
+    Supabase lists one folder level at a time; folders come back without an
+    id and are walked depth-first, so only one page per level is in memory.
+
+    Yields:
+        Listing entries with the full storage path added as "path"
+    """
+    bucket = storage.client.storage.from_(storage.bucket_name)
+    offset = 0
+    while True:
+        page = bucket.list(prefix, {"limit": page_size, "offset": offset, "sortBy": {"column": "name", "order": "asc"}})
+        for entry in page:
+            path = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+            if entry.get("id") is None:
+                yield from iter_bucket_files(storage, path, page_size)
+            else:
+                yield {**entry, "path": path}
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def parse_created_at(value: Optional[str]) -> Optional[datetime]:
+    """Parse a storage timestamp such as 2024-01-01T00:00:00.123Z."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+async def build_referenced_paths(repository: ArticleRepository, storage: SupabaseStorageClient, false_positive_rate: float) -> tuple:
+    """Load every storage path referenced by an article into a Bloom filter."""
+    # Headroom for articles created meanwhile
+    capacity = int((await repository.estimated_article_count()) * MAX_FILES_PER_ARTICLE * 1.2) + 1000
+    referenced = BloomFilter(capacity, false_positive_rate)
+    count = 0
+    async for public_url in repository.iter_file_urls():
+        storage_path = storage.extract_storage_path_from_url(public_url)
+        if storage_path:
+            referenced.add(storage_path)
+            count += 1
+    return referenced, count
+
+
+def delete_spooled(storage: SupabaseStorageClient, spool, batch_size: int) -> int:
+    """Delete the paths in the spool file, batch_size per request."""
+    spool.seek(0)
+    deleted = 0
+    batch = []
+    for line in spool:
+        batch.append(line.rstrip("\n"))
+        if len(batch) == batch_size:
+            storage.delete_files(batch)
+            deleted += len(batch)
+            batch = []
+            print(f"  🗑️ deleted {deleted} orphan(s)")
+    if batch:
+        storage.delete_files(batch)
+        deleted += len(batch)
+        print(f"  🗑️ deleted {deleted} orphan(s)")
+    return deleted
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Find or delete Supabase objects not referenced by any article")
+    parser.add_argument("--prefix", action="append", help="Bucket folder(s) to scan (default: thumbnails and videos)")
+    parser.add_argument("--delete", action="store_true", help="Delete orphans instead of only reporting them")
+    parser.add_argument("--grace-hours", type=float, default=24.0, help="Skip objects newer than this (uploads not yet saved)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Objects per listing request")
+    parser.add_argument("--batch-size", type=int, default=100, help="Objects per delete request")
+    parser.add_argument("--false-positive-rate", type=float, default=0.001, help="Bloom filter false positive rate")
+    args = parser.parse_args()
+
+    storage = SupabaseStorageClient()
+    mongo_client = MongoDBClient()
+    mongo_client.connect()
+    repository = ArticleRepository(mongo_client)
+
+    try:
+        started = time.perf_counter()
+        referenced, referenced_count = await build_referenced_paths(repository, storage, args.false_positive_rate)
+        loaded_in = time.perf_counter() - started
+        print(
+            f"📚 {referenced_count} referenced path(s) in {loaded_in:.2f}s "
+            f"({referenced_count / max(loaded_in, 1e-9):.0f}/s, filter {len(referenced._bits) / 1024:.0f}KB)"
+        )
+    finally:
+        await mongo_client.aclose()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=args.grace_hours)
+    scanned = orphans = orphan_bytes = too_new = 0
+    started = time.perf_counter()
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for prefix in args.prefix or ["thumbnails", "videos"]:
+            for entry in iter_bucket_files(storage, prefix, args.page_size):
+                scanned += 1
+                if scanned % 10000 == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"  … {scanned} object(s) scanned ({scanned / elapsed:.0f}/s), {orphans} orphan(s)")
+                if entry["path"] in referenced:
+                    continue
+                created_at = parse_created_at(entry.get("created_at"))
+                if created_at is None or created_at > cutoff:
+                    too_new += 1
+                    continue
+                orphans += 1
+                orphan_bytes += (entry.get("metadata") or {}).get("size") or 0
+                spool.write(entry["path"] + "\n")
+                if not args.delete:
+                    print(f"  orphan: {entry['path']}")
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"🔎 Scanned {scanned} object(s) in {elapsed:.2f}s ({scanned / max(elapsed, 1e-9):.0f}/s): "
+            f"{orphans} orphan(s), {orphan_bytes / (1024 * 1024):.1f}MB; "
+            f"{too_new} unreferenced object(s) within the {args.grace_hours:g}h grace period"
+        )
+
+        if args.delete and orphans:
+            started = time.perf_counter()
+            deleted = delete_spooled(storage, spool, args.batch_size)
+            elapsed = time.perf_counter() - started
+            print(f"✅ Deleted {deleted} orphan(s) in {elapsed:.2f}s ({deleted / max(elapsed, 1e-9):.0f}/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,37 +2,59 @@ from claude_code_sdk import tool, create_sdk_mcp_server, ClaudeSDKClient, Claude
 
 """MongoDB MCP Server for AITimes article management with Supabase image storage."""
 
-from .Infrastructure.mongodb_client import MongoDBClient
-from .Infrastructure.article_repository import ArticleRepository
-from .service.image_upload_service import FileUploadService
-from .service.article_service import ArticleService
-from .domain.models import ArticleCreationRequest, article_creation_request_schema, article_update_input_schema
+import asyncio
 
-# Initialize services
-mongo_client = MongoDBClient()
-mongo_client.connect()
-article_repository = ArticleRepository(mongo_client)
-file_service = FileUploadService()
-article_service = ArticleService(article_repository, file_service)
+from .instrumentation import instrument_tool
+from .service.service_container import ServiceContainer
+from .domain.codec import ArticleCodec, DEFAULT_CODEC
+from .domain.models import (
+    ArticleCreationRequest,
+    ArticleListRequest,
+    ArticleQuery,
+    UploadStatusRequest,
+    VideoUploadRequest,
+    article_batch_creation_request_schema,
+    article_creation_request_schema,
+    article_list_request_schema,
+    article_query_schema,
+    article_update_input_schema,
+    upload_status_request_schema,
+    video_upload_request_schema,
+)
 
+# Services are built on first tool use (or by services.start_warmup())
+services = ServiceContainer()
 
-@tool(name="create_article", description="Create a new article with thumbnail and optional video upload to Supabase", input_schema=article_creation_request_schema)
+create_article_input_schema = {
+    **article_creation_request_schema,
+    "properties": {
+        **article_creation_request_schema["properties"],
+        "background": {"type": "boolean", "default": False}
+    }
+}
+
+
+@tool(name="create_article", description="Create a new article with thumbnail and optional video upload to Supabase. With background=true, returns an upload job id right away; check it with get_upload_status or wait_uploads", input_schema=create_article_input_schema)
+@instrument_tool
 async def create_article(args: dict):
     """Create a new article by uploading files to Supabase first."""
     try:
-        request = ArticleCreationRequest(**args)
+        background = args.get("background", False)
+        request = ArticleCreationRequest(**{key: value for key, value in args.items() if key != "background"})
+        if background:
+            upload_job_service = await services.upload_job_service()
+            job = upload_job_service.submit_article_creation(request)
+            return {
+                "success": True,
+                "job": job.to_dict()
+            }
+
+        article_service = await services.article_service()
         article = await article_service.create_article_with_upload(request)
 
         return {
             "success": True,
-            "article": {
-                "id": article.id,
-                "thumbnail_image_url": article.thumbnail_image_url,
-                "video_file_url": article.video_file_url,
-                "title": article.title,
-                "subtitle": article.subtitle,
-                "created_at": article.created_at.isoformat() if article.created_at else None
-            }
+            "article": DEFAULT_CODEC.encode(article)
         }
     except Exception as e:
         return {
@@ -41,24 +63,47 @@ async def create_article(args: dict):
         }
 
 
-@tool(name="get_article", description="Get an article by ID", input_schema={"type": "object", "properties": {"article_id": {"type": "string"}}, "required": ["article_id"]})
+@tool(name="create_articles", description="Create many articles at once. Files are uploaded concurrently and articles are written in one batch; each item reports its own success or error", input_schema=article_batch_creation_request_schema)
+@instrument_tool
+async def create_articles(args: dict):
+    """Create many articles by uploading their files concurrently."""
+    try:
+        requests = [ArticleCreationRequest(**item) for item in args["articles"]]
+        article_service = await services.article_service()
+        results = await article_service.create_articles_with_upload(requests, args.get("max_concurrency", 4))
+
+        created_count = sum(1 for result in results if result.success)
+        return {
+            "success": created_count == len(results),
+            "created_count": created_count,
+            "failed_count": len(results) - created_count,
+            "results": [
+                {"id": result.id, "success": True, "article": DEFAULT_CODEC.encode(result.article)}
+                if result.success
+                else {"id": result.id, "success": False, "error": result.error}
+                for result in results
+            ]
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@tool(name="get_article", description="Get an article by ID. Optionally return only the given fields", input_schema=article_query_schema)
+@instrument_tool
 async def get_article(args: dict):
     """Get an article by ID."""
     try:
-        article_id = args["article_id"]
-        article = await article_service.get_article(article_id)
+        query = ArticleQuery(**args)
+        codec = ArticleCodec(query.fields) if query.fields else DEFAULT_CODEC
+        article_service = await services.article_service()
+        article = await article_service.get_article(query.article_id)
 
         return {
             "success": True,
-            "article": {
-                "id": article.id,
-                "thumbnail_image_url": article.thumbnail_image_url,
-                "video_file_url": article.video_file_url,
-                "title": article.title,
-                "subtitle": article.subtitle,
-                "created_at": article.created_at.isoformat() if article.created_at else None,
-                "updated_at": article.updated_at.isoformat() if article.updated_at else None
-            }
+            "article": codec.encode(article)
         }
     except Exception as e:
         return {
@@ -66,23 +111,17 @@ async def get_article(args: dict):
             "error": str(e)
         }
 
-@tool(name="update_article", description="Update an article by ID", input_schema=article_update_input_schema)
+@tool(name="update_article", description="Update an article by ID. Pass the article's updated_at as expected_updated_at to reject the update if someone else changed it meanwhile", input_schema=article_update_input_schema)
+@instrument_tool
 async def update_article(args: dict):
     """Update an article by ID."""
     try:
         article_id = args["id"]  # Changed from "article_id" to "id" to match schema
+        article_service = await services.article_service()
         article = await article_service.update_article(article_id, args)
         return {
             "success": True,
-            "article": {
-                "id": article.id,
-                "thumbnail_image_url": article.thumbnail_image_url,
-                "video_file_url": article.video_file_url,
-                "title": article.title,
-                "subtitle": article.subtitle,
-                "created_at": article.created_at.isoformat() if article.created_at else None,
-                "updated_at": article.updated_at.isoformat() if article.updated_at else None
-            }
+            "article": DEFAULT_CODEC.encode(article)
         }
     except Exception as e:
         return {
@@ -90,31 +129,29 @@ async def update_article(args: dict):
             "error": str(e)
         }
 
-@tool(name="list_articles", description="List articles with pagination", input_schema={"type": "object", "properties": {"limit": {"type": "integer", "default": 100}, "offset": {"type": "integer", "default": 0}}})
+@tool(name="list_articles", description="List articles, newest first. Pass next_cursor from the previous response as cursor to get the following page. Use fields to return only the fields you need", input_schema=article_list_request_schema)
+@instrument_tool
 async def list_articles(args: dict):
-    """List articles with pagination."""
+    """List articles with offset or cursor pagination."""
     try:
-        limit = args.get("limit", 100)
-        offset = args.get("offset", 0)
-        articles = await article_service.list_articles(limit, offset)
-
-        article_list = []
-        for article in articles:
-            article_list.append({
-                "id": article.id,
-                "thumbnail_image_url": article.thumbnail_image_url,
-                "video_file_url": article.video_file_url,
-                "title": article.title,
-                "subtitle": article.subtitle,
-                "created_at": article.created_at.isoformat() if article.created_at else None,
-                "updated_at": article.updated_at.isoformat() if article.updated_at else None
-            })
+        request = ArticleListRequest(**args)
+        codec = ArticleCodec(request.fields) if request.fields else DEFAULT_CODEC
+        article_service = await services.article_service()
+        page = await article_service.list_articles_page(
+            request.limit, request.offset, request.cursor, request.include_total, codec.projection
+        )
 
-        return {
+        article_list = [codec.encode_document(document) for document in page.documents]
+
+        result = {
             "success": True,
             "articles": article_list,
-            "count": len(article_list)
+            "count": len(article_list),
+            "next_cursor": page.next_cursor
         }
+        if request.include_total:
+            result["total"] = page.total
+        return result
     except Exception as e:
         return {
             "success": False,
@@ -123,10 +160,12 @@ async def list_articles(args: dict):
 
 
 @tool(name="delete_article", description="Delete an article and its thumbnail", input_schema={"type": "object", "properties": {"article_id": {"type": "string"}}, "required": ["article_id"]})
+@instrument_tool
 async def delete_article(args: dict):
     """Delete an article and its thumbnail image."""
     try:
         article_id = args["article_id"]
+        article_service = await services.article_service()
         deleted = await article_service.delete_article(article_id)
 
         return {
@@ -139,13 +178,24 @@ async def delete_article(args: dict):
             "error": str(e)
         }
 
-@tool(name="upload_video", description="Upload a video file to Supabase", input_schema={"type": "object", "properties": {"video_file_path": {"type": "string"}, "article_id": {"type": "string"}}, "required": ["video_file_path", "article_id"]})
+@tool(name="upload_video", description="Upload a video file to Supabase. With background=true, returns an upload job id right away; check it with get_upload_status or wait_uploads", input_schema=video_upload_request_schema)
+@instrument_tool
 async def upload_video(args: dict):
     """Upload a video file to Supabase."""
     try:
-        video_file_path = args["video_file_path"]
-        article_id = args["article_id"]
-        video_url = file_service.upload_video_file(video_file_path, article_id)
+        request = VideoUploadRequest(**args)
+        if request.background:
+            upload_job_service = await services.upload_job_service()
+            job = upload_job_service.submit_video_upload(request.video_file_path, request.article_id)
+            return {
+                "success": True,
+                "job": job.to_dict()
+            }
+
+        file_service = await services.file_service()
+        video_url = await asyncio.wrap_future(
+            file_service.submit(file_service.upload_video_file, request.video_file_path, request.article_id)
+        )
         return {
             "success": True,
             "video_url": video_url
@@ -156,9 +206,58 @@ async def upload_video(args: dict):
             "error": str(e)
         }
 
+
+@tool(name="get_upload_status", description="Get status, progress and throughput of background upload jobs (default: all jobs)", input_schema=upload_status_request_schema)
+@instrument_tool
+async def get_upload_status(args: dict):
+    """Get the status of background upload jobs."""
+    try:
+        request = UploadStatusRequest(**args)
+        upload_job_service = await services.upload_job_service()
+        jobs = upload_job_service.get_jobs(request.job_ids)
+        return {
+            "success": True,
+            "jobs": [job.to_dict() for job in jobs]
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@tool(name="wait_uploads", description="Wait until background upload jobs finish (default: all unfinished jobs) or timeout_seconds passes", input_schema=upload_status_request_schema)
+@instrument_tool
+async def wait_uploads(args: dict):
+    """Wait for background upload jobs to finish."""
+    try:
+        request = UploadStatusRequest(**args)
+        upload_job_service = await services.upload_job_service()
+        jobs = await upload_job_service.wait(request.job_ids, request.timeout_seconds)
+        return {
+            "success": all(job.status == "succeeded" for job in jobs),
+            "all_finished": all(job.finished for job in jobs),
+            "jobs": [job.to_dict() for job in jobs]
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 # Create MCP server with tools
 aitimes_db_mcp_server = create_sdk_mcp_server(
     name="aitimes-db-mcp",
     version="1.0.0",
-    tools=[create_article, get_article, update_article, list_articles, delete_article, upload_video]
+    tools=[
+        create_article,
+        create_articles,
+        get_article,
+        update_article,
+        list_articles,
+        delete_article,
+        upload_video,
+        get_upload_status,
+        wait_uploads
+    ]
 )
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""In-process read-through cache for articles."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from ..domain.models import Article
+
+
+class ArticleCache:
+    """LRU cache of articles by ID with a TTL and a size bound.
+
+    Entries expire ttl_seconds after they were stored; once max_size entries
+    are cached the least recently used one is evicted. A max_size of 0
+    disables caching.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize article cache."""
+        self.max_size = max_size if max_size is not None else int(os.getenv("ARTICLE_CACHE_SIZE", "1024"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("ARTICLE_CACHE_TTL_SECONDS", "300"))
+
+        if self.max_size < 0:
+            raise ValueError("Cache size must be non-negative")
+        if self.ttl_seconds <= 0:
+            raise ValueError("Cache TTL must be positive")
+
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Article]]" = OrderedDict()
+        # Invalidations may come from a change stream thread
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, article_id: str) -> Optional[Article]:
+        """Get a cached article, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(article_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, article = entry
+            if expires_at <= self._clock():
+                del self._entries[article_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(article_id)
+            self.hits += 1
+            return article
+
+    def put(self, article: Article) -> None:
+        """Store an article, evicting the least recently used one if full."""
+        if self.max_size == 0:
+            return
+
+        with self._lock:
+            self._entries[article.id] = (self._clock() + self.ttl_seconds, article)
+            self._entries.move_to_end(article.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, article_id: str) -> None:
+        """Drop an article from the cache."""
+        with self._lock:
+            if self._entries.pop(article_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached article."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -1,24 +1,53 @@
 """Article service that handles image upload and article creation."""
 
-from ..domain.models import Article, ArticleCreationInput, ArticleCreationRequest
-from ..Infrastructure.article_repository import ArticleRepository
-from .image_upload_service import FileUploadService
+import asyncio
+import concurrent.futures
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..domain.models import Article, ArticleCreationInput, ArticleCreationRequest, ArticleCreationResult, ArticlePage
+from ..Infrastructure.article_repository import ArticleRepository, ArticleVersionConflictError
+from ..Infrastructure.supabase_storage import ProgressCallback
+from .article_cache import ArticleCache
+from .image_upload_service import FileUploadService, RenditionUploadError
 
 
 class ArticleService:
     """Service for handling article creation with image and video upload."""
 
-    def __init__(self, article_repository: ArticleRepository, file_service: FileUploadService):
-        """Initialize article service."""
+    def __init__(
+        self,
+        article_repository: ArticleRepository,
+        file_service: FileUploadService,
+        article_cache: Optional[ArticleCache] = None,
+        watch_cache_invalidations: Optional[bool] = None,
+    ):
+        """
+        Initialize article service.
+
+        Args:
+            article_repository: Repository for article documents
+            file_service: Service for Supabase uploads
+            article_cache: Read-through cache for get_article (default: from environment)
+            watch_cache_invalidations: Also invalidate the cache from a MongoDB change
+                stream, for writes made by other processes (default: ARTICLE_CACHE_WATCH)
+        """
         self.article_repository = article_repository
         self.file_service = file_service
+        self.article_cache = article_cache or ArticleCache()
+        if watch_cache_invalidations is None:
+            watch_cache_invalidations = os.getenv("ARTICLE_CACHE_WATCH", "").lower() in ("1", "true", "yes")
+        self.watch_cache_invalidations = watch_cache_invalidations
+        self._cache_watcher: Optional[asyncio.Task] = None
 
-    async def create_article_with_upload(self, request: ArticleCreationRequest) -> Article:
+    async def create_article_with_upload(self, request: ArticleCreationRequest, progress: Optional[ProgressCallback] = None) -> Article:
         """
         Create an article by uploading files to Supabase first.
 
         Args:
             request: Article creation request with local file paths
+            progress: Called with the number of bytes sent after each upload chunk
 
         Returns:
             Created article with Supabase URLs
@@ -28,53 +57,19 @@ class ArticleService:
             ValueError: If validation fails
             RuntimeError: If upload or creation fails
         """
-        # Validate input
-        if not request.id or not request.id.strip():
-            raise ValueError("Article ID is required")
-        if not request.title or not request.title.strip():
-            raise ValueError("Article title is required")
-        if not request.subtitle or not request.subtitle.strip():
-            raise ValueError("Article subtitle is required")
-
-        # Validate thumbnail image
-        if not self.file_service.validate_image_path(request.thumbnail_image_path):
-            raise ValueError(f"Invalid image path or format: {request.thumbnail_image_path}")
+        self.validate_creation_request(request)
 
-        if not self.file_service.validate_image_size(request.thumbnail_image_path):
-            raise ValueError("Image file is too large (max 10MB)")
-
-        # Upload thumbnail image to Supabase
-        try:
-            thumbnail_url = self.file_service.upload_thumbnail_image(
-                request.thumbnail_image_path,
-                request.id
-            )
-        except Exception as e:
-            raise RuntimeError(f"Failed to upload thumbnail image: {str(e)}")
+        # Files are content-addressed per article, so a retried create would upload
+        # nothing new and its rollback could delete the existing article's files
+        if await self._find_article(request.id):
+            raise ValueError(f"Article with id '{request.id}' already exists")
 
-        # Upload video if provided
-        video_url = None
-        if request.video_file_path:
-            # Validate video
-            if not self.file_service.validate_video_path(request.video_file_path):
-                # Clean up thumbnail if video validation fails
-                self.file_service.delete_thumbnail_image(thumbnail_url)
-                raise ValueError(f"Invalid video path or format: {request.video_file_path}")
-
-            if not self.file_service.validate_video_size(request.video_file_path):
-                # Clean up thumbnail if video validation fails
-                self.file_service.delete_thumbnail_image(thumbnail_url)
-                raise ValueError("Video file is too large (max 100MB)")
-
-            try:
-                video_url = self.file_service.upload_video_file(
-                    request.video_file_path,
-                    request.id
-                )
-            except Exception as e:
-                # Clean up thumbnail if video upload fails
-                self.file_service.delete_thumbnail_image(thumbnail_url)
-                raise RuntimeError(f"Failed to upload video file: {str(e)}")
+        # Upload thumbnail and optional video to Supabase concurrently
+        uploaded = await self._upload_files(
+            request.id, request.thumbnail_image_path, request.video_file_path, progress=progress, renditions=request.renditions
+        )
+        thumbnail_url = uploaded["thumbnail_image_url"]
+        video_url = uploaded.get("video_file_url")
 
         # Create article with uploaded URLs
         article_input = ArticleCreationInput(
@@ -82,47 +77,275 @@ class ArticleService:
             thumbnail_image_url=thumbnail_url,
             video_file_url=video_url,
             title=request.title,
-            subtitle=request.subtitle
+            subtitle=request.subtitle,
+            thumbnail_renditions=uploaded.get("thumbnail_renditions")
         )
 
         try:
-            return await self.article_repository.create_article(article_input)
+            article = await self.article_repository.create_article(article_input)
+            self.article_cache.put(article)
+            return article
         except Exception as e:
             # Try to clean up uploaded files if article creation fails
-            self.file_service.delete_thumbnail_image(thumbnail_url)
-            if video_url:
-                self.file_service.delete_video_file(video_url)
+            await self._delete_files_of_failed_create(request.id, uploaded)
             raise RuntimeError(f"Failed to create article: {str(e)}")
 
+    async def create_articles_with_upload(
+        self,
+        requests: List[ArticleCreationRequest],
+        max_concurrency: int = 4,
+    ) -> List[ArticleCreationResult]:
+        """
+        Create many articles with one batched insert.
+
+        The whole batch is validated first, then every thumbnail and video is
+        uploaded concurrently (at most max_concurrency at a time) and all
+        uploaded articles are written with a single unordered insert_many.
+        Uploads of items that fail are cleaned up; other items are unaffected.
+        If insert_many fails without per-document errors, the batch is looked
+        up again and only the articles that were really not written fail.
+
+        Args:
+            requests: Article creation requests with local file paths
+            max_concurrency: Maximum number of concurrent uploads
+
+        Returns:
+            One result per request, in request order
+
+        Raises:
+            ValueError: If max_concurrency is not positive
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        errors: Dict[int, str] = {}
+        seen_ids = set()
+        for index, request in enumerate(requests):
+            try:
+                self.validate_creation_request(request)
+                if request.id in seen_ids:
+                    raise ValueError(f"Duplicate article ID in batch: {request.id}")
+                seen_ids.add(request.id)
+            except ValueError as e:
+                errors[index] = str(e)
+
+        # Reject existing IDs before uploading anything for them
+        existing_ids = await self.article_repository.find_existing_ids(
+            [request.id for index, request in enumerate(requests) if index not in errors]
+        )
+        for index, request in enumerate(requests):
+            if index not in errors and request.id in existing_ids:
+                errors[index] = f"Article with id '{request.id}' already exists"
+
+        # Upload every file of every valid request, bounded by the semaphore
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def upload(upload_func, local_path: str, article_id: str) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(upload_func, local_path, article_id)
+
+        jobs = []
+        for index, request in enumerate(requests):
+            if index in errors:
+                continue
+            jobs.append((index, "thumbnail_image_url", self.file_service.upload_thumbnail_image, request.thumbnail_image_path))
+            if request.renditions:
+                jobs.append((index, "thumbnail_renditions", self.file_service.upload_thumbnail_renditions, request.thumbnail_image_path))
+            if request.video_file_path:
+                jobs.append((index, "video_file_url", self.file_service.upload_video_file, request.video_file_path))
+
+        outcomes = await asyncio.gather(
+            *(upload(upload_func, local_path, requests[index].id) for index, _, upload_func, local_path in jobs),
+            return_exceptions=True
+        )
+
+        uploads: Dict[int, dict] = {}
+        for (index, field_name, _, _), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                errors.setdefault(index, f"Failed to upload {field_name.removesuffix('_url').replace('_', ' ')}: {str(outcome)}")
+                partial = self._partial_uploads(outcome)
+                if partial:
+                    uploads.setdefault(index, {}).update(partial)
+            else:
+                uploads.setdefault(index, {})[field_name] = outcome
+
+        for index in list(uploads):
+            if index in errors:
+                await self._delete_files_of_failed_create(requests[index].id, uploads.pop(index))
+
+        # Write all fully uploaded articles at once
+        article_inputs = [
+            ArticleCreationInput(
+                id=requests[index].id,
+                thumbnail_image_url=urls["thumbnail_image_url"],
+                video_file_url=urls.get("video_file_url"),
+                title=requests[index].title,
+                subtitle=requests[index].subtitle,
+                thumbnail_renditions=urls.get("thumbnail_renditions")
+            )
+            for index, urls in uploads.items()
+        ]
+        created: Dict[str, Article] = {}
+        if article_inputs:
+            kept_ids = set()
+            try:
+                created, insert_errors = await self.article_repository.create_articles(article_inputs)
+            except Exception as e:
+                # A timeout or reconnect can arrive after the server applied some
+                # or all of the inserts: only what is really missing may lose its files
+                created, insert_errors, kept_ids = await self._resolve_failed_insert(article_inputs, e)
+
+            for article in created.values():
+                self.article_cache.put(article)
+
+            for index, urls in uploads.items():
+                article_id = requests[index].id
+                if article_id in insert_errors:
+                    errors[index] = f"Failed to create article: {insert_errors[article_id]}"
+                    if article_id not in kept_ids:
+                        await self._delete_files_of_failed_create(article_id, urls)
+
+        return [
+            ArticleCreationResult(id=request.id, error=errors[index])
+            if index in errors
+            else ArticleCreationResult(id=request.id, article=created[request.id])
+            for index, request in enumerate(requests)
+        ]
+
+    async def _resolve_failed_insert(
+        self, article_inputs: List[ArticleCreationInput], error: Exception
+    ) -> Tuple[Dict[str, Article], Dict[str, str], set]:
+        """
+        Find out which articles of an insert_many that raised were written anyway.
+
+        An article counts as created if a document with its id now exists and
+        references the files uploaded for it (not those of a concurrent creator).
+
+        Args:
+            article_inputs: The articles of the failed insert
+            error: What insert_many raised
+
+        Returns:
+            Created articles by id, error messages by id, and the ids whose
+            outcome is unknown (their files must be kept; reconcile_storage
+            removes them if they turn out to be orphaned)
+        """
+        ids = [article_input.id for article_input in article_inputs]
+        try:
+            existing_ids = await self.article_repository.find_existing_ids(ids)
+            created: Dict[str, Article] = {}
+            for article_input in article_inputs:
+                if article_input.id in existing_ids:
+                    article = await self.article_repository.get_article_by_id(article_input.id)
+                    if article and article.thumbnail_image_url == article_input.thumbnail_image_url:
+                        created[article.id] = article
+        except Exception as check_error:
+            print(f"Could not check which articles were inserted, keeping their files: {str(check_error)}")
+            message = f"{str(error)} (outcome unknown, uploaded files kept)"
+            return {}, {article_id: message for article_id in ids}, set(ids)
+
+        insert_errors = {article_id: str(error) for article_id in ids if article_id not in created}
+        return created, insert_errors, set()
+
+    async def _delete_files_of_failed_create(self, article_id: str, uploaded: dict) -> None:
+        """
+        Queue the files uploaded for a create that failed, except those the
+        article now stored under its id references.
+
+        A concurrent create of the same id uploads identical files to the same
+        content-addressed paths, so after a duplicate-key error some of the
+        uploaded paths may be the other article's live files.
+
+        Args:
+            article_id: ID of the article that was not created
+            uploaded: Uploaded URLs by article field
+        """
+        try:
+            existing_article = await self.article_repository.get_article_by_id(article_id)
+        except Exception as e:
+            # reconcile_storage removes them if nothing references them
+            print(f"Could not look up article {article_id}, keeping its uploaded files: {str(e)}")
+            return
+        self._delete_uploaded_files(uploaded, existing_article)
+
+    def validate_creation_request(self, request: ArticleCreationRequest) -> None:
+        """Validate an article creation request and its local files."""
+        if not request.id or not request.id.strip():
+            raise ValueError("Article ID is required")
+        if not request.title or not request.title.strip():
+            raise ValueError("Article title is required")
+        if not request.subtitle or not request.subtitle.strip():
+            raise ValueError("Article subtitle is required")
+
+        # Validate thumbnail image and video if provided (by content, memoized per file)
+        self.file_service.validate_image_file(request.thumbnail_image_path)
+        if request.video_file_path:
+            self.file_service.validate_video_file(request.video_file_path)
+
     async def get_article(self, article_id: str) -> Article:
         """Get an article by ID."""
         if not article_id or not article_id.strip():
             raise ValueError("Article ID is required")
 
-        article = await self.article_repository.get_article_by_id(article_id)
+        article = await self._find_article(article_id)
         if not article:
             raise ValueError(f"Article not found: {article_id}")
 
         return article
 
-    async def delete_article(self, article_id: str) -> bool:
-        """Delete an article and its thumbnail image."""
-        # Get article first to get image URL
-        try:
-            article = await self.get_article(article_id)
-        except ValueError:
-            return False  # Article doesn't exist
+    async def _find_article(self, article_id: str) -> Optional[Article]:
+        """Get an article through the cache, or None if it does not exist."""
+        self.start_cache_watcher()
+        article = self.article_cache.get(article_id)
+        if article:
+            return article
+
+        article = await self.article_repository.get_article_by_id(article_id)
+        if article:
+            self.article_cache.put(article)
+        return article
 
-        # Delete from database
-        deleted = await self.article_repository.delete_article(article_id)
+    def cache_stats(self) -> dict:
+        """Get hit/miss counters of the article cache."""
+        return {**self.article_cache.stats(), "watching_changes": self._cache_watcher is not None and not self._cache_watcher.done()}
 
-        if deleted:
-            # Try to delete files from Supabase (best effort)
-            self.file_service.delete_thumbnail_image(article.thumbnail_image_url)
-            if article.video_file_url:
-                self.file_service.delete_video_file(article.video_file_url)
+    def start_cache_watcher(self) -> None:
+        """
+        Start the change stream watcher if enabled and not already running.
 
-        return deleted
+        Reads start it on first use; call this to start it earlier, e.g. at warmup.
+        """
+        if not self.watch_cache_invalidations:
+            return
+        if self._cache_watcher is None or self._cache_watcher.done():
+            self._cache_watcher = asyncio.create_task(self._watch_cache_invalidations())
+
+    async def _watch_cache_invalidations(self) -> None:
+        """Invalidate cached articles written by other processes."""
+        try:
+            async for article_id in self.article_repository.watch_article_changes():
+                if article_id is None:
+                    self.article_cache.clear()
+                else:
+                    self.article_cache.invalidate(article_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without the watcher, entries still expire after the TTL
+            print(f"Article cache change stream stopped: {str(e)}")
+            self.article_cache.clear()
+
+    async def delete_article(self, article_id: str) -> bool:
+        """Delete an article and queue its thumbnail and video for deletion."""
+        # One round-trip: the deleted document tells which files to remove
+        article = await self.article_repository.find_and_delete_article(article_id)
+        self.article_cache.invalidate(article_id)
+        if article is None:
+            return False  # Article doesn't exist
+
+        # Files are removed in the background (best effort, retried)
+        self._delete_uploaded_files(article.to_dict())
+        return True
 
     async def list_articles(self, limit: int = 100, offset: int = 0) -> list[Article]:
         """List articles with pagination."""
@@ -133,75 +356,216 @@ class ArticleService:
 
         return await self.article_repository.list_articles(limit, offset)
 
+    async def list_articles_page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        projection: Optional[dict] = None,
+    ) -> ArticlePage:
+        """List one page of article documents, continuing from an opaque cursor if given."""
+        if limit <= 0 or limit > 1000:
+            raise ValueError("Limit must be between 1 and 1000")
+        if offset < 0:
+            raise ValueError("Offset must be non-negative")
+        if cursor and offset:
+            raise ValueError("Offset cannot be combined with cursor")
+
+        return await self.article_repository.list_articles_page(limit, offset, cursor, include_total, projection)
+
     async def update_article(self, article_id: str, update_data: dict) -> Article:
-        """Update an article with new data."""
+        """
+        Update an article with new data in a single atomic write.
+
+        Text-only updates cost one round-trip. Replacing files first reads the
+        article to know which files to clean up, and guards the write with the
+        updated_at it read, so concurrent edits are rejected instead of lost.
+
+        Args:
+            article_id: ID of the article to update
+            update_data: New title/subtitle, local file paths to upload, and an
+                optional expected_updated_at (ISO) for optimistic concurrency
+
+        Returns:
+            Updated article
+
+        Raises:
+            ValueError: If validation fails, the article does not exist or it
+                was modified since expected_updated_at
+            RuntimeError: If upload or update fails
+        """
         if not article_id or not article_id.strip():
             raise ValueError("Article ID is required")
 
-        # Get existing article first
-        existing_article = await self.get_article(article_id)
+        expected_updated_at = self._parse_timestamp(update_data.get("expected_updated_at"))
+        thumbnail_path = update_data.get("thumbnail_image_path")
+        video_path = update_data.get("video_file_path")
+        changes = {
+            name: update_data[name]
+            for name in ("title", "subtitle")
+            if update_data.get(name) is not None
+        }
+
+        # Validate new files before touching anything
+        if thumbnail_path:
+            self.file_service.validate_image_file(thumbnail_path)
+        if video_path:
+            self.file_service.validate_video_file(video_path)
+
+        # Replaced files must be known to delete them after the update
+        existing_article = None
+        if thumbnail_path or video_path:
+            existing_article = await self.get_article(article_id)
+            if expected_updated_at is None:
+                expected_updated_at = existing_article.updated_at
+            elif existing_article.updated_at != expected_updated_at:
+                raise ArticleVersionConflictError(
+                    f"Article '{article_id}' was modified by someone else since {expected_updated_at.isoformat()}"
+                )
 
-        # Handle file uploads if new paths are provided
-        thumbnail_url = existing_article.thumbnail_image_url
-        video_url = existing_article.video_file_url
+        # Upload new files concurrently; renditions of a replaced thumbnail would be stale
+        if thumbnail_path or video_path:
+            renditions = bool(thumbnail_path) and bool(update_data.get("renditions") or existing_article.thumbnail_renditions)
+            changes.update(await self._upload_files(
+                article_id, thumbnail_path, video_path, keep=existing_article, renditions=renditions
+            ))
 
-        # Upload new thumbnail if provided
-        if update_data.get("thumbnail_image_path"):
-            if not self.file_service.validate_image_path(update_data["thumbnail_image_path"]):
-                raise ValueError(f"Invalid image path or format: {update_data['thumbnail_image_path']}")
+        try:
+            article = await self.article_repository.update_article(article_id, changes, expected_updated_at)
+        except ArticleVersionConflictError:
+            self.article_cache.invalidate(article_id)
+            self._delete_uploaded_files(changes, keep=existing_article)
+            raise
+        except Exception as e:
+            self.article_cache.invalidate(article_id)
+            self._delete_uploaded_files(changes, keep=existing_article)
+            raise RuntimeError(f"Failed to update article: {str(e)}")
 
-            if not self.file_service.validate_image_size(update_data["thumbnail_image_path"]):
-                raise ValueError("Image file is too large (max 10MB)")
+        if article is None:
+            self.article_cache.invalidate(article_id)
+            self._delete_uploaded_files(changes, keep=existing_article)
+            raise ValueError(f"Article not found: {article_id}")
 
-            try:
-                new_thumbnail_url = self.file_service.upload_thumbnail_image(
-                    update_data["thumbnail_image_path"],
-                    article_id
-                )
-                # Delete old thumbnail
-                self.file_service.delete_thumbnail_image(thumbnail_url)
-                thumbnail_url = new_thumbnail_url
-            except Exception as e:
-                raise RuntimeError(f"Failed to upload new thumbnail: {str(e)}")
+        self.article_cache.put(article)
 
-        # Upload new video if provided
-        if update_data.get("video_file_path"):
-            if not self.file_service.validate_video_path(update_data["video_file_path"]):
-                raise ValueError(f"Invalid video path or format: {update_data['video_file_path']}")
+        # Delete replaced files only once the article points at the new ones (best effort);
+        # identical content maps to the same URL and must be kept
+        if existing_article:
+            replaced = {
+                field_name: getattr(existing_article, field_name)
+                for field_name in ("thumbnail_image_url", "video_file_url", "thumbnail_renditions")
+                if field_name in changes
+            }
+            self._delete_uploaded_files(replaced, keep=article)
 
-            if not self.file_service.validate_video_size(update_data["video_file_path"]):
-                raise ValueError("Video file is too large (max 100MB)")
+        return article
 
-            try:
-                new_video_url = self.file_service.upload_video_file(
-                    update_data["video_file_path"],
-                    article_id
-                )
-                # Delete old video if it exists
-                if video_url:
-                    self.file_service.delete_video_file(video_url)
-                video_url = new_video_url
-            except Exception as e:
-                raise RuntimeError(f"Failed to upload new video: {str(e)}")
+    async def _upload_files(
+        self,
+        article_id: str,
+        thumbnail_path: Optional[str] = None,
+        video_path: Optional[str] = None,
+        keep: Optional[Article] = None,
+        progress: Optional[ProgressCallback] = None,
+        renditions: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Upload a thumbnail and/or video concurrently, off the event loop.
 
-        # Create update input with new URLs
-        from ..domain.models import ArticleUpdateInput, ArticleCreationInput
+        The first failure (or cancellation of the caller) abandons the other
+        upload right away: it is cancelled if it has not started yet, and
+        otherwise deleted in the background as soon as it finishes.
 
-        # Create a new article input with updated data
-        updated_article_input = ArticleCreationInput(
-            id=article_id,
-            thumbnail_image_url=thumbnail_url,
-            title=update_data.get("title", existing_article.title),
-            subtitle=update_data.get("subtitle", existing_article.subtitle),
-            video_file_url=video_url
-        )
+        Args:
+            article_id: Article ID for organizing files
+            thumbnail_path: Local thumbnail image path, if any
+            video_path: Local video file path, if any
+            keep: Article whose files must survive a rollback (identical
+                content uploads to the same URL)
+            progress: Called with the number of bytes sent after each chunk
+            renditions: Also render and upload renditions of the thumbnail
+
+        Returns:
+            Public URLs keyed by article field ("thumbnail_image_url", "video_file_url",
+            and "thumbnail_renditions" with URLs by rendition)
 
-        # For now, we'll recreate the article since we don't have an update method in repository
-        # In a real implementation, you'd want to add an update method to the repository
+        Raises:
+            RuntimeError: If an upload fails
+        """
+        uploads = {}
+        if thumbnail_path:
+            uploads["thumbnail_image_url"] = self.file_service.submit(self.file_service.upload_thumbnail_image, thumbnail_path, article_id, progress)
+            if renditions:
+                uploads["thumbnail_renditions"] = self.file_service.submit(self.file_service.upload_thumbnail_renditions, thumbnail_path, article_id)
+        if video_path:
+            uploads["video_file_url"] = self.file_service.submit(self.file_service.upload_video_file, video_path, article_id, progress)
+
+        waiters = {asyncio.wrap_future(future): field_name for field_name, future in uploads.items()}
         try:
-            # Delete the old article
-            await self.article_repository.delete_article(article_id)
-            # Create with updated data
-            return await self.article_repository.create_article(updated_article_input)
-        except Exception as e:
-            raise RuntimeError(f"Failed to update article: {str(e)}")
\ No newline at end of file
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            self._abandon_uploads(uploads, waiters, keep)
+            raise
+
+        failed = next((waiter for waiter in done if waiter.exception() is not None), None)
+        if failed is not None:
+            self._abandon_uploads(uploads, waiters, keep)
+            label = waiters[failed].removesuffix("_url").replace("_", " ")
+            raise RuntimeError(f"Failed to upload {label}: {str(failed.exception())}")
+
+        return {field_name: future.result() for field_name, future in uploads.items()}
+
+    def _abandon_uploads(
+        self,
+        uploads: Dict[str, concurrent.futures.Future],
+        waiters: Dict[asyncio.Future, str],
+        keep: Optional[Article] = None,
+    ) -> None:
+        """Cancel or roll back uploads (and what failed ones left behind) without waiting for running ones to finish."""
+        for waiter in waiters:
+            # Results of abandoned uploads are handled below, not by the waiters
+            waiter.add_done_callback(lambda w: w.cancelled() or w.exception())
+
+        for field_name, future in uploads.items():
+            if future.cancel():
+                continue
+            future.add_done_callback(
+                lambda f, field_name=field_name: None
+                if f.cancelled()
+                else self._delete_uploaded_files(
+                    self._partial_uploads(f.exception()) if f.exception() is not None else {field_name: f.result()}, keep
+                )
+            )
+
+    @staticmethod
+    def _partial_uploads(error: BaseException) -> dict:
+        """Files a failed upload left behind, by article field (renditions uploaded before the failure)."""
+        if isinstance(error, RenditionUploadError) and error.uploaded:
+            return {"thumbnail_renditions": error.uploaded}
+        return {}
+
+    def _delete_uploaded_files(self, changes: dict, keep: Optional[Article] = None) -> None:
+        """Queue uploaded files for deletion by article field, except those keep still uses."""
+        public_urls = [
+            url
+            for field_name in ("thumbnail_image_url", "video_file_url")
+            if (url := changes.get(field_name)) and url != getattr(keep, field_name, None)
+        ]
+        kept_renditions = set((getattr(keep, "thumbnail_renditions", None) or {}).values())
+        public_urls.extend(url for url in (changes.get("thumbnail_renditions") or {}).values() if url not in kept_renditions)
+        if public_urls:
+            self.file_service.schedule_file_deletion(public_urls)
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO timestamp into the naive UTC datetime stored by MongoDB."""
+        if not value:
+            return None
+        try:
+            timestamp = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value}")
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
@@ -0,0 +1,171 @@
+"""Thumbnail renditions: resized, efficiently encoded variants of one source image."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+from ..domain.models import RenditionSpec
+
+# Name, largest size, and how the source fits it: a square crop of a 16:9
+# thumbnail would cut off its design, so 1x1 is letterboxed
+RENDITION_SIZES = (
+    ("1x1", 1600, 1600, "pad"),
+    ("16x9", 1920, 1080, "crop"),
+    ("16x9_small", 960, 540, "crop"),
+)
+
+RENDITION_FITS = ("crop", "pad")
+
+# Quality per encoder, tuned for photos and text-heavy thumbnails alike
+RENDITION_QUALITY = {"webp": 80, "avif": 60}
+
+
+def default_rendition_specs(formats: Optional[List[str]] = None) -> List[RenditionSpec]:
+    """
+    Build the default renditions for the given formats.
+
+    Args:
+        formats: Encodings to produce (default: THUMBNAIL_RENDITION_FORMATS or
+            "webp,avif"); formats this Pillow build cannot encode are skipped
+
+    Returns:
+        One spec per size and format
+    """
+    if formats is None:
+        formats = [name.strip().lower() for name in os.getenv("THUMBNAIL_RENDITION_FORMATS", "webp,avif").split(",") if name.strip()]
+
+    unknown = [name for name in formats if name not in RENDITION_QUALITY]
+    if unknown:
+        raise ValueError(f"Unsupported rendition formats: {', '.join(unknown)} (expected {', '.join(RENDITION_QUALITY)})")
+
+    supported = [name for name in formats if features.check(name)]
+    return [
+        RenditionSpec(name=name, width=width, height=height, format=image_format, quality=RENDITION_QUALITY[image_format], fit=fit)
+        for name, width, height, fit in RENDITION_SIZES
+        for image_format in supported
+    ]
+
+
+def rendition_size(source_size: Tuple[int, int], spec: RenditionSpec) -> Tuple[int, int]:
+    """
+    Output size of a rendition: the spec's size, shrunk with its aspect ratio
+    kept when reaching it would upscale the source.
+
+    Args:
+        source_size: (width, height) of the source
+        spec: Rendition to produce
+
+    Returns:
+        (width, height) of the output
+    """
+    if spec.fit not in RENDITION_FITS:
+        raise ValueError(f"Unsupported rendition fit: {spec.fit} (expected one of {RENDITION_FITS})")
+    width_scale, height_scale = spec.width / source_size[0], spec.height / source_size[1]
+    # Crop scales the source to cover the size, pad to fit inside it
+    scale = max(width_scale, height_scale) if spec.fit == "crop" else min(width_scale, height_scale)
+    if scale <= 1:
+        return spec.width, spec.height
+    return max(1, round(spec.width / scale)), max(1, round(spec.height / scale))
+
+
+def render_rendition(source_path: str, spec: RenditionSpec, output_path: str) -> str:
+    """
+    Resize and encode one rendition (runs in a worker process).
+
+    With fit "crop" the source is scaled to cover the size and center-cropped;
+    with "pad" it is scaled to fit inside and centered on a transparent (or,
+    without alpha, black) background. The source is never upscaled: see
+    rendition_size().
+
+    Returns:
+        output_path
+    """
+    with Image.open(source_path) as source:
+        # JPEG sources decode at a reduced scale when that still covers the target
+        source.draft("RGB", (spec.width, spec.height))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        size = rendition_size(image.size, spec)
+        if spec.fit == "crop":
+            image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+        else:
+            background = (0, 0, 0, 0) if image.mode == "RGBA" else (0, 0, 0)
+            image = ImageOps.pad(image, size, Image.Resampling.LANCZOS, color=background)
+
+        if spec.format == "webp":
+            image.save(output_path, "WEBP", quality=spec.quality, method=4)
+        else:
+            image.save(output_path, "AVIF", quality=spec.quality, speed=6)
+    return output_path
+
+
+class ImageRenditionService:
+    """Renders thumbnail renditions in parallel on a process pool.
+
+    Resizing and encoding are CPU-bound, so each rendition runs in its own
+    worker process. The pool is started on first use, with forkserver (or
+    spawn) workers so none is forked from the threaded parent.
+    """
+
+    def __init__(self, specs: Optional[List[RenditionSpec]] = None, max_workers: Optional[int] = None):
+        """
+        Initialize rendition service.
+
+        Args:
+            specs: Renditions to produce (default: default_rendition_specs())
+            max_workers: Number of worker processes (default: RENDITION_MAX_WORKERS
+                or the number of CPUs)
+        """
+        self.specs = specs if specs is not None else default_rendition_specs()
+        self.max_workers = max_workers or int(os.getenv("RENDITION_MAX_WORKERS", "0")) or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # render() is called from several upload threads
+        self._lock = threading.Lock()
+
+    def render(self, source_path: str, output_dir: str) -> Iterator[Tuple[RenditionSpec, str]]:
+        """
+        Render every rendition of source_path into output_dir in parallel.
+
+        Args:
+            source_path: Local source image
+            output_dir: Directory for the rendered files
+
+        Yields:
+            Each spec with the path of its rendered file, as soon as it is done
+
+        Raises:
+            Exception: Whatever rendering a rendition raised
+        """
+        with self._lock:
+            if self._executor is None:
+                # Not fork: the pool is started from an upload thread while the
+                # upload pool, deletion worker, exporters and PyMongo monitors
+                # are running, and forking a threaded process can deadlock the child
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context(start_method)
+                )
+
+        futures: Dict[Future, RenditionSpec] = {
+            self._executor.submit(
+                render_rendition, source_path, spec, os.path.join(output_dir, f"{spec.key}.{spec.format}")
+            ): spec
+            for spec in self.specs
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
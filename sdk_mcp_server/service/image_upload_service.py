@@ -1,25 +1,84 @@
 """File upload service that integrates local paths with Supabase storage for images and videos."""
 
+import contextvars
 import os
-from typing import Optional
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
-from ..Infrastructure.supabase_storage import SupabaseStorageClient
+from ..Infrastructure.file_probe import content_matches_extension
+from ..Infrastructure.supabase_storage import ProgressCallback, SupabaseStorageClient
+from .image_rendition_service import ImageRenditionService
+
+
+class RenditionUploadError(RuntimeError):
+    """Raised when rendering or uploading a rendition fails, with the renditions uploaded before."""
+
+    def __init__(self, message: str, uploaded: Dict[str, str]):
+        super().__init__(message)
+        self.uploaded = uploaded  # Public URLs by rendition key; the caller decides what to roll back
 
 
 class FileUploadService:
     """Service for handling file uploads (images and videos) to Supabase storage."""
 
-    def __init__(self, supabase_client: Optional[SupabaseStorageClient] = None):
-        """Initialize file upload service."""
+    def __init__(
+        self,
+        supabase_client: Optional[SupabaseStorageClient] = None,
+        max_workers: Optional[int] = None,
+        delete_batch_size: Optional[int] = None,
+        rendition_service: Optional[ImageRenditionService] = None,
+    ):
+        """
+        Initialize file upload service.
+
+        Args:
+            supabase_client: Supabase storage client (default: configured from environment)
+            max_workers: Number of threads running blocking uploads and deletions
+                submitted with submit() (default: UPLOAD_MAX_WORKERS or 8)
+            delete_batch_size: Most files removed per storage request by the deletion
+                worker (default: SUPABASE_DELETE_BATCH_SIZE or 100)
+            rendition_service: Renders thumbnail renditions (default: created on first use)
+        """
         self.supabase_client = supabase_client or SupabaseStorageClient()
+        # Shared with the storage client so validation and upload probe each file once
+        self.file_probe = self.supabase_client.file_probe
+        self.max_workers = max_workers or int(os.getenv("UPLOAD_MAX_WORKERS", "8"))
+        self.delete_batch_size = delete_batch_size or int(os.getenv("SUPABASE_DELETE_BATCH_SIZE", "100"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="supabase-upload")
+        self._rendition_service = rendition_service
+        self._rendition_service_lock = threading.Lock()
+
+        self._deletion_wakeup = threading.Event()
+        self._deletion_worker: Optional[threading.Thread] = None
+        self._deletion_worker_lock = threading.Lock()
+        # Deletions queued by an earlier process are still pending
+        if self.supabase_client.deletion_queue.pending_count():
+            self._ensure_deletion_worker()
+
+    def submit(self, func: Callable, *args) -> Future:
+        """
+        Run a blocking file operation on the upload worker threads.
 
-    def upload_thumbnail_image(self, local_path: str, article_id: str) -> str:
+        Args:
+            func: Blocking callable, e.g. upload_thumbnail_image
+            *args: Arguments for func
+
+        Returns:
+            Future of the call, which can be cancelled until it starts
+        """
+        # Run in the caller's context so the call's spans nest under the caller's
+        return self._executor.submit(contextvars.copy_context().run, func, *args)
+
+    def upload_thumbnail_image(self, local_path: str, article_id: str, progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload a thumbnail image to Supabase storage.
 
         Args:
             local_path: Local file path to the image
             article_id: Article ID for organizing files
+            progress: Called with the number of bytes sent after each chunk
 
         Returns:
             Public URL of the uploaded image
@@ -29,27 +88,72 @@ class FileUploadService:
             ValueError: If the image format is unsupported
             RuntimeError: If upload fails
         """
-        if not os.path.exists(local_path):
+        if not self.file_exists(local_path):
             raise FileNotFoundError(f"Thumbnail image not found: {local_path}")
 
         # Use article_id as folder for better organization
         folder = f"thumbnails/{article_id}"
 
         try:
-            public_url = self.supabase_client.upload_image(local_path, folder)
+            public_url = self.supabase_client.upload_image(local_path, folder, progress)
             print(f"Successfully uploaded thumbnail: {local_path} -> {public_url}")
             return public_url
 
         except Exception as e:
             raise RuntimeError(f"Failed to upload thumbnail image: {str(e)}")
 
-    def upload_video_file(self, local_path: str, article_id: str) -> str:
+    def upload_thumbnail_renditions(self, local_path: str, article_id: str) -> Dict[str, str]:
+        """
+        Render resized WebP/AVIF renditions of a thumbnail and upload them.
+
+        Renditions are rendered in parallel worker processes; each one is
+        uploaded as soon as it is rendered.
+
+        Args:
+            local_path: Local file path to the source image
+            article_id: Article ID for organizing files
+
+        Returns:
+            Public URLs keyed by rendition (e.g. "1x1_webp")
+
+        Raises:
+            FileNotFoundError: If the local image file doesn't exist
+            RenditionUploadError: If rendering or upload fails
+        """
+        if not self.file_exists(local_path):
+            raise FileNotFoundError(f"Thumbnail image not found: {local_path}")
+
+        folder = f"thumbnails/{article_id}"
+        urls = {}
+        try:
+            with tempfile.TemporaryDirectory(prefix="renditions-") as output_dir:
+                for spec, rendition_path in self.rendition_service.render(local_path, output_dir):
+                    urls[spec.key] = self.supabase_client.upload_image(rendition_path, folder)
+        except Exception as e:
+            # Renditions uploaded before the failure may be shared with an existing
+            # article (same content, same URL): the caller, which knows that
+            # article, rolls them back
+            raise RenditionUploadError(f"Failed to upload thumbnail renditions: {str(e)}", urls)
+
+        print(f"Successfully uploaded {len(urls)} thumbnail renditions: {local_path}")
+        return urls
+
+    @property
+    def rendition_service(self) -> ImageRenditionService:
+        """Rendition service, created on first use."""
+        with self._rendition_service_lock:
+            if self._rendition_service is None:
+                self._rendition_service = ImageRenditionService()
+            return self._rendition_service
+
+    def upload_video_file(self, local_path: str, article_id: str, progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload a video file to Supabase storage.
 
         Args:
             local_path: Local file path to the video
             article_id: Article ID for organizing files
+            progress: Called with the number of bytes sent after each chunk
 
         Returns:
             Public URL of the uploaded video
@@ -59,14 +163,14 @@ class FileUploadService:
             ValueError: If the video format is unsupported
             RuntimeError: If upload fails
         """
-        if not os.path.exists(local_path):
+        if not self.file_exists(local_path):
             raise FileNotFoundError(f"Video file not found: {local_path}")
 
         # Use article_id as folder for better organization
         folder = f"videos/{article_id}"
 
         try:
-            public_url = self.supabase_client.upload_video(local_path, folder)
+            public_url = self.supabase_client.upload_video(local_path, folder, progress)
             print(f"Successfully uploaded video: {local_path} -> {public_url}")
             return public_url
 
@@ -107,27 +211,115 @@ class FileUploadService:
 
         return self.supabase_client.delete_video(storage_path)
 
-    def validate_image_path(self, local_path: str) -> bool:
+    def schedule_file_deletion(self, public_urls: List[str]) -> None:
         """
-        Validate that the image path exists and is a supported format.
+        Queue uploaded files for deletion without waiting for storage.
+
+        A background worker removes queued files in batches and retries failures
+        with backoff. The queue is stored on disk, so deletions pending at exit
+        are performed by the next process.
+
+        Args:
+            public_urls: Public URLs of the files to delete
+        """
+        storage_paths = []
+        for public_url in public_urls:
+            storage_path = self.supabase_client.extract_storage_path_from_url(public_url)
+            if not storage_path:
+                print(f"Could not extract storage path from URL: {public_url}")
+                continue
+            storage_paths.append(storage_path)
+
+        if storage_paths:
+            self.supabase_client.schedule_delete(storage_paths)
+            self._ensure_deletion_worker()
+            self._deletion_wakeup.set()
+
+    def pending_deletion_count(self) -> int:
+        """Number of files queued for deletion."""
+        return self.supabase_client.deletion_queue.pending_count()
+
+    def _ensure_deletion_worker(self) -> None:
+        """Start the deletion worker thread if it is not running."""
+        with self._deletion_worker_lock:
+            if self._deletion_worker is None or not self._deletion_worker.is_alive():
+                self._deletion_worker = threading.Thread(
+                    target=self._run_deletion_worker, name="supabase-delete", daemon=True
+                )
+                self._deletion_worker.start()
+
+    def _run_deletion_worker(self) -> None:
+        """Remove due files in batches until the queue is empty, then wait for more."""
+        queue = self.supabase_client.deletion_queue
+        while True:
+            storage_paths = queue.claim_due(self.delete_batch_size)
+            if not storage_paths:
+                self._deletion_wakeup.wait(min(queue.seconds_until_due(), 60.0))
+                self._deletion_wakeup.clear()
+                continue
+
+            try:
+                self.supabase_client.delete_files(storage_paths)
+                queue.complete(storage_paths)
+                print(f"🗑️ Deleted {len(storage_paths)} file(s) from Supabase")
+            except Exception as e:
+                dropped = queue.retry_later(storage_paths, str(e))
+                print(f"Error deleting {len(storage_paths)} file(s) from Supabase, will retry: {str(e)}")
+                if dropped:
+                    print(f"Gave up deleting {len(dropped)} file(s): {dropped}")
+
+    def validate_image_file(self, local_path: str, max_size_mb: float = 10.0) -> None:
+        """
+        Validate an image's format, content and size with a single probe.
 
         Args:
             local_path: Local file path to validate
+            max_size_mb: Maximum allowed size in MB
 
-        Returns:
-            True if valid, False otherwise
+        Raises:
+            ValueError: If the file is missing, not a supported image or too large
         """
-        if not os.path.exists(local_path):
-            return False
+        try:
+            file_info = self.file_probe.probe(local_path)
+        except FileNotFoundError:
+            raise ValueError(f"Invalid image path or format: {local_path}")
+        if not content_matches_extension(file_info, "image"):
+            raise ValueError(f"Invalid image path or format: {local_path} (content is {file_info.format or 'not an image'})")
+        if file_info.size > max_size_mb * 1024 * 1024:
+            raise ValueError(f"Image file is too large (max {max_size_mb:g}MB)")
+
+    def validate_video_file(self, local_path: str, max_size_mb: float = 100.0) -> None:
+        """
+        Validate a video's container, content and size with a single probe.
 
-        supported_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
-        file_extension = os.path.splitext(local_path)[1].lower()
+        Args:
+            local_path: Local file path to validate
+            max_size_mb: Maximum allowed size in MB
 
-        return file_extension in supported_extensions
+        Raises:
+            ValueError: If the file is missing, not a supported video or too large
+        """
+        try:
+            file_info = self.file_probe.probe(local_path)
+        except FileNotFoundError:
+            raise ValueError(f"Invalid video path or format: {local_path}")
+        if not content_matches_extension(file_info, "video"):
+            raise ValueError(f"Invalid video path or format: {local_path} (content is {file_info.format or 'not a video'})")
+        if file_info.size > max_size_mb * 1024 * 1024:
+            raise ValueError(f"Video file is too large (max {max_size_mb:g}MB)")
+
+    def file_exists(self, local_path: str) -> bool:
+        """Whether a local file exists (memoized probe; one stat)."""
+        try:
+            self.file_probe.probe(local_path)
+            return True
+        except FileNotFoundError:
+            return False
 
-    def validate_video_path(self, local_path: str) -> bool:
+    def validate_image_path(self, local_path: str) -> bool:
         """
-        Validate that the video path exists and is a supported format.
+        Validate that the image path exists and its content is a supported
+        format matching its extension (header only, memoized).
 
         Args:
             local_path: Local file path to validate
@@ -135,13 +327,20 @@ class FileUploadService:
         Returns:
             True if valid, False otherwise
         """
-        if not os.path.exists(local_path):
-            return False
+        return self.file_probe.matches_extension(local_path, "image")
 
-        supported_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']
-        file_extension = os.path.splitext(local_path)[1].lower()
+    def validate_video_path(self, local_path: str) -> bool:
+        """
+        Validate that the video path exists and its content is a supported
+        container matching its extension (magic bytes, memoized).
+
+        Args:
+            local_path: Local file path to validate
 
-        return file_extension in supported_extensions
+        Returns:
+            True if valid, False otherwise
+        """
+        return self.file_probe.matches_extension(local_path, "video")
 
     def get_file_size_mb(self, local_path: str) -> float:
         """
@@ -153,11 +352,10 @@ class FileUploadService:
         Returns:
             File size in MB
         """
-        if not os.path.exists(local_path):
+        if not self.file_exists(local_path):
             return 0.0
 
-        size_bytes = os.path.getsize(local_path)
-        return size_bytes / (1024 * 1024)
+        return self.file_probe.probe(local_path).size / (1024 * 1024)
 
     def validate_file_size(self, local_path: str, max_size_mb: float = 100.0) -> bool:
         """
@@ -0,0 +1,145 @@
+"""Lazily constructed services behind the aitimes-db-mcp tools."""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+from ..Infrastructure.article_repository import ArticleRepository
+from ..Infrastructure.mongodb_client import MongoDBClient
+from .article_service import ArticleService
+from .image_upload_service import FileUploadService
+from .upload_job_service import UploadJobService
+
+
+class ServiceContainer:
+    """Builds the MongoDB and Supabase backed services on first use.
+
+    Nothing connects when the server module is imported: the first tool call
+    builds the services it needs, running the blocking connects on worker
+    threads. warmup() does the same ahead of time, bringing MongoDB and
+    Supabase up concurrently so sessions that will use the database don't pay
+    for the handshakes on their first tool call.
+    """
+
+    def __init__(
+        self,
+        mongo_client_factory: Callable[[], MongoDBClient] = MongoDBClient,
+        file_service_factory: Callable[[], FileUploadService] = FileUploadService,
+    ):
+        """
+        Initialize service container.
+
+        Args:
+            mongo_client_factory: Creates the (not yet connected) MongoDB client
+            file_service_factory: Creates the Supabase file upload service
+        """
+        self._mongo_client_factory = mongo_client_factory
+        self._file_service_factory = file_service_factory
+
+        # One lock per backend so MongoDB and Supabase can come up in parallel
+        self._mongo_lock = threading.Lock()
+        self._storage_lock = threading.Lock()
+
+        self._mongo_client: Optional[MongoDBClient] = None
+        self._file_service: Optional[FileUploadService] = None
+        self._article_service: Optional[ArticleService] = None
+        self._upload_job_service: Optional[UploadJobService] = None
+        self._warmup: Optional[asyncio.Task] = None
+
+    async def mongo_client(self) -> MongoDBClient:
+        """Get the MongoDB client, connecting on first use."""
+        if self._mongo_client is None:
+            await asyncio.to_thread(self._connect_mongo)
+        return self._mongo_client
+
+    async def file_service(self) -> FileUploadService:
+        """Get the file upload service, creating the Supabase client on first use."""
+        if self._file_service is None:
+            await asyncio.to_thread(self._create_file_service)
+        return self._file_service
+
+    async def article_service(self) -> ArticleService:
+        """Get the article service, connecting its backends on first use."""
+        if self._article_service is None:
+            mongo_client, file_service = await asyncio.gather(self.mongo_client(), self.file_service())
+            # No await between the check and the assignment, so concurrent callers share one service
+            if self._article_service is None:
+                self._article_service = ArticleService(ArticleRepository(mongo_client), file_service)
+        return self._article_service
+
+    async def upload_job_service(self) -> UploadJobService:
+        """Get the upload job service."""
+        if self._upload_job_service is None:
+            article_service, file_service = await asyncio.gather(self.article_service(), self.file_service())
+            if self._upload_job_service is None:
+                self._upload_job_service = UploadJobService(article_service, file_service)
+        return self._upload_job_service
+
+    async def warmup(self, create_indexes: bool = False) -> None:
+        """
+        Connect to MongoDB and Supabase concurrently and build every service.
+
+        Args:
+            create_indexes: Also make sure the article indexes exist
+
+        Raises:
+            Exception: Whatever connecting to either backend raised
+        """
+        started = time.perf_counter()
+        mongo_client, file_service = await asyncio.gather(self.mongo_client(), self.file_service())
+
+        # The sync driver already pinged in connect(); the async one connects lazily
+        handshakes = [asyncio.to_thread(file_service.supabase_client.ping)]
+        if mongo_client.is_async:
+            handshakes.append(mongo_client.ping())
+        await asyncio.gather(*handshakes)
+
+        await self.upload_job_service()
+        article_service = await self.article_service()
+        if create_indexes:
+            await article_service.article_repository.create_indexes()
+        # Start the change stream watcher now instead of on the first read
+        article_service.start_cache_watcher()
+
+        print(f"🔥 aitimes-db-mcp services warmed up in {time.perf_counter() - started:.2f}s")
+
+    def start_warmup(self, create_indexes: bool = False) -> asyncio.Task:
+        """
+        Run warmup() in the background on the running event loop.
+
+        Failures are logged, not raised; the next tool call retries the connection.
+
+        Returns:
+            The warmup task (the same one if already started)
+        """
+        if self._warmup is None:
+            self._warmup = asyncio.create_task(self._run_warmup(create_indexes))
+        return self._warmup
+
+    async def _run_warmup(self, create_indexes: bool) -> None:
+        """Warm up, logging instead of raising failures."""
+        try:
+            await self.warmup(create_indexes)
+        except Exception as e:
+            print(f"aitimes-db-mcp warmup failed: {str(e)}")
+
+    def _connect_mongo(self) -> None:
+        """Create and connect the MongoDB client once (runs on a worker thread)."""
+        with self._mongo_lock:
+            if self._mongo_client is not None:
+                return
+            started = time.perf_counter()
+            mongo_client = self._mongo_client_factory()
+            mongo_client.connect()
+            self._mongo_client = mongo_client
+            print(f"⏱️ MongoDB client ready in {time.perf_counter() - started:.2f}s")
+
+    def _create_file_service(self) -> None:
+        """Create the file upload service once (runs on a worker thread)."""
+        with self._storage_lock:
+            if self._file_service is not None:
+                return
+            started = time.perf_counter()
+            self._file_service = self._file_service_factory()
+            print(f"⏱️ Supabase client ready in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,156 @@
+"""Background upload jobs so tools can return before large uploads finish."""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..domain.codec import DEFAULT_CODEC
+from ..domain.models import ArticleCreationRequest, UploadJob
+from .article_service import ArticleService
+from .image_upload_service import FileUploadService
+
+
+class UploadJobService:
+    """Queue of upload jobs processed by a bounded pool of worker tasks.
+
+    Jobs are submitted from tool handlers and return immediately; workers are
+    started lazily on the running event loop. Progress is reported in bytes by
+    the storage client, so status shows progress and throughput while a job
+    runs. Only the most recent max_jobs jobs are kept.
+    """
+
+    def __init__(
+        self,
+        article_service: ArticleService,
+        file_service: FileUploadService,
+        max_concurrency: Optional[int] = None,
+        max_jobs: int = 500,
+    ):
+        """Initialize upload job service."""
+        self.article_service = article_service
+        self.file_service = file_service
+        self.max_concurrency = max_concurrency or int(os.getenv("UPLOAD_JOB_CONCURRENCY", "2"))
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def submit_video_upload(self, video_file_path: str, article_id: str) -> UploadJob:
+        """Queue the upload of a standalone video."""
+        self.file_service.validate_video_file(video_file_path)
+
+        job = self._new_job("video", article_id, [video_file_path])
+
+        async def run() -> dict:
+            video_url = await asyncio.wrap_future(self.file_service.submit(
+                self.file_service.upload_video_file, video_file_path, article_id, self._progress(job)
+            ))
+            return {"video_url": video_url}
+
+        return self._enqueue(job, run)
+
+    def submit_article_creation(self, request: ArticleCreationRequest) -> UploadJob:
+        """Queue the creation of an article, including its uploads."""
+        self.article_service.validate_creation_request(request)
+
+        job = self._new_job("article", request.id, [request.thumbnail_image_path, request.video_file_path])
+
+        async def run() -> dict:
+            article = await self.article_service.create_article_with_upload(request, self._progress(job))
+            return {"article": DEFAULT_CODEC.encode(article)}
+
+        return self._enqueue(job, run)
+
+    def get_jobs(self, job_ids: Optional[List[str]] = None) -> List[UploadJob]:
+        """Get jobs by ID (default: all known jobs)."""
+        if job_ids is None:
+            return list(self._jobs.values())
+        unknown = [job_id for job_id in job_ids if job_id not in self._jobs]
+        if unknown:
+            raise ValueError(f"Unknown upload jobs: {', '.join(unknown)}")
+        return [self._jobs[job_id] for job_id in job_ids]
+
+    async def wait(self, job_ids: Optional[List[str]] = None, timeout_seconds: float = 300.0) -> List[UploadJob]:
+        """
+        Wait until the given jobs (default: all unfinished jobs) finish or the timeout expires.
+
+        Returns:
+            The jobs in their current state, finished or not
+        """
+        jobs = self.get_jobs(job_ids) if job_ids is not None else [job for job in self._jobs.values() if not job.finished]
+        pending = [self._done_events[job.id].wait() for job in jobs if not job.finished]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout_seconds)
+            except asyncio.TimeoutError:
+                pass
+        return jobs
+
+    def _new_job(self, kind: str, article_id: str, local_paths: List[Optional[str]]) -> UploadJob:
+        """Create a queued job covering the sizes of its local files."""
+        return UploadJob(
+            id=uuid.uuid4().hex[:12],
+            kind=kind,
+            article_id=article_id,
+            bytes_total=sum(self.file_service.file_probe.probe(path).size for path in local_paths if path),
+            created_at=datetime.utcnow()
+        )
+
+    def _enqueue(self, job: UploadJob, run: Callable[[], Awaitable[dict]]) -> UploadJob:
+        """Register a job and hand it to the workers."""
+        self._ensure_workers()
+        self._jobs[job.id] = job
+        self._done_events[job.id] = asyncio.Event()
+        self._prune()
+        self._queue.put_nowait((job, run))
+        return job
+
+    def _progress(self, job: UploadJob) -> Callable[[int], None]:
+        """Progress callback adding sent bytes to a job (called from upload threads)."""
+        # The thumbnail and video of one job are uploaded on different threads
+        lock = threading.Lock()
+
+        def report(sent: int) -> None:
+            with lock:
+                job.bytes_done += sent
+        return report
+
+    def _ensure_workers(self) -> None:
+        """Start worker tasks on the running event loop on first use."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.max_concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        """Process queued jobs one at a time."""
+        while True:
+            job, run = await self._queue.get()
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            try:
+                job.result = await run()
+                job.status = "succeeded"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = datetime.utcnow()
+                self._done_events[job.id].set()
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond max_jobs."""
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+                del self._done_events[job_id]
@@ -0,0 +1,166 @@
+"""Tests for keyset cursor pagination of ArticleRepository, on an in-memory collection."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from sdk_mcp_server.Infrastructure.article_repository import ArticleRepository, decode_cursor, encode_cursor
+
+
+class FakeCursor:
+    """The part of a PyMongo find cursor that list_articles_page uses."""
+
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def sort(self, keys: list) -> "FakeCursor":
+        for name, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[name], reverse=direction < 0)
+        return self
+
+    def skip(self, count: int) -> "FakeCursor":
+        self.documents = self.documents[count:]
+        return self
+
+    def limit(self, count: int) -> "FakeCursor":
+        self.documents = self.documents[:count]
+        return self
+
+    def to_list(self, length=None) -> list:
+        return list(self.documents)
+
+
+def matches(document: dict, query: dict) -> bool:
+    """Evaluate the equality, $lt and $or filters built by list_articles_page."""
+    for name, condition in query.items():
+        if name == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not document[name] < condition["$lt"]:
+                return False
+        elif document[name] != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def find(self, query: dict, projection: dict) -> FakeCursor:
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def watch(self, pipeline: list, **kwargs) -> "FakeChangeStream":
+        self.stream = FakeChangeStream(self.documents, kwargs["max_await_time_ms"])
+        return self.stream
+
+
+class FakeChangeStream:
+    """Reports each document as a change, then polls empty like a sync driver change stream."""
+
+    def __init__(self, documents: list, max_await_time_ms: int):
+        self.changes = [{"fullDocument": document} for document in documents]
+        self.max_await = max_await_time_ms / 1000
+        self.polling = False
+        self.closed = False
+
+    def try_next(self):
+        if self.changes:
+            return self.changes.pop(0)
+        self.polling = True
+        time.sleep(min(self.max_await, 0.05))
+        self.polling = False
+        return None
+
+    def close(self):
+        assert not self.polling, "closed while a poll was running"
+        self.closed = True
+
+
+class FakeMongoDBClient:
+    is_async = False
+
+    def __init__(self, documents: list):
+        self.database = {"articles": FakeCollection(documents)}
+
+    async def resolve(self, result):
+        return result
+
+
+def make_documents(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    # Pairs of articles share a created_at, so pages must break ties on id
+    return [{"id": f"article-{i:03d}", "created_at": start + timedelta(seconds=i // 2)} for i in range(count)]
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678000)
+    assert decode_cursor(encode_cursor(created_at, "article-1")) == (created_at, "article-1")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(datetime(2025, 1, 1), "a")[:-4]])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_pages_cover_every_article_once_in_order():
+    documents = make_documents(25)
+    repository = ArticleRepository(FakeMongoDBClient(documents))
+
+    async def read_all():
+        pages, cursor = [], None
+        while True:
+            page = await repository.list_articles_page(limit=4, cursor=cursor)
+            pages.append(page)
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    pages = asyncio.run(read_all())
+    ids = [document["id"] for page in pages for document in page.documents]
+    expected = [document["id"] for document in sorted(documents, key=lambda d: (d["created_at"], d["id"]), reverse=True)]
+    assert ids == expected
+    assert [len(page.documents) for page in pages] == [4] * 6 + [1]
+
+
+def test_last_full_page_has_no_next_cursor():
+    repository = ArticleRepository(FakeMongoDBClient(make_documents(8)))
+    page = asyncio.run(repository.list_articles_page(limit=4, cursor=None, offset=4))
+    assert len(page.documents) == 4
+    assert page.next_cursor is None
+
+
+def test_include_total_uses_estimated_count():
+    repository = ArticleRepository(FakeMongoDBClient(make_documents(3)))
+    page = asyncio.run(repository.list_articles_page(limit=2, include_total=True))
+    assert page.total == 3
+    assert page.next_cursor is not None
+
+
+def test_cancelled_watch_waits_for_poll_then_closes_stream():
+    client = FakeMongoDBClient(make_documents(2))
+    repository = ArticleRepository(client)
+
+    async def watch():
+        seen = []
+
+        async def consume():
+            async for article_id in repository.watch_article_changes():
+                seen.append(article_id)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return seen
+
+    assert asyncio.run(watch()) == ["article-000", "article-001"]
+    assert client.database["articles"].stream.closed
@@ -0,0 +1,160 @@
+"""Tests for the durable deletion queue (claims, cancel, backoff and expiry)."""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from sdk_mcp_server.Infrastructure.deletion_queue import DeletionQueue
+
+
+class FakeClock:
+    """Settable replacement for time.time."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_queue(clock: FakeClock, **kwargs) -> DeletionQueue:
+    directory = tempfile.mkdtemp()
+    return DeletionQueue(os.path.join(directory, "queue.sqlite3"), clock=clock, **kwargs)
+
+
+def test_enqueue_deduplicates_paths():
+    queue = make_queue(FakeClock())
+    assert queue.enqueue(["a", "b", "a"]) == 2
+    assert queue.enqueue(["b", "c"]) == 1
+    assert queue.pending_count() == 3
+
+
+def test_claim_due_claims_each_path_once():
+    queue = make_queue(FakeClock())
+    queue.enqueue(["a", "b", "c"])
+    first = queue.claim_due(2)
+    second = queue.claim_due(10)
+    assert len(first) == 2
+    assert sorted(first + second) == ["a", "b", "c"]
+    assert queue.claim_due(10) == []
+
+
+def test_claim_due_is_exclusive_across_connections():
+    clock = FakeClock()
+    queue = make_queue(clock)
+    other = DeletionQueue(queue.path, clock=clock)
+    queue.enqueue([f"path-{i}" for i in range(50)])
+    claimed = queue.claim_due(30) + other.claim_due(30)
+    assert len(claimed) == 50
+    assert len(set(claimed)) == 50
+
+
+def test_cancel_unclaimed_path_removes_it():
+    queue = make_queue(FakeClock())
+    queue.enqueue(["a"])
+    assert queue.cancel("a") is True
+    assert queue.pending_count() == 0
+    assert queue.claim_due(10) == []
+
+
+def test_cancel_unknown_path_returns_false():
+    queue = make_queue(FakeClock())
+    assert queue.cancel("missing") is False
+
+
+def test_cancel_waits_for_claimed_deletion():
+    queue = make_queue(FakeClock())
+    queue.enqueue(["a"])
+    assert queue.claim_due(1) == ["a"]
+
+    completed_at = []
+
+    def worker():
+        time.sleep(0.2)
+        completed_at.append(time.monotonic())
+        queue.complete(["a"])
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    # Returns only once the worker is done, so a re-upload cannot race the delete
+    assert queue.cancel("a", wait_seconds=5) is True
+    returned_at = time.monotonic()
+    thread.join()
+    assert completed_at and returned_at >= completed_at[0]
+    assert queue.pending_count() == 0
+
+
+def test_cancel_removes_path_released_by_failed_deletion():
+    queue = make_queue(FakeClock())
+    queue.enqueue(["a"])
+    queue.claim_due(1)
+
+    thread = threading.Thread(target=lambda: (time.sleep(0.1), queue.retry_later(["a"], "boom")))
+    thread.start()
+    assert queue.cancel("a", wait_seconds=5) is True
+    thread.join()
+    assert queue.pending_count() == 0
+
+
+def test_cancel_times_out_while_claimed():
+    queue = make_queue(FakeClock())
+    queue.enqueue(["a"])
+    queue.claim_due(1)
+    with pytest.raises(RuntimeError):
+        queue.cancel("a", wait_seconds=0.1)
+    assert queue.pending_count() == 1
+
+
+def test_expired_claim_can_be_cancelled_and_reclaimed():
+    clock = FakeClock()
+    queue = make_queue(clock, claim_timeout_seconds=60)
+    queue.enqueue(["a", "b"])
+    assert sorted(queue.claim_due(10)) == ["a", "b"]
+    assert queue.claim_due(10) == []
+
+    # The worker died; its claims expire
+    clock.now += 61
+    assert queue.cancel("a", wait_seconds=0) is True
+    assert queue.claim_due(10) == ["b"]
+
+
+def test_retry_later_backs_off_and_drops_after_max_attempts():
+    clock = FakeClock()
+    queue = make_queue(clock, base_backoff_seconds=10, max_attempts=3)
+    queue.enqueue(["a"])
+
+    queue.claim_due(1)
+    assert queue.retry_later(["a"], "boom") == []
+    assert queue.claim_due(1) == []
+    assert queue.seconds_until_due() == pytest.approx(10)
+
+    clock.now += 10
+    assert queue.claim_due(1) == ["a"]
+    assert queue.retry_later(["a"], "boom") == []
+    assert queue.seconds_until_due() == pytest.approx(20)
+
+    clock.now += 20
+    queue.claim_due(1)
+    assert queue.retry_later(["a"], "boom") == ["a"]
+    assert queue.pending_count() == 0
+
+
+def test_seconds_until_due_accounts_for_claims():
+    clock = FakeClock()
+    queue = make_queue(clock, claim_timeout_seconds=60)
+    assert queue.seconds_until_due() == float("inf")
+    queue.enqueue(["a"])
+    assert queue.seconds_until_due() == 0
+    queue.claim_due(1)
+    assert queue.seconds_until_due() == pytest.approx(60)
+
+
+def test_queue_survives_reopen():
+    clock = FakeClock()
+    queue = make_queue(clock)
+    queue.enqueue(["a"])
+    queue.close()
+    assert DeletionQueue(queue.path, clock=clock).claim_due(10) == ["a"]
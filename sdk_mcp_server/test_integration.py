@@ -37,7 +37,7 @@ async def test_integration():
 
         # Test article repository
         article_repo = ArticleRepository(mongo_client)
-        article_repo.create_indexes()
+        await article_repo.create_indexes()
         print("✅ MongoDB indexes created")
 
     except Exception as e:
@@ -128,7 +128,7 @@ async def test_integration():
             pass
 
         # Close MongoDB connection
-        mongo_client.disconnect()
+        await mongo_client.aclose()
         print("✅ MongoDB connection closed")
 
     print("\n🎉 Integration test completed successfully!")
@@ -0,0 +1,64 @@
+"""Tests for the Bloom filter and referenced-path loading of reconcile_storage."""
+
+import asyncio
+
+from sdk_mcp_server.reconcile_storage import MAX_FILES_PER_ARTICLE, BloomFilter, build_referenced_paths
+
+BASE_URL = "https://example.supabase.co/storage/v1/object/public/article/"
+
+
+class FakeRepository:
+    def __init__(self, articles: list):
+        self.articles = articles
+
+    async def estimated_article_count(self) -> int:
+        return len(self.articles)
+
+    async def iter_file_urls(self):
+        for article in self.articles:
+            for url in article:
+                yield url
+
+
+class FakeStorage:
+    def extract_storage_path_from_url(self, public_url: str):
+        return public_url[len(BASE_URL):] if public_url.startswith(BASE_URL) else None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"thumbnails/{i}/{i:064x}.png" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    bloom = BloomFilter(10000, false_positive_rate=0.01)
+    for i in range(10000):
+        bloom.add(f"present/{i}")
+    false_positives = sum(f"absent/{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_referenced_paths_include_every_rendition():
+    articles = [
+        [BASE_URL + f"thumbnails/{i}/thumb.png", BASE_URL + f"videos/{i}/video.mp4"]
+        + [BASE_URL + f"thumbnails/{i}/rendition-{r}.webp" for r in range(MAX_FILES_PER_ARTICLE - 2)]
+        for i in range(50)
+    ]
+    referenced, count = asyncio.run(build_referenced_paths(FakeRepository(articles), FakeStorage(), 0.001))
+    assert count == 50 * MAX_FILES_PER_ARTICLE
+    assert "thumbnails/7/rendition-3.webp" in referenced
+    assert "videos/49/video.mp4" in referenced
+
+
+def test_filter_is_sized_for_renditions():
+    # Fully rendered articles must not push the filter past its false positive rate
+    articles = [
+        [BASE_URL + f"thumbnails/{i}/file-{r}.webp" for r in range(MAX_FILES_PER_ARTICLE)]
+        for i in range(2000)
+    ]
+    referenced, _ = asyncio.run(build_referenced_paths(FakeRepository(articles), FakeStorage(), 0.01))
+    false_positives = sum(f"thumbnails/{i}/orphan.webp" in referenced for i in range(20000))
+    assert false_positives / 20000 < 0.02
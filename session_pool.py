@@ -0,0 +1,261 @@
+"""Pre-connected Claude Code sessions that are reused instead of cold-started.
+
+Connecting a ClaudeSDKClient spawns the CLI and starts every MCP server
+(including `npx @playwright/mcp@latest`), which takes seconds. The pool
+connects sessions in the background ahead of time; a checked-out session
+is handed back with its context cleared by `/clear`, which keeps the CLI
+and its MCP servers running. Session ids are persisted so a conversation
+can be resumed after a restart.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Callable, Deque, Dict, Optional
+
+from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient, SystemMessage
+
+import startup_timing
+from observability.tracing import TRACER
+
+
+class SessionStore:
+    """Session ids saved under a name in a JSON file, so they survive restarts."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize session store.
+
+        Args:
+            path: JSON file (default: CLAUDE_SESSION_STORE_PATH or outputs/sessions.json)
+        """
+        self.path = path or os.getenv("CLAUDE_SESSION_STORE_PATH", os.path.join("outputs", "sessions.json"))
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, name: str = "last") -> Optional[str]:
+        """Session id saved under name, or None."""
+        return self._load().get(name)
+
+    def save(self, session_id: str, name: str = "last") -> None:
+        """Save a session id under name (written atomically)."""
+        sessions = self._load()
+        if sessions.get(name) == session_id:
+            return
+        sessions[name] = session_id
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(sessions, file, indent=2)
+        os.replace(temp_path, self.path)
+
+
+async def clear_context(client: ClaudeSDKClient, timeout: float = 30.0) -> Optional[str]:
+    """
+    Start a fresh conversation on a connected session without restarting it.
+
+    Args:
+        client: Connected session
+        timeout: Seconds to wait for the CLI to finish clearing
+
+    Returns:
+        Id of the new conversation, if the CLI reported one
+
+    Raises:
+        asyncio.TimeoutError: If clearing did not finish in time
+    """
+    async def clear() -> Optional[str]:
+        session_id = None
+        await client.query("/clear")
+        async for message in client.receive_response():
+            if isinstance(message, SystemMessage) and message.subtype == "init":
+                session_id = message.data.get("session_id")
+        return session_id
+
+    return await asyncio.wait_for(clear(), timeout)
+
+
+class _OwnedSession:
+    """A session connected, held and disconnected by one task of its own.
+
+    ClaudeSDKClient keeps an anyio task group open from connect() until
+    disconnect(), and that task group must be exited by the task that entered
+    it; disconnecting from another task fails before the CLI is stopped.
+    Queries and responses only use the client's streams, so they can come
+    from any task.
+    """
+
+    def __init__(self, options: ClaudeCodeOptions):
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Nobody may wait for a session that failed to connect after the pool closed
+        self.ready.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self._closing = asyncio.Event()
+        self._task = asyncio.ensure_future(self._own(options))
+
+    async def _own(self, options: ClaudeCodeOptions) -> None:
+        # Links this client's MCP handler spans to its own tool calls only
+        TRACER.enter_client_scope()
+        client = ClaudeSDKClient(options)
+        started = time.perf_counter()
+        try:
+            await client.connect()
+        except asyncio.CancelledError:
+            self.ready.cancel()
+            raise
+        except Exception as e:
+            self.ready.set_exception(e)
+            return
+        print(f"🔌 Session connected in {time.perf_counter() - started:.2f}s")
+        startup_timing.mark("client_connected")
+        self.ready.set_result(client)
+        try:
+            await self._closing.wait()
+        finally:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                print(f"Failed to disconnect session: {str(e)}")
+
+    def is_connected(self) -> bool:
+        return self.ready.done() and not self.ready.cancelled() and self.ready.exception() is None
+
+    async def close(self) -> None:
+        """Disconnect the session (once it finished connecting) and wait until it is stopped."""
+        self._closing.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class SessionPool:
+    """Keeps up to size Claude Code sessions, idle ones connected and ready for checkout.
+
+    Idle sessions are held while they connect, so a checkout can take a
+    session that is still connecting and only wait for the rest of its
+    connect. Every session is owned by a task of its own, which connects and
+    later disconnects it.
+    """
+
+    def __init__(self, options_factory: Callable[[], ClaudeCodeOptions], size: Optional[int] = None):
+        """
+        Initialize session pool.
+
+        Args:
+            options_factory: Builds the options of each new session
+            size: Sessions kept, idle and checked out together (default:
+                CLAUDE_SESSION_POOL_SIZE or 1)
+        """
+        self.options_factory = options_factory
+        self.size = size if size is not None else int(os.getenv("CLAUDE_SESSION_POOL_SIZE", "1"))
+        self._idle: Deque[_OwnedSession] = deque()
+        self._checked_out: Dict[int, _OwnedSession] = {}
+        self._closed = False
+
+    def start(self) -> None:
+        """Begin connecting sessions in the background (requires a running event loop)."""
+        self._fill()
+
+    async def connect(self, resume: Optional[str] = None, model: Optional[str] = None) -> ClaudeSDKClient:
+        """
+        Connect a new session (a cold start that bypasses the idle sessions).
+
+        Args:
+            resume: Session id to resume instead of starting a new conversation
+            model: Model to use instead of the one from options_factory
+
+        Returns:
+            Connected session; give it back with release()
+        """
+        options = self.options_factory()
+        if resume:
+            options = replace(options, resume=resume)
+        if model:
+            options = replace(options, model=model)
+        return await self._check_out(_OwnedSession(options))
+
+    async def _check_out(self, session: _OwnedSession) -> ClaudeSDKClient:
+        # Shielded: a cancelled checkout must not cancel the connect itself
+        client = await asyncio.shield(session.ready)
+        self._checked_out[id(client)] = session
+        return client
+
+    def _fill(self) -> None:
+        """Start connecting sessions until size sessions exist."""
+        while not self._closed and len(self._idle) + len(self._checked_out) < self.size:
+            self._idle.append(_OwnedSession(self.options_factory()))
+
+    async def acquire(self, resume: Optional[str] = None) -> ClaudeSDKClient:
+        """
+        Check out a connected session with an empty context.
+
+        Args:
+            resume: Session id to resume; resuming is a CLI startup option, so
+                this always connects a new session
+
+        Returns:
+            Connected session; give it back with release()
+
+        Raises:
+            RuntimeError: If the pool is closed
+        """
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+        if resume or not self._idle:
+            return await self.connect(resume)
+
+        # Prefer a session that is already connected
+        session = next((session for session in self._idle if session.is_connected()), self._idle[0])
+        self._idle.remove(session)
+        try:
+            return await self._check_out(session)
+        except asyncio.CancelledError:
+            self._idle.appendleft(session)
+            raise
+        except Exception as e:
+            print(f"Warm session failed to connect, connecting a new one: {str(e)}")
+        return await self.connect()
+
+    async def release(self, client: ClaudeSDKClient, reuse: bool = True) -> None:
+        """
+        Give a session back.
+
+        Args:
+            client: Session from acquire() or connect()
+            reuse: False when the session may be in a bad state (e.g. a timed
+                out turn); it is then disconnected instead of cleared
+
+        Raises:
+            ValueError: If the session was not checked out from this pool
+        """
+        session = self._checked_out.pop(id(client), None)
+        if session is None:
+            raise ValueError("Session was not checked out from this pool")
+
+        # Sessions from connect() can take the pool over size
+        surplus = len(self._idle) + len(self._checked_out) >= self.size
+        if reuse and not self._closed and not surplus:
+            try:
+                await clear_context(client)
+                self._idle.appendleft(session)
+                return
+            except Exception as e:
+                print(f"Failed to clear session context, disconnecting it: {str(e)}")
+
+        await session.close()
+        self._fill()
+
+    async def close(self) -> None:
+        """Disconnect every idle session and stop connecting new ones.
+
+        Checked-out sessions are disconnected when they are released.
+        """
+        self._closed = True
+        sessions = list(self._idle)
+        self._idle.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
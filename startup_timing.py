@@ -0,0 +1,34 @@
+"""Startup-time instrumentation.
+
+Import this module before anything else so its clock starts as close to
+process start as possible; mark() then records how long each startup
+milestone took to reach.
+"""
+
+import time
+
+# Interpreter startup before this import is not included
+PROCESS_STARTED_AT = time.perf_counter()
+
+_marks: dict[str, float] = {}
+
+
+def mark(name: str) -> float:
+    """
+    Record the first time a milestone is reached and print it.
+
+    Args:
+        name: Milestone name, e.g. "first_agent_message"
+
+    Returns:
+        Seconds from process start to the first time the milestone was marked
+    """
+    if name not in _marks:
+        _marks[name] = time.perf_counter() - PROCESS_STARTED_AT
+        print(f"⏱️ {name}: {_marks[name]:.3f}s since process start")
+    return _marks[name]
+
+
+def marks() -> dict[str, float]:
+    """Get every milestone reached so far, in seconds since process start."""
+    return dict(_marks)
@@ -0,0 +1,137 @@
+"""Tests for SessionPool accounting, with a fake client in place of the CLI."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("claude_code_sdk")
+
+from claude_code_sdk import ClaudeCodeOptions, SystemMessage
+
+import session_pool
+from session_pool import SessionPool
+
+
+class FakeClient:
+    """Connects instantly and, like ClaudeSDKClient, must be disconnected by the task that connected it."""
+
+    live = 0
+
+    def __init__(self, options: ClaudeCodeOptions):
+        self.options = options
+        self.owner = None
+        self.queries = []
+
+    async def connect(self):
+        self.owner = asyncio.current_task()
+        FakeClient.live += 1
+
+    async def disconnect(self):
+        if asyncio.current_task() is not self.owner:
+            raise RuntimeError("Attempted to exit cancel scope in a different task than it was entered in")
+        FakeClient.live -= 1
+
+    async def query(self, prompt: str):
+        self.queries.append(prompt)
+
+    async def receive_response(self):
+        yield SystemMessage(subtype="init", data={"session_id": f"session-{len(self.queries)}"})
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    FakeClient.live = 0
+    monkeypatch.setattr(session_pool, "ClaudeSDKClient", FakeClient)
+
+
+def make_pool(size: int) -> SessionPool:
+    return SessionPool(lambda: ClaudeCodeOptions(model="opus"), size=size)
+
+
+def test_acquire_release_reuses_sessions():
+    async def run():
+        pool = make_pool(2)
+        pool.start()
+        first = await pool.acquire()
+        await pool.release(first)
+        second = await pool.acquire()
+        assert second is first
+        assert first.queries == ["/clear"]
+        await pool.release(second)
+        await pool.close()
+
+    asyncio.run(run())
+    assert FakeClient.live == 0
+
+
+def test_pool_never_exceeds_size():
+    async def run():
+        pool = make_pool(2)
+        pool.start()
+        clients = [await pool.acquire() for _ in range(2)]
+        # Checked-out sessions count towards size: no replacement is started
+        assert len(pool._idle) == 0
+        assert FakeClient.live == 2
+        extra = await pool.acquire()
+        assert FakeClient.live == 3
+        for client in clients + [extra]:
+            await pool.release(client)
+        # The surplus session was disconnected instead of kept idle
+        assert len(pool._idle) == 2
+        assert FakeClient.live == 2
+        await pool.close()
+
+    asyncio.run(run())
+    assert FakeClient.live == 0
+
+
+def test_release_without_reuse_replaces_session():
+    async def run():
+        pool = make_pool(1)
+        pool.start()
+        client = await pool.acquire()
+        await pool.release(client, reuse=False)
+        assert len(pool._idle) == 1
+        replacement = await pool.acquire()
+        assert replacement is not client
+        await pool.release(replacement)
+        await pool.close()
+
+    asyncio.run(run())
+    assert FakeClient.live == 0
+
+
+def test_release_of_unknown_client_raises():
+    async def run():
+        pool = make_pool(1)
+        with pytest.raises(ValueError):
+            await pool.release(FakeClient(ClaudeCodeOptions()))
+
+    asyncio.run(run())
+
+
+def test_sessions_released_from_other_tasks_disconnect_cleanly():
+    async def run():
+        pool = make_pool(2)
+        pool.start()
+
+        async def use():
+            client = await pool.acquire()
+            await asyncio.sleep(0)
+            await pool.release(client, reuse=False)
+
+        await asyncio.gather(use(), use())
+        await pool.close()
+
+    asyncio.run(run())
+    assert FakeClient.live == 0
+
+
+def test_acquire_after_close_raises():
+    async def run():
+        pool = make_pool(1)
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+
+    asyncio.run(run())
@@ -0,0 +1,188 @@
+"""Token and cost accounting from ResultMessages, and budgets that act on it."""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from claude_code_sdk import ResultMessage
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    """Usage summed over the ResultMessages of one session, article or task."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    duration_ms: int = 0  # Wall-clock time of the turns
+    duration_api_ms: int = 0  # Time spent waiting on the API
+    results: int = 0  # ResultMessages (steps) counted
+    models: List[str] = field(default_factory=list)  # Models the steps ran on
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.cache_read_input_tokens + self.cache_creation_input_tokens
+
+    def add(self, result: ResultMessage, model: Optional[str] = None) -> None:
+        """
+        Add the usage of one turn.
+
+        Args:
+            result: The turn's ResultMessage
+            model: Model the turn ran on, if known
+        """
+        usage = result.usage or {}
+        self.input_tokens += int(usage.get("input_tokens") or 0)
+        self.output_tokens += int(usage.get("output_tokens") or 0)
+        self.cache_read_input_tokens += int(usage.get("cache_read_input_tokens") or 0)
+        self.cache_creation_input_tokens += int(usage.get("cache_creation_input_tokens") or 0)
+        self.cost_usd += result.total_cost_usd or 0.0
+        self.num_turns += result.num_turns
+        self.duration_ms += result.duration_ms
+        self.duration_api_ms += result.duration_api_ms
+        self.results += 1
+        if model and model not in self.models:
+            self.models.append(model)
+
+    def merge(self, other: "UsageTotals") -> None:
+        """Add another total to this one."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_input_tokens += other.cache_read_input_tokens
+        self.cache_creation_input_tokens += other.cache_creation_input_tokens
+        self.cost_usd += other.cost_usd
+        self.num_turns += other.num_turns
+        self.duration_ms += other.duration_ms
+        self.duration_api_ms += other.duration_api_ms
+        self.results += other.results
+        self.models.extend(model for model in other.models if model not in self.models)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+    def describe(self) -> str:
+        """One-line summary for logs."""
+        return (
+            f"{self.cost_usd:.2f}$, {self.num_turns} turns, "
+            f"{self.input_tokens} in / {self.output_tokens} out / {self.cache_read_input_tokens} cache-read tokens"
+        )
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when a task crosses one of its budget's stop limits."""
+
+
+@dataclass(slots=True)
+class Budget:
+    """Limits for one task or article; checked after every turn.
+
+    Crossing downgrade_cost_usd switches the remaining turns to
+    downgrade_model; crossing any max_* limit stops the task. max_turns is
+    also counted while a turn runs, since only turns are visible before its
+    ResultMessage arrives.
+    """
+    max_cost_usd: Optional[float] = None
+    max_tokens: Optional[int] = None  # Input, output and cache tokens together
+    max_turns: Optional[int] = None
+    downgrade_cost_usd: Optional[float] = None
+    downgrade_model: Optional[str] = None
+
+    def __post_init__(self):
+        if self.downgrade_cost_usd is not None and not self.downgrade_model:
+            raise ValueError("downgrade_cost_usd needs downgrade_model")
+
+    @classmethod
+    def from_env(cls) -> Optional["Budget"]:
+        """
+        Budget from TASK_BUDGET_USD, TASK_BUDGET_TOKENS, TASK_BUDGET_TURNS,
+        TASK_BUDGET_DOWNGRADE_USD and TASK_BUDGET_DOWNGRADE_MODEL.
+
+        Returns:
+            The budget, or None if no limit is set
+        """
+        def number(name: str, cast):
+            value = os.getenv(name)
+            return cast(value) if value else None
+
+        budget = cls(
+            max_cost_usd=number("TASK_BUDGET_USD", float),
+            max_tokens=number("TASK_BUDGET_TOKENS", int),
+            max_turns=number("TASK_BUDGET_TURNS", int),
+            downgrade_cost_usd=number("TASK_BUDGET_DOWNGRADE_USD", float),
+            downgrade_model=os.getenv("TASK_BUDGET_DOWNGRADE_MODEL") or None,
+        )
+        limits = (budget.max_cost_usd, budget.max_tokens, budget.max_turns, budget.downgrade_cost_usd)
+        return budget if any(limit is not None for limit in limits) else None
+
+    def exceeded(self, usage: UsageTotals) -> Optional[str]:
+        """
+        Check usage against the stop limits.
+
+        Returns:
+            Which limit was crossed, or None if usage is within budget
+        """
+        if self.max_cost_usd is not None and usage.cost_usd >= self.max_cost_usd:
+            return f"cost {usage.cost_usd:.2f}$ >= {self.max_cost_usd:.2f}$"
+        if self.max_tokens is not None and usage.total_tokens >= self.max_tokens:
+            return f"tokens {usage.total_tokens} >= {self.max_tokens}"
+        if self.max_turns is not None and usage.num_turns >= self.max_turns:
+            return f"turns {usage.num_turns} >= {self.max_turns}"
+        return None
+
+    def should_downgrade(self, usage: UsageTotals, model: Optional[str]) -> bool:
+        """Whether the remaining turns should move to downgrade_model."""
+        return (
+            self.downgrade_cost_usd is not None
+            and usage.cost_usd >= self.downgrade_cost_usd
+            and model != self.downgrade_model
+        )
+
+
+class UsageLedger:
+    """Usage per key (article id, task or session), saved as one JSON file per run."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize ledger.
+
+        Args:
+            path: Output file (default: outputs/usage/usage_<timestamp>.json)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = path or os.path.join("outputs", "usage", f"usage_{timestamp}.json")
+        self.started_at = datetime.now(timezone.utc)
+        self.entries: Dict[str, UsageTotals] = {}
+
+    def record(self, key: str, usage: UsageTotals) -> None:
+        """Add usage under key."""
+        self.entries.setdefault(key, UsageTotals()).merge(usage)
+
+    def total(self) -> UsageTotals:
+        total = UsageTotals()
+        for usage in self.entries.values():
+            total.merge(usage)
+        return total
+
+    def save(self) -> str:
+        """
+        Write the ledger (atomically, so it can be saved after every entry).
+
+        Returns:
+            The path written
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "started_at": self.started_at.isoformat(),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "total": self.total().to_dict(),
+            "entries": {key: usage.to_dict() for key, usage in self.entries.items()},
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+        return self.path